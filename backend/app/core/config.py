@@ -3,7 +3,7 @@ Core configuration settings for the Insurance News backend.
 Uses pydantic-settings for environment variable management.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Dict
 from pydantic_settings import BaseSettings
 from pydantic import Field, field_validator
 
@@ -40,21 +40,77 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = Field(default="")
     OPENAI_MODEL: str = "gpt-4o"
     OPENAI_MAX_TOKENS: int = 4000
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"  # e.g. http://localhost:8090/v1 for app/services/llm_stub.py
     
     # Anthropic (alternative)
     ANTHROPIC_API_KEY: Optional[str] = None
     ANTHROPIC_MODEL: str = "claude-3-5-sonnet-20241022"
+    ANTHROPIC_BASE_URL: str = "https://api.anthropic.com"
+    
+    # LLM calls (LLMService / ContentProcessorAsync)
+    LLM_MAX_CONCURRENCY: int = 8        # In-flight async LLM requests; also the processor's worker count
+    LLM_CACHE_ENABLED: bool = True      # Answer repeated requests (same model/prompt/input) from disk
+    LLM_CACHE_DIR: str = ".cache/llm"
+    LLM_CACHE_MAX_MB: int = 256
+    LLM_CACHE_MAX_AGE_DAYS: int = 30
+    LLM_BATCH_MODE: bool = False        # Store items unprocessed; rewrite/summarize them in provider batch jobs (run_llm_batch.py)
+    LLM_BATCH_MAX_ITEMS: int = 1000     # Requests per batch job
+    LLM_BATCH_POLL_SECONDS: float = 60
+    LLM_BATCH_TIMEOUT_HOURS: float = 24  # Provider completion window; unfinished jobs are cancelled
     
     # Crawler Settings
     CRAWLER_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    CRAWLER_DELAY_SECONDS: int = 2
+    CRAWLER_DELAY_SECONDS: float = 2    # Minimum interval between requests to the same host
     CRAWLER_MAX_RETRIES: int = 3
     CRAWLER_TIMEOUT: int = 30
+    CRAWLER_MAX_CONNECTIONS: int = 200  # Total pooled connections for async fetches
+    CRAWLER_MAX_PER_HOST: int = 8       # Concurrent in-flight requests per host
+    CRAWLER_HTTP2: bool = True
+    CRAWLER_BURST: int = 1              # Requests a host may receive back-to-back
+    CRAWLER_RESPECT_ROBOTS: bool = True  # Honour robots.txt Crawl-delay / Request-rate
+    CRAWLER_HOST_DELAYS: str = "thuvienphapluat.vn=4"  # Per-host overrides: "host=seconds,..."
+    
+    
+    # Conditional-GET cache (ETag / Last-Modified) for crawler fetches
+    CRAWLER_CACHE_ENABLED: bool = True
+    CRAWLER_CACHE_DIR: str = ".cache/crawler"
+    CRAWLER_CACHE_MAX_MB: int = 512
+    CRAWLER_FRONTIER_ENABLED: bool = True  # Skip items already stored in earlier runs
+    CRAWLER_ARCHIVE_ENABLED: bool = True   # Keep every fetched page for re-parsing (reparse_archive.py)
+    CRAWLER_ARCHIVE_DIR: str = ".cache/archive"
+    CRAWLER_ARCHIVE_SEGMENT_MB: int = 256
+    CRAWLER_ARCHIVE_MAX_MB: int = 8192     # Oldest segments are dropped beyond this
+    CRAWLER_ARCHIVE_MAX_AGE_DAYS: int = 90  # Fetch records older than this are dropped
+    CRAWLER_RENDERER_RECHECK_HOURS: int = 168  # Re-probe browser-only sources over plain HTTP
+    CRAWLER_PARSER_BACKEND: str = "lxml"  # lxml | selectolax | bs4 (BeautifulSoup reference path)
+    
+    @field_validator("CRAWLER_HOST_DELAYS")
+    @classmethod
+    def parse_host_delays(cls, v: str) -> Dict[str, float]:
+        delays = {}
+        for item in v.split(","):
+            if "=" in item:
+                host, delay = item.split("=", 1)
+                delays[host.strip().lower()] = float(delay)
+        return delays
+    
+    # Concurrent pipeline (run_crawlers_async.py --module pipeline)
+    PIPELINE_QUEUE_SIZE: int = 100      # Bounded queue between stages (backpressure)
+    PIPELINE_WORKERS: int = 4           # Workers per processing stage
+    PIPELINE_MAX_CONCURRENCY: int = 8   # Global budget of in-flight stage calls (LLM/DB)
+    NEWS_CONTENT_WORKERS: int = 16      # Article body fetches in flight (still capped per host)
+    
+    # Shared Playwright browser pool
+    BROWSER_POOL_CONTEXTS: int = 2      # Warm browser contexts
+    BROWSER_MAX_PAGES: int = 6          # Concurrently open pages across all contexts
+    BROWSER_HEADLESS: bool = True
+    BROWSER_STORAGE_STATE_DIR: str = ".cache/browser"  # Cookies/tokens kept between runs
     
     # TVPL Settings
     TVPL_BASE_URL: str = "https://thuvienphapluat.vn"
     TVPL_SEARCH_URL: str = "https://thuvienphapluat.vn/tim-van-ban.aspx"
     TVPL_CATEGORY_ID: str = "insurance"
+    TVPL_INCREMENTAL_STOP_AFTER: int = 10  # Stop a query after N consecutive stored results (0 = full crawl)
     
     # News Sources
     NEWS_SOURCES: str = "vnexpress,cafef,vneconomy,baodautu,dantri"
@@ -63,6 +119,10 @@ class Settings(BaseSettings):
     VNECONOMY_URL: str = "https://vneconomy.vn/bao-hiem.htm"
     BAODAUTU_URL: str = "https://baodautu.vn/bao-hiem"
     DANTRI_URL: str = "https://dantri.com.vn/kinh-doanh/bao-hiem.htm"
+    NEWS_MIN_RELEVANCE_SCORE: float = 1.0  # Keyword score needed to keep an article (one body match)
+    NEWS_FEED_DISCOVERY: bool = True    # Read RSS feeds / news sitemaps instead of listing pages where available
+    NEWS_NEAR_DUP_ENABLED: bool = True     # Link re-published stories to the first copy instead of rewriting them
+    NEWS_NEAR_DUP_THRESHOLD: float = 0.7  # Estimated shingle Jaccard at which two articles are one story
     
     @field_validator("NEWS_SOURCES")
     @classmethod
@@ -3,23 +3,54 @@ Base crawler class with common functionality.
 """
 
 import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import importlib.util
+from typing import Optional, Dict, Any, List, Iterable, Awaitable, AsyncIterator, AsyncGenerator, TypeVar, Union
 from abc import ABC, abstractmethod
 import requests
-from bs4 import BeautifulSoup
+import httpx
+from bs4 import BeautifulSoup, Tag
 from datetime import datetime
 
 from app.core.config import settings
+from app.crawlers.politeness import PolitenessScheduler, politeness_scheduler
+from app.crawlers.http_cache import HTTPCache, CachedResponse, get_http_cache
+from app.crawlers.frontier import FingerprintStore, get_fingerprint_store
+from app.crawlers.page_archive import PageArchive, get_page_archive
+from app.crawlers.relevance import KeywordMatcher, get_relevance_matcher
+from app.crawlers.urls import canonicalize_url
+from app.crawlers.feeds import FeedEntry, parse_feed, entries_since
+from app.crawlers.encoding import EncodingSniffer, encoding_sniffer, sniff_encoding
+from app.crawlers.html_backend import (
+    HTMLBackend, get_html_backend, backend_of, field_extractor, STRIP_TAGS, STRIP_CLASSES
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Child sitemaps followed per sitemap index (newest are listed first)
+MAX_CHILD_SITEMAPS = 3
+
+# HTTP/2 needs the optional `h2` package (installed via httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 class BaseCrawler(ABC):
     """Base crawler with common HTTP and parsing methods."""
     
-    def __init__(self):
+    # Frontier namespace holding fingerprints of items stored in earlier runs
+    FRONTIER_NAME: Optional[str] = None
+    
+    def __init__(
+        self,
+        scheduler: Optional[PolitenessScheduler] = None,
+        http_cache: Optional[HTTPCache] = None,
+        frontier: Optional[FingerprintStore] = None,
+        archive: Optional[PageArchive] = None
+    ):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': settings.CRAWLER_USER_AGENT,
@@ -30,6 +61,33 @@ class BaseCrawler(ABC):
         self.max_retries = settings.CRAWLER_MAX_RETRIES
         self.timeout = settings.CRAWLER_TIMEOUT
         
+        # Per-host rate budget and concurrency limit, shared across crawlers
+        self.scheduler = scheduler or politeness_scheduler
+        
+        # Conditional-GET cache (None when CRAWLER_CACHE_ENABLED is off)
+        self.http_cache = http_cache if http_cache is not None else get_http_cache()
+        
+        # Raw-page archive for re-parsing (None when CRAWLER_ARCHIVE_ENABLED is off)
+        self.archive = archive if archive is not None else get_page_archive()
+        
+        # Persistent fingerprints of already-stored items (cross-run dedup)
+        if frontier is None and self.FRONTIER_NAME:
+            frontier = get_fingerprint_store(self.FRONTIER_NAME)
+        self.frontier = frontier
+        
+        # Compiled keyword matcher scoring item relevance
+        self.relevance: KeywordMatcher = get_relevance_matcher()
+        
+        # Parser for `parse_html` / `fetch_document` (None: BeautifulSoup)
+        self.html_backend: Optional[HTMLBackend] = get_html_backend()
+        
+        # Declared / sniffed body encodings, remembered per host
+        self.encodings: EncodingSniffer = encoding_sniffer
+        
+        # Async fetch engine (created lazily inside the running event loop)
+        self.max_connections = settings.CRAWLER_MAX_CONNECTIONS
+        self._async_client: Optional[httpx.AsyncClient] = None
+        
     def fetch_page(self, url: str, retries: int = 0) -> Optional[BeautifulSoup]:
         """
         Fetch a page and return BeautifulSoup object.
@@ -41,15 +99,86 @@ class BaseCrawler(ABC):
         Returns:
             BeautifulSoup object or None if failed
         """
+        response = self.fetch_response(url, retries)
+        return BeautifulSoup(response.body, 'lxml', from_encoding=response.encoding) if response else None
+    
+    def parse_html(self, html: Union[str, bytes], encoding: Optional[str] = None) -> Any:
+        """
+        Parse a page with this crawler's parser backend.
+        
+        Fetched pages are passed as raw bytes with their resolved encoding,
+        so the parser decodes the body once; rendered DOMs come as text.
+        
+        Returns an lxml / selectolax document, or BeautifulSoup when
+        CRAWLER_PARSER_BACKEND is 'bs4'. The parse methods of the crawlers
+        accept either.
+        """
+        if isinstance(html, bytes) and not encoding:
+            encoding = sniff_encoding(html)
+        if self.html_backend:
+            return self.html_backend.parse(html, encoding)
+        if isinstance(html, bytes):
+            return BeautifulSoup(html, 'lxml', from_encoding=encoding)
+        return BeautifulSoup(html, 'lxml')
+    
+    def document_backend(self, document: Any) -> Optional[HTMLBackend]:
+        """Backend that parsed `document` (None for BeautifulSoup trees)."""
+        if isinstance(document, Tag):
+            return None
+        if self.html_backend and self.html_backend.is_document(document):
+            return self.html_backend
+        backend = backend_of(document)
+        if backend is None:
+            raise TypeError(f"Not a parsed HTML document: {type(document).__name__}")
+        return backend
+    
+    def select_first(self, document: Any, selector: str) -> Any:
+        """First element matching `selector` in a BeautifulSoup tree or `parse_html` document."""
+        backend = self.document_backend(document)
+        if backend:
+            return field_extractor((('match', selector),)).extract(document, backend).get('match')
+        return document.select_one(selector)
+    
+    def fetch_document(self, url: str, retries: int = 0) -> Any:
+        """Fetch a page and parse it with `parse_html` (None if failed)."""
+        response = self.fetch_response(url, retries)
+        return self.parse_html(response.body, response.encoding) if response else None
+    
+    def fetch_response(self, url: str, retries: int = 0) -> Optional[CachedResponse]:
+        """
+        Fetch a URL and return its raw body (e.g. XML feeds).
+        
+        Args:
+            url: URL to fetch
+            retries: Current retry count
+            
+        Returns:
+            Response body and metadata (from the cache on 304), or None if failed
+        """
+        url = self.canonical_url(url)
+        
         try:
+            # Respectful crawling: wait for this host's rate budget
+            self.scheduler.wait_blocking(url, self.session)
+            
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
+            response = self.session.get(url, timeout=self.timeout, headers=self._conditional_headers(url))
             
-            # Respectful crawling delay
-            time.sleep(self.delay)
+            if response.status_code == 304:
+                cached = self._cache_hit(url)
+                if cached:
+                    self.archive_page(url, response.headers, cached.body, cached.encoding)
+                    return cached
+                # Entry evicted since the request was sent - fetch it in full
+                response = self.session.get(url, timeout=self.timeout)
             
-            return BeautifulSoup(response.text, 'lxml')
+            response.raise_for_status()
+            body = response.content
+            encoding = self.encodings.resolve(url, response.headers, body)
+            self._cache_store(url, response.headers, body, encoding)
+            self.archive_page(url, response.headers, body, encoding)
+            
+            return self._snapshot(url, response.headers, body, encoding)
             
         except requests.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
@@ -57,10 +186,333 @@ class BaseCrawler(ABC):
             if retries < self.max_retries:
                 logger.info(f"Retrying... ({retries + 1}/{self.max_retries})")
                 time.sleep(self.delay * (retries + 1))
-                return self.fetch_page(url, retries + 1)
+                return self.fetch_response(url, retries + 1)
+            
+            return None
+    
+    def canonical_url(self, url: str, base: Optional[str] = None) -> str:
+        """
+        Canonical form of a URL, used for fetching, cache and frontier keys
+        and as the stored `source_url`.
+        
+        Args:
+            url: URL or link as found in the page
+            base: URL of the page the link was found on
+        """
+        return canonicalize_url(url, base)
+    
+    def frontier_key(self, key: str) -> str:
+        """Normalize an item key before fingerprinting (overridden per crawler)."""
+        return key.strip()
+    
+    def is_known(self, key: str) -> bool:
+        """Whether an item was already stored by a previous run."""
+        return bool(self.frontier is not None and key and self.frontier_key(key) in self.frontier)
+    
+    def _conditional_headers(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Merge If-None-Match / If-Modified-Since for cached URLs into request headers."""
+        request_headers = dict(headers or {})
+        if self.http_cache:
+            request_headers.update(self.http_cache.conditional_headers(url))
+        return request_headers
+    
+    def _cache_hit(self, url: str) -> Optional[CachedResponse]:
+        """Serve a 304 response from the HTTP cache."""
+        return self.http_cache.hit(url) if self.http_cache else None
+    
+    def _cache_store(self, url: str, headers, body: bytes, encoding: Optional[str]):
+        """Record a full response so later fetches can revalidate it."""
+        if self.http_cache:
+            self.http_cache.store(url, headers, body, encoding)
+    
+    async def _conditional_headers_async(self, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """`_conditional_headers` with the SQLite lookup in a worker thread, off the event loop."""
+        if not self.http_cache:
+            return dict(headers or {})
+        return await asyncio.to_thread(self._conditional_headers, url, headers)
+    
+    async def _cache_hit_async(self, url: str) -> Optional[CachedResponse]:
+        """`_cache_hit` in a worker thread."""
+        return await asyncio.to_thread(self._cache_hit, url) if self.http_cache else None
+    
+    async def _cache_store_async(self, url: str, headers, body: bytes, encoding: Optional[str]):
+        """`_cache_store` in a worker thread."""
+        if self.http_cache:
+            await asyncio.to_thread(self._cache_store, url, headers, body, encoding)
+    
+    def archive_page(
+        self,
+        url: str,
+        headers,
+        body: bytes,
+        encoding: Optional[str] = None,
+        renderer: str = 'http'
+    ):
+        """Keep a fetched page in the raw-page archive so it can be re-parsed later."""
+        if self.archive:
+            try:
+                self.archive.store(self.canonical_url(url), headers, body, encoding, renderer)
+            except Exception as e:
+                logger.warning(f"Could not archive {url}: {e}")
+    
+    async def archive_page_async(
+        self,
+        url: str,
+        headers,
+        body: bytes,
+        encoding: Optional[str] = None,
+        renderer: str = 'http'
+    ):
+        """`archive_page` in a worker thread, keeping the segment and SQLite writes off the event loop."""
+        if self.archive:
+            await asyncio.to_thread(self.archive_page, url, headers, body, encoding, renderer)
+    
+    def _snapshot(self, url: str, headers, body: bytes, encoding: Optional[str]) -> CachedResponse:
+        """A fresh response in the same shape as a cache hit."""
+        return CachedResponse(url, body, encoding, headers.get('etag'), headers.get('last-modified'), time.time())
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async HTTP client, creating it on first use.
+        
+        Connections are kept alive and shared by every coroutine of this
+        crawler, so hundreds of requests can be in flight at once.
+        """
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                headers=dict(self.session.headers),
+                timeout=self.timeout,
+                follow_redirects=True,
+                http2=settings.CRAWLER_HTTP2 and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._async_client
+    
+    async def fetch_page_async(
+        self,
+        url: str,
+        retries: int = 0,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[BeautifulSoup]:
+        """
+        Fetch a page without blocking the event loop.
+        
+        Args:
+            url: URL to fetch
+            retries: Current retry count
+            headers: Extra headers for this request (e.g. rotated User-Agent)
+            
+        Returns:
+            BeautifulSoup object or None if failed
+        """
+        response = await self.fetch_response_async(url, retries, headers)
+        return BeautifulSoup(response.body, 'lxml', from_encoding=response.encoding) if response else None
+    
+    async def fetch_document_async(
+        self,
+        url: str,
+        retries: int = 0,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """Fetch a page without blocking and parse it with `parse_html` (None if failed)."""
+        response = await self.fetch_response_async(url, retries, headers)
+        return self.parse_html(response.body, response.encoding) if response else None
+    
+    async def fetch_response_async(
+        self,
+        url: str,
+        retries: int = 0,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[CachedResponse]:
+        """
+        Fetch a URL without blocking the event loop and return its raw body.
+        
+        Args:
+            url: URL to fetch
+            retries: Current retry count
+            headers: Extra headers for this request (e.g. rotated User-Agent)
+            
+        Returns:
+            Response body and metadata (from the cache on 304), or None if failed
+        """
+        url = self.canonical_url(url)
+        client = self._get_async_client()
+        
+        try:
+            # Waits for this host's rate budget; other hosts are unaffected
+            async with self.scheduler.slot(url, client):
+                logger.info(f"Fetching: {url}")
+                response = await client.get(url, headers=await self._conditional_headers_async(url, headers))
+                
+                if response.status_code == 304:
+                    cached = await self._cache_hit_async(url)
+                    if cached:
+                        await self.archive_page_async(url, response.headers, cached.body, cached.encoding)
+                        return cached
+                    # Entry evicted since the request was sent - fetch it in full
+                    response = await client.get(url, headers=headers)
+                
+                response.raise_for_status()
+            
+            body = response.content
+            encoding = self.encodings.resolve(url, response.headers, body)
+            await self._cache_store_async(url, response.headers, body, encoding)
+            await self.archive_page_async(url, response.headers, body, encoding)
+            
+            return self._snapshot(url, response.headers, body, encoding)
+            
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching {url}: {e}")
+            
+            if retries < self.max_retries:
+                logger.info(f"Retrying... ({retries + 1}/{self.max_retries})")
+                await asyncio.sleep(self.delay * (retries + 1))
+                return await self.fetch_response_async(url, retries + 1, headers)
             
             return None
     
+    def discover_feeds(self, feed_urls: Iterable[str], since: Optional[datetime] = None) -> Optional[List[FeedEntry]]:
+        """
+        Read a source's RSS feeds / news sitemaps.
+        
+        Args:
+            feed_urls: Feed or sitemap URLs of one source
+            since: Drop entries published before this time (naive UTC)
+            
+        Returns:
+            Entries newest first, or None if no feed could be read
+            (the caller falls back to HTML listing pages)
+        """
+        documents = []
+        for url in feed_urls:
+            document = self._parse_feed_response(url, self.fetch_response(url))
+            if document and document.sitemaps:
+                children = document.sitemaps[:MAX_CHILD_SITEMAPS]
+                documents.extend(self._parse_feed_response(child, self.fetch_response(child)) for child in children)
+            documents.append(document)
+        return self._merge_feed_entries(documents, since)
+    
+    async def discover_feeds_async(
+        self,
+        feed_urls: Iterable[str],
+        since: Optional[datetime] = None
+    ) -> Optional[List[FeedEntry]]:
+        """Async `discover_feeds`; the feeds of a source are fetched concurrently."""
+        feed_urls = list(feed_urls)
+        documents = [
+            self._parse_feed_response(url, response)
+            for url, response in zip(feed_urls, await asyncio.gather(*(self.fetch_response_async(u) for u in feed_urls)))
+        ]
+        children = [
+            child for document in documents if document
+            for child in document.sitemaps[:MAX_CHILD_SITEMAPS]
+        ]
+        if children:
+            responses = await asyncio.gather(*(self.fetch_response_async(child) for child in children))
+            documents.extend(self._parse_feed_response(url, response) for url, response in zip(children, responses))
+        return self._merge_feed_entries(documents, since)
+    
+    def _parse_feed_response(self, url: str, response: Optional[CachedResponse]):
+        if response is None:
+            return None
+        document = parse_feed(response.body)
+        if document is None:
+            logger.warning(f"Not a feed or sitemap: {url}")
+        return document
+    
+    def _merge_feed_entries(self, documents, since: Optional[datetime]) -> Optional[List[FeedEntry]]:
+        """Entries of every readable feed after `since`, canonical and deduplicated."""
+        readable = [document for document in documents if document is not None]
+        if not readable:
+            return None
+        
+        entries: Dict[str, FeedEntry] = {}
+        for document in readable:
+            for entry in document.entries:
+                link = self.canonical_url(entry.link)
+                entries.setdefault(link, entry._replace(link=link))
+        return entries_since(list(entries.values()), since)
+    
+    async def fetch_many_async(
+        self,
+        urls: Iterable[str],
+        headers: Optional[Dict[str, str]] = None
+    ) -> List[Optional[BeautifulSoup]]:
+        """
+        Fetch several pages concurrently, preserving input order.
+        
+        Rate and concurrency are bounded per host by the politeness
+        scheduler, so URLs spread over many hosts proceed in parallel.
+        """
+        return await asyncio.gather(
+            *(self.fetch_page_async(url, headers=headers) for url in urls)
+        )
+    
+    async def iter_concurrently(
+        self,
+        streams: Iterable[AsyncGenerator[T, None]],
+        buffer: int = 64
+    ) -> AsyncIterator[T]:
+        """
+        Run several async generators concurrently and yield their items
+        in arrival order.
+        
+        The buffer is bounded, so producers pause while the consumer is
+        busy. A stream that raises is logged and dropped; the others keep
+        going. Closing the merged iterator cancels every producer.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        finished = object()
+        
+        async def drain(stream: AsyncGenerator[T, None]):
+            try:
+                async for item in stream:
+                    await queue.put(item)
+            except Exception as e:
+                logger.error(f"Crawl stream failed: {e}")
+            finally:
+                await stream.aclose()
+            await queue.put(finished)
+        
+        tasks = [asyncio.create_task(drain(stream)) for stream in streams]
+        remaining = len(tasks)
+        
+        try:
+            while remaining:
+                item = await queue.get()
+                if item is finished:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def aclose(self):
+        """Close the async HTTP client."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
+    def run_async(self, coro: Awaitable[T]) -> T:
+        """
+        Run an async crawl from synchronous code.
+        
+        The async client is bound to the event loop, so it is closed before
+        the loop created by `asyncio.run` goes away.
+        """
+        async def runner() -> T:
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(runner())
+    
     def extract_text(self, soup: BeautifulSoup, selector: str, default: str = "") -> str:
         """Extract text from soup using CSS selector."""
         element = soup.select_one(selector)
@@ -119,18 +571,30 @@ class BaseCrawler(ABC):
         """Clean and sanitize HTML content."""
         if not html:
             return ""
-            
-        soup = BeautifulSoup(html, 'lxml')
+        
+        return self.sanitize_element(BeautifulSoup(html, 'lxml'))
+    
+    def sanitize_element(self, element: Any) -> str:
+        """
+        Remove scripts, styles, frames, ads and tracking elements inside an
+        element already parsed (in place), and return its HTML.
+        
+        Takes BeautifulSoup tags or elements of `parse_html` documents, so
+        content is not serialized and parsed a second time to be cleaned.
+        """
+        backend = self.document_backend(element)
+        if backend:
+            return backend.sanitize(element)
         
         # Remove script and style tags
-        for tag in soup(['script', 'style', 'iframe', 'noscript']):
+        for tag in element(list(STRIP_TAGS)):
             tag.decompose()
             
         # Remove ads and tracking elements
-        for tag in soup.find_all(class_=['ads', 'advertisement', 'tracking']):
+        for tag in element.find_all(class_=list(STRIP_CLASSES)):
             tag.decompose()
             
-        return str(soup)
+        return str(element)
     
     def close(self):
         """Close the session."""
@@ -0,0 +1,302 @@
+"""
+Shared Playwright browser with a pool of warm contexts.
+
+One Chromium is launched per pipeline run and shared by every crawler.
+Pages are spread over N contexts and capped by a semaphore; each context's
+`storage_state` (cookies, localStorage) is saved on close and restored on
+the next run so anti-bot tokens and consent cookies survive between runs.
+
+`render()` loads a page under a `RenderProfile`: images, media, fonts and
+third-party requests are aborted through request routing, and the page is
+considered ready as soon as the profile's selector is attached instead of
+waiting for network idle.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import itertools
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, AsyncIterator, FrozenSet, NamedTuple, Tuple
+from urllib.parse import urlparse
+
+try:
+    from playwright.async_api import async_playwright, Playwright, Browser, BrowserContext, Page
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+    logging.warning("Playwright not available. Install with: pip install playwright && playwright install")
+
+from app.core.config import settings
+from app.crawlers.politeness import PolitenessScheduler
+
+logger = logging.getLogger(__name__)
+
+# Anti-detection launch flags shared by all crawlers
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+]
+
+# Resource types never needed to read the DOM
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# Second-level labels under which the registrable domain has three labels (cafef.com.vn)
+_SHARED_SLDS = {'com', 'net', 'org', 'gov', 'edu', 'co', 'ac'}
+
+
+def site_domain(url_or_host: str) -> str:
+    """Registrable domain of a URL or host ('https://m.cafef.vn/x' -> 'cafef.vn')."""
+    host = urlparse(url_or_host).hostname if '//' in url_or_host else url_or_host
+    labels = (host or '').lower().split('.')
+    keep = 3 if len(labels) >= 3 and labels[-2] in _SHARED_SLDS else 2
+    return '.'.join(labels[-keep:])
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """How a source's pages are rendered."""
+    ready_selector: Optional[str] = None          # Page is ready once this is attached
+    timeout: int = 30000                          # Navigation + readiness budget (ms)
+    blocked_types: FrozenSet[str] = BLOCKED_RESOURCE_TYPES
+    block_third_party: bool = True
+    allowed_domains: Tuple[str, ...] = ()         # Extra domains treated as first party (CDNs)
+
+    def allows(self, request_url: str, resource_type: str, first_party: str) -> bool:
+        """Whether a subresource request should be let through."""
+        if resource_type in self.blocked_types:
+            return False
+        if resource_type == 'document' or not self.block_third_party:
+            return True
+        domain = site_domain(request_url)
+        return domain == first_party or domain in self.allowed_domains
+
+
+class PageMetrics(NamedTuple):
+    """Cost of rendering one page."""
+    url: str
+    seconds: float
+    bytes: int            # Response headers + encoded bodies actually transferred
+    requests: int
+    blocked: int
+    ready: bool           # Ready selector appeared within the timeout
+
+
+class RenderResult(NamedTuple):
+    """Output of BrowserPool.render()."""
+    html: Optional[str]   # Serialized DOM (None when the in-page extractor succeeded)
+    extracted: Any        # Return value of the in-page extractor
+    metrics: PageMetrics
+
+
+class RenderStats:
+    """Per-crawl aggregate of PageMetrics, reported in the crawl log."""
+
+    def __init__(self):
+        self.pages: List[PageMetrics] = []
+        self.renderers: Dict[str, int] = {}
+
+    def record(self, metrics: PageMetrics):
+        self.pages.append(metrics)
+
+    def count_renderer(self, renderer: str):
+        """Count a page loaded by the adaptive selector (HTTP or browser)."""
+        self.renderers[renderer] = self.renderers.get(renderer, 0) + 1
+
+    def summary(self) -> Dict[str, Any]:
+        count = len(self.pages)
+        if not count:
+            return {'pages': 0, 'renderers': dict(self.renderers)}
+        total_seconds = sum(m.seconds for m in self.pages)
+        total_bytes = sum(m.bytes for m in self.pages)
+        return {
+            'pages': count,
+            'seconds_per_page': round(total_seconds / count, 3),
+            'bytes_per_page': total_bytes // count,
+            'total_bytes': total_bytes,
+            'requests_blocked': sum(m.blocked for m in self.pages),
+            'not_ready': sum(1 for m in self.pages if not m.ready),
+            'renderers': dict(self.renderers),
+        }
+
+
+class BrowserPool:
+    """Lazily started browser with warm contexts and a concurrent-page cap."""
+
+    def __init__(
+        self,
+        contexts: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        storage_dir: Optional[str] = None,
+        proxy: Optional[str] = None,
+        headless: Optional[bool] = None
+    ):
+        self.num_contexts = contexts or settings.BROWSER_POOL_CONTEXTS
+        self.max_pages = max_pages or settings.BROWSER_MAX_PAGES
+        self.storage_dir = storage_dir or settings.BROWSER_STORAGE_STATE_DIR
+        self.proxy = proxy
+        self.headless = settings.BROWSER_HEADLESS if headless is None else headless
+
+        self._playwright: Optional["Playwright"] = None
+        self.browser: Optional["Browser"] = None
+        self.contexts: List["BrowserContext"] = []
+        self._next_context = itertools.cycle([0])
+        self._page_slots: Optional[asyncio.Semaphore] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def started(self) -> bool:
+        return self.browser is not None
+
+    def _storage_path(self, index: int) -> str:
+        return os.path.join(self.storage_dir, f"context-{index}.json")
+
+    async def start(self):
+        """Launch the browser and open the warm contexts (idempotent)."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+
+        async with self._start_lock:
+            if self.started:
+                return
+            if not PLAYWRIGHT_AVAILABLE:
+                raise ImportError("Playwright not available. Install with: pip install playwright && playwright install")
+
+            self._playwright = await async_playwright().start()
+
+            launch_options: Dict[str, Any] = {'headless': self.headless, 'args': LAUNCH_ARGS}
+            if self.proxy:
+                launch_options['proxy'] = {'server': self.proxy}
+                logger.info(f"Using proxy: {self.proxy}")
+
+            self.browser = await self._playwright.chromium.launch(**launch_options)
+
+            for index in range(self.num_contexts):
+                context_options: Dict[str, Any] = {'locale': 'vi-VN'}
+                if os.path.exists(self._storage_path(index)):
+                    context_options['storage_state'] = self._storage_path(index)
+                self.contexts.append(await self.browser.new_context(**context_options))
+
+            self._next_context = itertools.cycle(range(len(self.contexts)))
+            self._page_slots = asyncio.Semaphore(self.max_pages)
+            logger.info(f"✓ Browser pool started ({self.num_contexts} contexts, {self.max_pages} pages max)")
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator["Page"]:
+        """
+        Borrow a fresh page from the next context.
+
+        Blocks while `max_pages` pages are already open; the page is closed
+        when the block exits.
+        """
+        await self.start()
+
+        async with self._page_slots:
+            context = self.contexts[next(self._next_context)]
+            page = await context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+
+    async def render(
+        self,
+        url: str,
+        profile: RenderProfile,
+        headers: Optional[Dict[str, str]] = None,
+        scheduler: Optional[PolitenessScheduler] = None,
+        extractor: Optional[str] = None,
+        extractor_arg: Any = None
+    ) -> RenderResult:
+        """
+        Load a URL on a pooled page under `profile`.
+
+        With an `extractor` (a JS function for `page.evaluate`) only its
+        JSON result crosses back into Python; if it throws, the full HTML
+        is returned instead so callers can parse it themselves.
+
+        A page whose ready selector never appears is still returned (it may
+        legitimately be empty); `PageMetrics.ready` records the miss.
+        """
+        first_party = site_domain(url)
+        blocked = 0
+        finished = []
+
+        async def route_request(route):
+            nonlocal blocked
+            request = route.request
+            if profile.allows(request.url, request.resource_type, first_party):
+                await route.continue_()
+            else:
+                blocked += 1
+                await route.abort()
+
+        async with self.page() as page:
+            await page.route('**/*', route_request)
+            page.on('requestfinished', finished.append)
+            if headers:
+                await page.set_extra_http_headers(headers)
+
+            start = time.perf_counter()
+            if scheduler is not None:
+                async with scheduler.slot(url):
+                    await page.goto(url, wait_until='domcontentloaded', timeout=profile.timeout)
+            else:
+                await page.goto(url, wait_until='domcontentloaded', timeout=profile.timeout)
+
+            ready = True
+            if profile.ready_selector:
+                try:
+                    await page.wait_for_selector(profile.ready_selector, state='attached', timeout=profile.timeout)
+                except Exception:
+                    ready = False
+                    logger.debug(f"Ready selector '{profile.ready_selector}' not found on {url}")
+
+            html, extracted = None, None
+            if extractor:
+                try:
+                    extracted = await page.evaluate(extractor, extractor_arg)
+                except Exception as e:
+                    logger.debug(f"In-page extractor failed on {url}, serializing DOM: {e}")
+            if extracted is None:
+                html = await page.content()
+            seconds = time.perf_counter() - start
+
+            sizes = await asyncio.gather(*(request.sizes() for request in finished), return_exceptions=True)
+
+        transferred = sum(
+            size['responseHeadersSize'] + size['responseBodySize']
+            for size in sizes if isinstance(size, dict)
+        )
+        return RenderResult(html, extracted, PageMetrics(url, seconds, transferred, len(finished), blocked, ready))
+
+    async def save_storage_state(self):
+        """Persist cookies/localStorage of every context for the next run."""
+        os.makedirs(self.storage_dir, exist_ok=True)
+        for index, context in enumerate(self.contexts):
+            try:
+                await context.storage_state(path=self._storage_path(index))
+            except Exception as e:
+                logger.warning(f"Could not save storage state for context {index}: {e}")
+
+    async def close(self):
+        """Save storage state and shut the browser down."""
+        if not self.started:
+            return
+
+        await self.save_storage_state()
+
+        for context in self.contexts:
+            await context.close()
+        await self.browser.close()
+        await self._playwright.stop()
+
+        self.contexts = []
+        self.browser = None
+        self._playwright = None
+        logger.info("✓ Browser pool closed")
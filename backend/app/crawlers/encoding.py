@@ -0,0 +1,140 @@
+"""
+Character encoding of fetched pages, without decoding them to find out.
+
+Pages are handed to the parser as raw bytes plus an encoding, so the body
+is decoded exactly once, by the parser. The encoding comes from, in order:
+a byte-order mark, the Content-Type charset, a `<meta charset>` /
+`<?xml encoding?>` declaration in the first few KB, or the encoding last
+seen on the same host. Only pages with none of these are checked in full
+(UTF-8 validation, then statistical detection), and the result is
+remembered for the host.
+"""
+
+import re
+import codecs
+import logging
+import threading
+from typing import Optional, Dict, Mapping
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+try:
+    import charset_normalizer
+    CHARSET_DETECTION_AVAILABLE = True
+except ImportError:
+    CHARSET_DETECTION_AVAILABLE = False
+
+# Bytes scanned for a meta / XML declaration (pages often put scripts before it)
+PRESCAN_BYTES = 4096
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET = re.compile(rb'<meta[^>]+?charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+_XML_ENCODING = re.compile(rb'^\s*<\?xml[^>]+?encoding\s*=\s*["\']([\w.:-]+)', re.I)
+
+# Labels browsers decode as windows-1252 (WHATWG Encoding Standard)
+_WINDOWS_1252_LABELS = {'ascii', 'latin_1', 'iso8859-1', 'cp1252'}
+
+
+def normalize_encoding(label: Optional[str]) -> Optional[str]:
+    """Python codec name for an encoding label, or None if unknown."""
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip().strip('"\'')).name
+    except LookupError:
+        return None
+    return 'cp1252' if name in _WINDOWS_1252_LABELS else name
+
+
+def header_encoding(content_type: Optional[str]) -> Optional[str]:
+    """Charset parameter of a Content-Type header."""
+    match = _HEADER_CHARSET.search(content_type or '')
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def bom_encoding(body: bytes) -> Optional[str]:
+    for bom, name in _BOMS:
+        if body.startswith(bom):
+            return name
+    return None
+
+
+def declared_encoding(body: bytes) -> Optional[str]:
+    """Encoding declared by a `<meta>` tag or XML declaration near the start of the body."""
+    head = body[:PRESCAN_BYTES]
+    match = _XML_ENCODING.match(head) or _META_CHARSET.search(head)
+    return normalize_encoding(match.group(1).decode('ascii')) if match else None
+
+
+def detect_encoding(body: bytes) -> str:
+    """Encoding of an undeclared body, reading all of it (last resort)."""
+    try:
+        body.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    if CHARSET_DETECTION_AVAILABLE:
+        best = charset_normalizer.from_bytes(body).best()
+        if best is not None:
+            return normalize_encoding(best.encoding) or 'utf-8'
+    return 'cp1252'
+
+
+def sniff_encoding(body: bytes) -> str:
+    """Encoding of a body with no response headers (e.g. an archived page)."""
+    return bom_encoding(body) or declared_encoding(body) or detect_encoding(body)
+
+
+class EncodingSniffer:
+    """Resolves page encodings, remembering the last one seen per host."""
+
+    def __init__(self):
+        self._hosts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        # Counters for this process
+        self.declared = 0
+        self.from_host = 0
+        self.detected = 0
+
+    def resolve(self, url: str, headers: Mapping[str, str], body: bytes) -> str:
+        """
+        Encoding to decode a fetched body with.
+
+        Args:
+            url: URL the body was fetched from
+            headers: Response headers
+            body: Raw response body
+        """
+        host = urlsplit(url).hostname or ''
+        encoding = bom_encoding(body) or header_encoding(headers.get('content-type')) or declared_encoding(body)
+
+        with self._lock:
+            if encoding:
+                self.declared += 1
+                self._hosts[host] = encoding
+                return encoding
+            known = self._hosts.get(host)
+            if known:
+                self.from_host += 1
+                return known
+
+        encoding = detect_encoding(body)
+        logger.debug(f"Detected {encoding} for {url} (no declared charset)")
+        with self._lock:
+            self.detected += 1
+            self._hosts[host] = encoding
+        return encoding
+
+    def stats(self) -> Dict[str, int]:
+        return {'declared': self.declared, 'from_host': self.from_host, 'detected': self.detected}
+
+
+# Shared by all crawlers
+encoding_sniffer = EncodingSniffer()
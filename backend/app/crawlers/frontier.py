@@ -0,0 +1,123 @@
+"""
+Persistent crawl frontier - 64-bit fingerprints of items already stored.
+
+Each store is a sorted little-endian uint64 array on disk, opened with
+numpy.memmap so start-up costs one mmap call regardless of size. Lookups
+are a binary search (np.searchsorted); new fingerprints collect in an
+in-memory set and are merged into the file on `flush()`.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Optional, Dict, Iterable, List, Set
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_DTYPE = np.dtype('<u8')
+
+# Store namespaces
+LEGAL_DOCS = 'legal_docs'
+NEWS_URLS = 'news_urls'
+
+
+def fingerprint(key: str) -> int:
+    """64-bit BLAKE2b fingerprint of a normalized key."""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def normalize_doc_number(doc_number: str) -> str:
+    """Normalize a legal document number ('52/2024/nđ-cp ' -> '52/2024/NĐ-CP')."""
+    return ''.join(unicodedata.normalize('NFC', doc_number).upper().split())
+
+
+class FingerprintStore:
+    """Memory-mapped sorted set of 64-bit fingerprints."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending: Set[int] = set()
+        self._base = self._load()
+
+    def _load(self) -> np.ndarray:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return np.empty(0, dtype=FINGERPRINT_DTYPE)
+        return np.memmap(self.path, dtype=FINGERPRINT_DTYPE, mode='r')
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._pending)
+
+    def contains_fingerprint(self, fp: int) -> bool:
+        if fp in self._pending:
+            return True
+        base = self._base
+        idx = int(np.searchsorted(base, fp))
+        return idx < len(base) and int(base[idx]) == fp
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_fingerprint(fingerprint(key))
+
+    def filter_new(self, keys: Iterable[str]) -> List[str]:
+        """Return the keys not yet in the store (vectorized lookup)."""
+        keys = list(keys)
+        if not keys:
+            return []
+
+        fps = np.fromiter((fingerprint(k) for k in keys), dtype=FINGERPRINT_DTYPE, count=len(keys))
+        base = self._base
+        if len(base):
+            idx = np.minimum(np.searchsorted(base, fps), len(base) - 1)
+            known = base[idx] == fps
+        else:
+            known = np.zeros(len(keys), dtype=bool)
+
+        return [
+            key for key, fp, is_known in zip(keys, fps.tolist(), known.tolist())
+            if not is_known and fp not in self._pending
+        ]
+
+    def add(self, key: str):
+        fp = fingerprint(key)
+        if not self.contains_fingerprint(fp):
+            with self._lock:
+                self._pending.add(fp)
+
+    def flush(self):
+        """Merge pending fingerprints into the on-disk sorted array."""
+        with self._lock:
+            if not self._pending:
+                return
+
+            pending = np.fromiter(self._pending, dtype=FINGERPRINT_DTYPE, count=len(self._pending))
+            merged = np.union1d(np.asarray(self._base), pending).astype(FINGERPRINT_DTYPE)
+
+            # Release the mapping before replacing the file (required on Windows)
+            self._base = merged
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            merged.tofile(tmp_path)
+            os.replace(tmp_path, self.path)
+
+            self._pending.clear()
+            self._base = self._load()
+
+        logger.info(f"Frontier {os.path.basename(self.path)}: {len(self._base)} fingerprints")
+
+
+_stores: Dict[str, FingerprintStore] = {}
+
+
+def get_fingerprint_store(name: str) -> Optional[FingerprintStore]:
+    """Shared store for a namespace (None when CRAWLER_FRONTIER_ENABLED is off)."""
+    if not settings.CRAWLER_FRONTIER_ENABLED:
+        return None
+    if name not in _stores:
+        _stores[name] = FingerprintStore(os.path.join(settings.CRAWLER_CACHE_DIR, f"{name}.u64"))
+    return _stores[name]
@@ -0,0 +1,399 @@
+"""
+Pluggable HTML parser backends with compiled, single-pass extractors.
+
+The BeautifulSoup path builds a Python object per node and runs every
+comma-joined selector from scratch on each `select_one` call: a listing
+item costs a tree walk per field, a TVPL document about a dozen walks of
+the whole page, and article bodies are serialized and parsed again just
+to drop scripts and ads.
+
+Here pages are parsed by lxml (or selectolax, if installed) and the
+crawler selectors are compiled once into matchers. An extractor walks a
+scope once, testing every pending field against each element, so each
+field gets the same element `select_one` would return (the first match
+in document order). Content elements are sanitized in place and
+serialized once.
+
+CRAWLER_PARSER_BACKEND picks the backend: 'lxml', 'selectolax', or 'bs4'
+to keep the BeautifulSoup path.
+
+Supported selector syntax (what the crawler configs use): type, `.class`,
+`#id` and `[attr]`, `[attr=v]`, `[attr*=v]`, `[attr^=v]`, `[attr$=v]`,
+`[attr~=v]` compounds, joined by descendant or `>` combinators, in
+comma-separated groups.
+"""
+
+import re
+import codecs
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Iterator, NamedTuple, Iterable, Union
+
+import lxml.html
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Backends
+BS4 = 'bs4'
+LXML = 'lxml'
+SELECTOLAX = 'selectolax'
+
+# Removed from article and document bodies (shared with clean_html_content)
+STRIP_TAGS = frozenset({'script', 'style', 'iframe', 'noscript'})
+STRIP_CLASSES = frozenset({'ads', 'advertisement', 'tracking'})
+
+
+# ---------------------------------------------------------------------------
+# Selector compilation
+# ---------------------------------------------------------------------------
+
+_COMPOUND = re.compile(r'([a-zA-Z][\w-]*|\*)?((?:[.#][\w-]+|\[[^\]]+\])*)')
+_SIMPLE = re.compile(r'([.#])([\w-]+)|\[\s*([\w-]+)\s*(?:([*^$~]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]*)))?\s*\]')
+
+
+class Compound(NamedTuple):
+    """One compound selector: `tag#id.class[attr op value]`."""
+    tag: Optional[str]
+    id: Optional[str]
+    classes: frozenset
+    attrs: Tuple[Tuple[str, Optional[str], Optional[str]], ...]
+
+    def matches(self, tag: str, attrs: Any) -> bool:
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.id is not None and attrs.get('id') != self.id:
+            return False
+        if self.classes and not self.classes.issubset((attrs.get('class') or '').split()):
+            return False
+        for name, op, value in self.attrs:
+            actual = attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == '=' and actual != value:
+                return False
+            if op == '*=' and value not in actual:
+                return False
+            if op == '^=' and not actual.startswith(value):
+                return False
+            if op == '$=' and not actual.endswith(value):
+                return False
+            if op == '~=' and value not in actual.split():
+                return False
+        return True
+
+
+def _parse_compound(text: str, selector: str) -> Compound:
+    match = _COMPOUND.fullmatch(text)
+    if not match or not text:
+        raise ValueError(f"Unsupported selector: {selector!r}")
+    tag = match.group(1)
+    element_id = None
+    classes = set()
+    attrs = []
+    for simple in _SIMPLE.finditer(match.group(2)):
+        kind, name, attr, op = simple.group(1), simple.group(2), simple.group(3), simple.group(4)
+        if kind == '.':
+            classes.add(name)
+        elif kind == '#':
+            element_id = name
+        else:
+            value = next((v for v in simple.group(5, 6, 7) if v is not None), None)
+            attrs.append((attr.lower(), op, value))
+    return Compound(None if tag in (None, '*') else tag.lower(), element_id, frozenset(classes), tuple(attrs))
+
+
+class Selector:
+    """A compiled comma-separated selector group."""
+
+    def __init__(self, css: str):
+        self.css = css
+        # Each alternative: compounds right to left, each with the combinator
+        # joining it to the compound on its right (' ' or '>')
+        self.alternatives: List[List[Tuple[Compound, str]]] = []
+        for part in css.split(','):
+            tokens = re.sub(r'\s*>\s*', ' > ', part.strip()).split()
+            if not tokens:
+                raise ValueError(f"Unsupported selector: {css!r}")
+            steps = []
+            combinator = ' '
+            for token in reversed(tokens):
+                if token == '>':
+                    combinator = '>'
+                    continue
+                steps.append((_parse_compound(token, css), combinator))
+                combinator = ' '
+            self.alternatives.append(steps)
+
+    def matches(self, element: Any, tag: str, attrs: Any, backend: 'HTMLBackend') -> bool:
+        for steps in self.alternatives:
+            if steps[0][0].matches(tag, attrs) and (
+                len(steps) == 1 or self._match_ancestors(steps, 1, backend.parent(element), backend)
+            ):
+                return True
+        return False
+
+    def _match_ancestors(self, steps, index: int, element: Any, backend: 'HTMLBackend') -> bool:
+        compound, combinator = steps[index]
+        child_combinator = combinator == '>'
+        while element is not None:
+            if compound.matches(backend.tag(element), backend.attrs(element)) and (
+                index + 1 == len(steps) or self._match_ancestors(steps, index + 1, backend.parent(element), backend)
+            ):
+                return True
+            if child_combinator:
+                return False
+            element = backend.parent(element)
+        return False
+
+
+@lru_cache(maxsize=None)
+def compile_selector(css: str) -> Selector:
+    return Selector(css)
+
+
+class FieldExtractor:
+    """
+    Compiled field selectors, matched in one walk over a scope.
+
+    `first` fields get the first matching element (like `select_one`),
+    `every` fields get all matching elements (like `select`).
+    """
+
+    def __init__(self, first: Dict[str, str], every: Optional[Dict[str, str]] = None):
+        self.first = [(name, compile_selector(css)) for name, css in first.items()]
+        self.every = [(name, compile_selector(css)) for name, css in (every or {}).items()]
+
+    def extract(self, scope: Any, backend: 'HTMLBackend') -> Dict[str, Any]:
+        found: Dict[str, Any] = {name: [] for name, _ in self.every}
+        pending = list(self.first)
+        for element, tag, attrs in backend.walk(scope):
+            if pending:
+                matched = [field for field in pending if field[1].matches(element, tag, attrs, backend)]
+                for field in matched:
+                    found[field[0]] = element
+                    pending.remove(field)
+            for name, selector in self.every:
+                if selector.matches(element, tag, attrs, backend):
+                    found[name].append(element)
+            if not pending and not self.every:
+                break
+        return found
+
+
+class ListingExtractor:
+    """Item selector plus per-item fields; yields one field dict per item."""
+
+    def __init__(self, items: str, fields: Dict[str, str]):
+        self.items = compile_selector(items)
+        self.fields = FieldExtractor(fields)
+
+    def extract(self, root: Any, backend: 'HTMLBackend') -> Iterator[Dict[str, Any]]:
+        items = [element for element, tag, attrs in backend.walk(root) if self.items.matches(element, tag, attrs, backend)]
+        for item in items:
+            yield self.fields.extract(item, backend)
+
+
+@lru_cache(maxsize=None)
+def listing_extractor(items: str, fields: Tuple[Tuple[str, str], ...]) -> ListingExtractor:
+    """Compiled listing extractor, cached per selector set (i.e. per source)."""
+    return ListingExtractor(items, dict(fields))
+
+
+@lru_cache(maxsize=None)
+def field_extractor(first: Tuple[Tuple[str, str], ...], every: Tuple[Tuple[str, str], ...] = ()) -> FieldExtractor:
+    """Compiled field extractor, cached per selector set."""
+    return FieldExtractor(dict(first), dict(every))
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class HTMLBackend(ABC):
+    """Tree primitives the extractors need; one subclass per parser library."""
+
+    name = ''
+
+    @abstractmethod
+    def parse(self, html: Union[str, bytes], encoding: Optional[str] = None) -> Any:
+        """
+        Parse a page: text, or raw bytes in `encoding` (decoded by the
+        parser itself, without an intermediate str).
+        """
+        pass
+
+    @abstractmethod
+    def walk(self, scope: Any) -> Iterable[Tuple[Any, str, Any]]:
+        """(element, tag, attributes) of every element below `scope`, in document order."""
+        pass
+
+    @abstractmethod
+    def tag(self, element: Any) -> str:
+        pass
+
+    @abstractmethod
+    def attrs(self, element: Any) -> Any:
+        pass
+
+    @abstractmethod
+    def parent(self, element: Any) -> Any:
+        pass
+
+    @abstractmethod
+    def text(self, element: Any) -> str:
+        """Text like BeautifulSoup's `get_text(strip=True)`."""
+        pass
+
+    def attr(self, element: Any, name: str) -> Optional[str]:
+        return self.attrs(element).get(name)
+
+    @abstractmethod
+    def sanitize(self, element: Any) -> str:
+        """Drop scripts, styles, frames and ad blocks inside `element` in place; returns its HTML."""
+        pass
+
+    @abstractmethod
+    def is_document(self, document: Any) -> bool:
+        """Whether `document` came from this backend's `parse`."""
+        pass
+
+
+class LxmlBackend(HTMLBackend):
+    name = LXML
+
+    def __init__(self):
+        # One parser per encoding (None: text input)
+        self._parsers: Dict[Optional[str], Any] = {}
+
+    def _parser(self, encoding: Optional[str]) -> Any:
+        parser = self._parsers.get(encoding)
+        if parser is None:
+            parser = self._parsers[encoding] = lxml.html.HTMLParser(
+                encoding=encoding, remove_comments=True, remove_pis=True
+            )
+        return parser
+
+    def parse(self, html: Union[str, bytes], encoding: Optional[str] = None) -> Any:
+        if not html.strip():
+            html = '<html></html>'
+        if isinstance(html, str):
+            return lxml.html.document_fromstring(html, parser=self._parser(None))
+        return lxml.html.document_fromstring(html, parser=self._parser(encoding or 'utf-8'))
+
+    def walk(self, scope: Any) -> Iterable[Tuple[Any, str, Any]]:
+        for element in scope.iterdescendants():
+            yield element, element.tag, element.attrib
+
+    def tag(self, element: Any) -> str:
+        return element.tag
+
+    def attrs(self, element: Any) -> Any:
+        return element.attrib
+
+    def parent(self, element: Any) -> Any:
+        return element.getparent()
+
+    def text(self, element: Any) -> str:
+        return ''.join(part.strip() for part in element.itertext())
+
+    def sanitize(self, element: Any) -> str:
+        doomed = [
+            node for node in element.iterdescendants()
+            if node.tag in STRIP_TAGS or not STRIP_CLASSES.isdisjoint((node.get('class') or '').split())
+        ]
+        for node in reversed(doomed):
+            node.drop_tree()
+        return lxml.html.tostring(element, encoding='unicode', with_tail=False)
+
+    def is_document(self, document: Any) -> bool:
+        return isinstance(document, lxml.html.HtmlElement)
+
+
+class SelectolaxBackend(HTMLBackend):
+    name = SELECTOLAX
+
+    def parse(self, html: Union[str, bytes], encoding: Optional[str] = None) -> Any:
+        # Lexbor reads bytes as UTF-8; other encodings are decoded here once
+        if isinstance(html, bytes) and encoding and codecs.lookup(encoding).name != 'utf-8':
+            html = html.decode(encoding, errors='replace')
+        return LexborHTMLParser(html).root
+
+    def walk(self, scope: Any) -> Iterable[Tuple[Any, str, Any]]:
+        nodes = scope.traverse(include_text=False)
+        next(nodes, None)  # The scope itself
+        for node in nodes:
+            tag = node.tag
+            if tag[0] != '-':  # Comments
+                yield node, tag, node.attributes
+
+    def tag(self, element: Any) -> str:
+        return element.tag
+
+    def attrs(self, element: Any) -> Any:
+        return element.attributes
+
+    def parent(self, element: Any) -> Any:
+        parent = element.parent
+        return parent if parent is not None and parent.tag[0] != '-' else None  # Not the document node
+
+    def text(self, element: Any) -> str:
+        return element.text(deep=True, separator='', strip=True)
+
+    def sanitize(self, element: Any) -> str:
+        doomed = [
+            node for node, tag, attrs in self.walk(element)
+            if tag in STRIP_TAGS or not STRIP_CLASSES.isdisjoint((attrs.get('class') or '').split())
+        ]
+        for node in reversed(doomed):  # Innermost first, so no node outlives its parent
+            node.decompose()
+        return element.html
+
+    def is_document(self, document: Any) -> bool:
+        return hasattr(document, 'traverse')
+
+
+_backends: Dict[str, HTMLBackend] = {}
+
+
+def get_html_backend(name: Optional[str] = None) -> Optional[HTMLBackend]:
+    """
+    Parser backend by name (default: CRAWLER_PARSER_BACKEND).
+
+    Returns None for 'bs4' - crawlers then parse with BeautifulSoup.
+    Falls back to lxml when selectolax is requested but not installed.
+    """
+    name = name or settings.CRAWLER_PARSER_BACKEND
+    if name == BS4:
+        return None
+    if name == SELECTOLAX and not SELECTOLAX_AVAILABLE:
+        logger.warning("selectolax is not installed, parsing with lxml")
+        name = LXML
+    if name not in _backends:
+        if name == SELECTOLAX:
+            _backends[name] = SelectolaxBackend()
+        elif name == LXML:
+            _backends[name] = LxmlBackend()
+        else:
+            raise ValueError(f"Unknown parser backend: {name!r}")
+    return _backends[name]
+
+
+def backend_of(document: Any) -> Optional[HTMLBackend]:
+    """Backend whose `parse` produced `document` or its element (None if none did)."""
+    names = (LXML, SELECTOLAX) if SELECTOLAX_AVAILABLE else (LXML,)
+    for name in names:
+        backend = get_html_backend(name)
+        if backend.is_document(document):
+            return backend
+    return None
@@ -0,0 +1,200 @@
+"""
+Persistent conditional-GET cache for crawler fetches.
+
+Stores the body, ETag and Last-Modified of every response that carries a
+validator. Later fetches of the same URL send If-None-Match /
+If-Modified-Since and reuse the stored body when the server answers 304.
+The cache is a single SQLite file, bounded in size with LRU eviction.
+"""
+
+import os
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, Any, NamedTuple, Mapping
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    """Body and metadata of a cached response."""
+    url: str
+    body: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or 'utf-8', errors='replace')
+
+
+class HTTPCache:
+    """SQLite-backed HTTP validator cache with size-bounded LRU eviction."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.path.join(settings.CRAWLER_CACHE_DIR, 'http_cache.sqlite3')
+        self.max_bytes = max_bytes or settings.CRAWLER_CACHE_MAX_MB * 1024 * 1024
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                encoding TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)')
+        self._conn.commit()
+
+        # Counters for this process: revalidations answered 304 (hits) or
+        # in full (misses); first fetches of a URL are neither
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def _row(self, url: str) -> Optional[tuple]:
+        return self._conn.execute(
+            'SELECT etag, last_modified, encoding, body, fetched_at FROM responses WHERE url = ?',
+            (url,)
+        ).fetchone()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers to send for a URL (empty if not cached)."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Read a cached response without touching the counters."""
+        with self._lock:
+            row = self._row(url)
+        if not row:
+            return None
+
+        etag, last_modified, encoding, body, fetched_at = row
+        return CachedResponse(url, zlib.decompress(body), encoding, etag, last_modified, fetched_at)
+
+    def hit(self, url: str) -> Optional[CachedResponse]:
+        """Serve a 304 Not Modified from the cache and refresh its LRU position."""
+        cached = self.get(url)
+        if cached is None:
+            # Evicted since the request was sent: it will be fetched in full
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self._conn.execute('UPDATE responses SET last_access = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+            self.hits += 1
+            self.bytes_saved += len(cached.body)
+        return cached
+
+    def store(self, url: str, headers: Mapping[str, str], body: bytes, encoding: Optional[str] = None):
+        """
+        Record a full (200) response.
+
+        A URL already cached was revalidated and has changed, so it counts
+        as a miss. Responses without ETag or Last-Modified cannot be
+        revalidated and are not stored.
+        """
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+
+        with self._lock:
+            if self._conn.execute('SELECT 1 FROM responses WHERE url = ?', (url,)).fetchone():
+                self.misses += 1
+            if not (etag or last_modified):
+                return
+
+            compressed = zlib.compress(body, 6)
+            now = time.time()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(url, etag, last_modified, encoding, body, size, fetched_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, encoding, compressed, len(compressed), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits `max_bytes`."""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY last_access'):
+            victims.append((url,))
+            freed += size
+            if freed >= excess:
+                break
+
+        self._conn.executemany('DELETE FROM responses WHERE url = ?', victims)
+        self.evictions += len(victims)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process plus current on-disk size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 3),
+            'bytes_saved': self.bytes_saved,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_http_cache: Optional[HTTPCache] = None
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Shared cache instance (None when CRAWLER_CACHE_ENABLED is off)."""
+    global _http_cache
+    if not settings.CRAWLER_CACHE_ENABLED:
+        return None
+    if _http_cache is None:
+        _http_cache = HTTPCache()
+    return _http_cache
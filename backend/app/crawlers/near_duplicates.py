@@ -0,0 +1,181 @@
+"""
+Near-duplicate detection for news articles - MinHash with LSH banding.
+
+The same story is often published by several sources under different URLs.
+Each article's text (diacritic-folded, tags stripped) is split into word
+3-shingles and reduced to a 64-value MinHash signature; the share of equal
+values estimates the Jaccard similarity of the two shingle sets. Articles
+at or above NEWS_NEAR_DUP_THRESHOLD are treated as the same story
+(re-published copies score ~0.85+, different stories on the same topic
+below 0.15).
+
+Lookups use LSH banding: the signature is cut into 16 bands of 4 values,
+and only stored articles sharing at least one whole band are compared.
+For each band the index keeps the stored band keys sorted, so a lookup is
+16 binary searches plus a signature comparison for the few candidates -
+well under a millisecond with hundreds of thousands of entries.
+
+Entries are (article id, signature) records appended to a flat file and
+memory-mapped at start-up; additions collect in memory until `flush()`.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import threading
+from typing import Optional, List, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.crawlers.relevance import fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Raw 12-byte ObjectIds: 'V12', as 'S12' would strip the trailing NUL bytes on read
+RECORD_DTYPE = np.dtype([('article', 'V12'), ('signature', '<u4', (NUM_PERM,))])
+
+SHINGLE_SIZE = 3
+MIN_WORDS = 20          # Shorter texts give unreliable signatures and are not indexed
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+')
+
+# Multiply-shift hash family, fixed so signatures stay comparable across runs
+_rng = np.random.default_rng(0x5EED)
+_PERM_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+# Odd multipliers folding a band's ROWS values into one 64-bit key
+_BAND_MIX = _rng.integers(1, 2**63, size=ROWS, dtype=np.uint64) | np.uint64(1)
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of a text's word 3-shingles (None if the text is too short)."""
+    words = _WORD_RE.findall(fold_diacritics(_TAG_RE.sub(' ', text)))
+    if len(words) < MIN_WORDS:
+        return None
+
+    shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little') for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) >> np.uint64(32)
+    return permuted.min(axis=0).astype('<u4')
+
+
+def article_signature(title: Optional[str], text: Optional[str]) -> Optional[np.ndarray]:
+    """MinHash signature of an article's title and body (HTML or plain text)."""
+    return minhash(f"{title or ''} {text or ''}")
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """(n, BANDS) uint64 keys, one per band of each signature."""
+    bands = signatures.reshape(-1, BANDS, ROWS).astype(np.uint64)
+    return (bands * _BAND_MIX).sum(axis=2, dtype=np.uint64)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity between signature(s) `a` and `b`."""
+    return (a == b).mean(axis=-1)
+
+
+class NearDuplicateIndex:
+    """Persistent MinHash-LSH index of stored articles."""
+
+    def __init__(self, path: str, threshold: Optional[float] = None):
+        self.path = path
+        self.threshold = settings.NEWS_NEAR_DUP_THRESHOLD if threshold is None else threshold
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[np.ndarray, bytes]] = []
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            self._records = np.memmap(self.path, dtype=RECORD_DTYPE, mode='r')
+        else:
+            self._records = np.empty(0, dtype=RECORD_DTYPE)
+
+        # Per band: stored keys sorted, and the record row of each
+        keys = band_keys(np.asarray(self._records['signature']))
+        self._bands: List[Tuple[np.ndarray, np.ndarray]] = []
+        for band in range(BANDS):
+            order = np.argsort(keys[:, band]).astype(np.int32)
+            self._bands.append((keys[order, band], order))
+
+    def __len__(self) -> int:
+        return len(self._records) + len(self._pending)
+
+    def find(self, signature: np.ndarray) -> Optional[bytes]:
+        """Id of the most similar stored article at or above the threshold, if any."""
+        best: Optional[Tuple[float, bytes]] = None
+
+        if len(self._records):
+            query = band_keys(signature)[0]
+            candidates = []
+            for key, (keys, order) in zip(query, self._bands):
+                lo = np.searchsorted(keys, key, side='left')
+                hi = np.searchsorted(keys, key, side='right')
+                candidates.append(order[lo:hi])
+            rows = np.unique(np.concatenate(candidates))
+            if len(rows):
+                scores = similarity(self._records['signature'][rows], signature)
+                nearest = int(np.argmax(scores))
+                if scores[nearest] >= self.threshold:
+                    best = (float(scores[nearest]), bytes(self._records['article'][rows[nearest]]))
+
+        for stored, article in self._pending:
+            score = float(similarity(stored, signature))
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, article)
+
+        return best[1] if best else None
+
+    def add(self, signature: np.ndarray, article: bytes):
+        with self._lock:
+            self._pending.append((signature, article))
+
+    def discard(self, article: bytes):
+        """Drop an entry added in this run (e.g. the article failed to store)."""
+        with self._lock:
+            self._pending = [entry for entry in self._pending if entry[1] != article]
+
+    def flush(self):
+        """Append pending entries to the file and rebuild the band index."""
+        with self._lock:
+            if not self._pending:
+                return
+
+            pending = np.empty(len(self._pending), dtype=RECORD_DTYPE)
+            for row, (signature, article) in enumerate(self._pending):
+                pending[row] = (article, signature)
+
+            # Release the mapping before growing the file (required on Windows)
+            self._records = None
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(pending.tobytes())
+
+            self._pending.clear()
+            self._load()
+
+        logger.info(f"Near-duplicate index {os.path.basename(self.path)}: {len(self._records)} articles")
+
+
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """Shared news index (None when NEWS_NEAR_DUP_ENABLED is off)."""
+    global _near_duplicate_index
+    if not settings.NEWS_NEAR_DUP_ENABLED:
+        return None
+    if _near_duplicate_index is None:
+        _near_duplicate_index = NearDuplicateIndex(os.path.join(settings.CRAWLER_CACHE_DIR, 'news_minhash.bin'))
+    return _near_duplicate_index
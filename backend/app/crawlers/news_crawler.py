@@ -21,14 +21,17 @@ class NewsCrawler(BaseCrawler):
         self.sources = {
             'vnexpress': {
                 'url': settings.VNEXPRESS_URL,
+                'feeds': ['https://vnexpress.net/rss/kinh-doanh.rss'],
                 'parser': self.parse_vnexpress
             },
             'cafef': {
                 'url': settings.CAFEF_URL,
+                'feeds': ['https://cafef.vn/bao-hiem.rss'],
                 'parser': self.parse_cafef
             },
             'vneconomy': {
                 'url': settings.VNECONOMY_URL,
+                'feeds': ['https://vneconomy.vn/tai-chinh.rss'],
                 'parser': self.parse_vneconomy
             },
             'baodautu': {
@@ -37,17 +40,24 @@ class NewsCrawler(BaseCrawler):
             },
             'dantri': {
                 'url': settings.DANTRI_URL,
+                'feeds': ['https://dantri.com.vn/rss/kinh-doanh.rss'],
                 'parser': self.parse_dantri
             },
         }
     
-    def crawl(self, sources: Optional[List[str]] = None, max_articles_per_source: int = 10) -> List[Dict[str, Any]]:
+    def crawl(
+        self,
+        sources: Optional[List[str]] = None,
+        max_articles_per_source: int = 10,
+        since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
         """
         Crawl news articles from specified sources.
         
         Args:
             sources: List of source names to crawl (default: all)
             max_articles_per_source: Maximum articles to crawl per source
+            since: Skip feed entries published before this time (naive UTC)
             
         Returns:
             List of article dictionaries
@@ -65,7 +75,7 @@ class NewsCrawler(BaseCrawler):
             logger.info(f"Crawling {source}...")
             
             try:
-                articles = self.crawl_source(source, max_articles_per_source)
+                articles = self.crawl_source(source, max_articles_per_source, since)
                 all_articles.extend(articles)
                 logger.info(f"Crawled {len(articles)} articles from {source}")
             except Exception as e:
@@ -75,26 +85,42 @@ class NewsCrawler(BaseCrawler):
         logger.info(f"Total articles crawled: {len(all_articles)}")
         return all_articles
     
-    def crawl_source(self, source: str, max_articles: int) -> List[Dict[str, Any]]:
+    def crawl_source(self, source: str, max_articles: int, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Crawl articles from a specific source.
         
+        The source's RSS feed / news sitemap is used when it has one and it
+        can be read; otherwise its listing page is scraped.
+        
         Args:
             source: Source name
             max_articles: Maximum number of articles to crawl
+            since: Skip feed entries published before this time
             
         Returns:
             List of article dictionaries
         """
         source_config = self.sources[source]
-        url = source_config['url']
-        parser = source_config['parser']
         
-        soup = self.fetch_page(url)
-        if not soup:
-            return []
+        entries = None
+        if settings.NEWS_FEED_DISCOVERY and source_config.get('feeds'):
+            entries = self.discover_feeds(source_config['feeds'], since)
         
-        articles = parser(soup, max_articles)
+        if entries is not None:
+            articles = [
+                {
+                    'source_url': entry.link,
+                    'title': entry.title,
+                    'summary': entry.summary,
+                    'featured_image_url': entry.image,
+                }
+                for entry in entries[:max_articles]
+            ]
+        else:
+            soup = self.fetch_page(source_config['url'])
+            if not soup:
+                return []
+            articles = source_config['parser'](soup, max_articles)
         
         # Add source metadata
         for article in articles:
@@ -279,7 +305,7 @@ class NewsCrawler(BaseCrawler):
         content_elem = soup.select_one(selector)
         
         if content_elem:
-            return self.clean_html_content(str(content_elem))
+            return self.sanitize_element(content_elem)
         
         return None
 
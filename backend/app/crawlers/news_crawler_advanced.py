@@ -5,23 +5,56 @@ Targets: CafeF, VnExpress, Company Press Releases (Manulife, BaoViet, Prudential
 
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, AsyncIterator
 from datetime import datetime
 import re
 import random
 
-try:
-    from playwright.async_api import async_playwright, Browser
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-
-from bs4 import BeautifulSoup
 from app.crawlers.base_crawler import BaseCrawler
+from app.crawlers.browser_pool import BrowserPool, RenderProfile, RenderStats, PLAYWRIGHT_AVAILABLE
+from app.crawlers.politeness import PolitenessScheduler
+from app.crawlers.http_cache import HTTPCache
+from app.crawlers.page_archive import PageArchive
+from app.crawlers.frontier import FingerprintStore, NEWS_URLS
+from app.crawlers.renderer import RendererSelector, get_renderer_selector
+from app.crawlers.relevance import INSURANCE_KEYWORDS
+from app.crawlers.feeds import FEED
+from app.crawlers.html_backend import HTMLBackend, listing_extractor
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Runs inside the rendered page: applies a source's list selectors and returns
+# only the raw item fields, so the DOM is never serialized and re-parsed.
+# Text is gathered like BeautifulSoup's get_text(strip=True).
+ARTICLE_LIST_EXTRACTOR = """
+(selectors) => {
+    const text = (el) => {
+        if (!el) return '';
+        const parts = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            const value = walker.currentNode.nodeValue.trim();
+            if (value) parts.push(value);
+        }
+        return parts.join('');
+    };
+    const items = [];
+    for (const item of document.querySelectorAll(selectors.article_list)) {
+        const title = item.querySelector(selectors.title);
+        if (!title) continue;
+        const img = item.querySelector(selectors.image);
+        items.push({
+            title: text(title),
+            link: title.getAttribute('href') || '',
+            summary: text(item.querySelector(selectors.summary)),
+            image: img ? (img.getAttribute('src') || img.getAttribute('data-src')) : null,
+        });
+    }
+    return items;
+}
+"""
+
 
 class NewsAggregatorAdvanced(BaseCrawler):
     """
@@ -30,25 +63,22 @@ class NewsAggregatorAdvanced(BaseCrawler):
     Features:
     - Multi-source crawling (CafeF, VnExpress, Company sites)
     - Keyword filtering
-    - Playwright support
+    - Plain HTTP first, Playwright only for sources that need it
     - Content relevance scoring
     """
     
-    # Insurance-related keywords for filtering
-    REQUIRED_KEYWORDS = [
-        "bảo hiểm",           # Insurance
-        "bồi thường",         # Compensation/Claims
-        "lợi nhuận bảo hiểm", # Insurance profits
-        "phí bảo hiểm",       # Insurance premiums
-        "doanh thu bảo hiểm", # Insurance revenue
-        "thị trường bảo hiểm",# Insurance market
-    ]
+    # Insurance-related keywords and their relevance weights
+    REQUIRED_KEYWORDS = INSURANCE_KEYWORDS
     
     # News sources configuration
     NEWS_SOURCES = {
         'cafef': {
             'name': 'CafeF',
             'url': 'https://cafef.vn/bao-hiem.chn',
+            'feeds': [
+                'https://cafef.vn/tai-chinh-ngan-hang.rss',
+                'https://cafef.vn/bao-hiem.rss',
+            ],
             'category_urls': [
                 'https://cafef.vn/tai-chinh-ngan-hang.chn',
                 'https://cafef.vn/bao-hiem.chn',
@@ -64,6 +94,9 @@ class NewsAggregatorAdvanced(BaseCrawler):
         'vnexpress': {
             'name': 'VnExpress',
             'url': 'https://vnexpress.net/kinh-doanh/bao-hiem',
+            'feeds': [
+                'https://vnexpress.net/rss/kinh-doanh.rss',
+            ],
             'category_urls': [
                 'https://vnexpress.net/kinh-doanh',
                 'https://vnexpress.net/kinh-doanh/bao-hiem',
@@ -114,10 +147,33 @@ class NewsAggregatorAdvanced(BaseCrawler):
         },
     }
     
-    def __init__(self, use_playwright: bool = True):
-        super().__init__()
+    # Article body selectors per source
+    CONTENT_SELECTORS = {
+        'vnexpress': '.fck_detail, .content-detail',
+        'cafef': '.detail-content, .content',
+        'baoviet': '.news-content, .article-body',
+        'manulife': '.content, .article-content',
+        'prudential': '.content-body, .news-content',
+    }
+    DEFAULT_CONTENT_SELECTOR = '.content, .article-content, .detail-content'
+    
+    FRONTIER_NAME = NEWS_URLS
+    
+    def __init__(
+        self,
+        use_playwright: bool = True,
+        scheduler: Optional[PolitenessScheduler] = None,
+        http_cache: Optional[HTTPCache] = None,
+        frontier: Optional[FingerprintStore] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        renderers: Optional[RendererSelector] = None,
+        archive: Optional[PageArchive] = None
+    ):
+        super().__init__(scheduler=scheduler, http_cache=http_cache, frontier=frontier, archive=archive)
         self.use_playwright = use_playwright and PLAYWRIGHT_AVAILABLE
-        self.browser: Optional[Browser] = None
+        self.browser_pool = browser_pool  # Shared pool from the engine, or created per crawl
+        self.render_stats = RenderStats()  # Time/bytes per rendered page, last crawl
+        self.renderers = renderers or get_renderer_selector()
     
     def _get_random_user_agent(self) -> str:
         """Get random user agent."""
@@ -128,26 +184,19 @@ class NewsAggregatorAdvanced(BaseCrawler):
         ]
         return random.choice(user_agents)
     
-    async def _init_playwright(self):
-        """Initialize Playwright browser."""
-        if not PLAYWRIGHT_AVAILABLE:
-            raise ImportError("Playwright not installed")
-        
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=True,
-            args=['--disable-blink-features=AutomationControlled']
-        )
+    def frontier_key(self, key: str) -> str:
+        """Frontier keys are canonical article URLs."""
+        return self.canonical_url(key)
     
-    async def _close_playwright(self):
-        """Close browser."""
-        if self.browser:
-            await self.browser.close()
+    def render_profile(self, config: Dict[str, Any]) -> RenderProfile:
+        """Rendering profile for a source: ready once its article list is in the DOM."""
+        return RenderProfile(ready_selector=config['selectors']['article_list'])
     
     def crawl(
         self,
         sources: Optional[List[str]] = None,
-        max_articles_per_source: int = 10
+        max_articles_per_source: int = 10,
+        since: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """
         Crawl news from multiple sources with keyword filtering.
@@ -155,234 +204,321 @@ class NewsAggregatorAdvanced(BaseCrawler):
         Args:
             sources: List of source names to crawl (default: all)
             max_articles_per_source: Maximum articles per source
+            since: Skip feed entries published before this time (naive UTC)
             
         Returns:
             List of filtered articles
         """
-        if self.use_playwright:
-            return asyncio.run(self._crawl_async(sources, max_articles_per_source))
-        else:
-            return self._crawl_sync(sources, max_articles_per_source)
+        return self.run_async(self.crawl_async(sources, max_articles_per_source, since))
     
-    async def _crawl_async(
+    async def crawl_async(
         self,
-        sources: Optional[List[str]],
-        max_articles: int
+        sources: Optional[List[str]] = None,
+        max_articles_per_source: int = 10,
+        since: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
-        """Async crawl with Playwright."""
-        sources = sources or list(self.NEWS_SOURCES.keys())
-        all_articles = []
+        """
+        Async crawl entry point for callers already inside an event loop.
+        
+        Collects `crawl_stream()` into a list.
+        
+        Args:
+            sources: List of source names to crawl (default: all)
+            max_articles_per_source: Maximum articles per source
+            since: Skip feed entries published before this time (naive UTC)
+            
+        Returns:
+            List of filtered articles
+        """
+        return [article async for article in self.crawl_stream(sources, max_articles_per_source, since)]
+    
+    async def crawl_stream(
+        self,
+        sources: Optional[List[str]] = None,
+        max_articles_per_source: int = 10,
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield relevant new articles as soon as their listing page is parsed.
+        
+        Sources with RSS feeds / news sitemaps are read from those (one
+        small XML fetch, entries before `since` dropped). The others, and
+        sources whose feeds cannot be read, are crawled from their listing
+        pages: category URLs concurrently, each site paced by the
+        politeness scheduler. Pages are fetched over HTTP first and only
+        rendered in the browser when the source's selectors come back
+        empty (see RendererSelector); the browser is not launched at all
+        if no source needs it.
+        
+        Args:
+            sources: List of source names to crawl (default: all)
+            max_articles_per_source: Maximum articles per source
+            since: Skip feed entries published before this time, e.g. the
+                start of the last successful crawl (naive UTC)
+            
+        Yields:
+            Article dictionaries (keyword-filtered, not stored before)
+        """
+        self.render_stats = RenderStats()
         seen_urls: Set[str] = set()
+        total = 0
         
-        await self._init_playwright()
+        known_sources = []
+        for source_name in sources or list(self.NEWS_SOURCES.keys()):
+            if source_name not in self.NEWS_SOURCES:
+                logger.warning(f"Unknown source: {source_name}")
+                continue
+            known_sources.append(source_name)
         
-        try:
-            for source_name in sources:
-                if source_name not in self.NEWS_SOURCES:
-                    logger.warning(f"Unknown source: {source_name}")
-                    continue
-                
-                source_config = self.NEWS_SOURCES[source_name]
-                logger.info(f"Crawling {source_config['name']}...")
-                
-                try:
-                    articles = await self._crawl_source_async(
-                        source_name,
-                        source_config,
-                        max_articles
-                    )
-                    
-                    # Filter by keywords and duplicates
-                    filtered = []
-                    for article in articles:
-                        url = article.get('source_url', '')
-                        if url and url not in seen_urls:
-                            if self._is_relevant_article(article):
-                                seen_urls.add(url)
-                                filtered.append(article)
-                    
-                    all_articles.extend(filtered)
-                    logger.info(f"  ✓ {len(filtered)} relevant articles from {source_config['name']}")
-                    
-                except Exception as e:
-                    logger.error(f"Error crawling {source_name}: {e}")
-                    continue
-                
-                # Delay between sources
-                await asyncio.sleep(random.uniform(3, 5))
+        # Standalone runs launch their own browser; the engine passes a shared pool
+        owns_pool = self.use_playwright and self.browser_pool is None
+        if owns_pool:
+            self.browser_pool = BrowserPool()
         
+        try:
+            async for article in self.iter_concurrently(
+                self._crawl_source_stream(name, self.NEWS_SOURCES[name], max_articles_per_source, seen_urls, since)
+                for name in known_sources
+            ):
+                total += 1
+                yield article
         finally:
-            await self._close_playwright()
+            if owns_pool:
+                await self.browser_pool.close()
+                self.browser_pool = None
+            self.renderers.save()
         
-        logger.info(f"✓ Total: {len(all_articles)} relevant articles crawled")
-        return all_articles
+        logger.info(f"✓ Total: {total} relevant articles crawled")
     
-    async def _crawl_source_async(
+    async def _crawl_source_stream(
         self,
         source_name: str,
         config: Dict[str, Any],
-        max_articles: int
-    ) -> List[Dict[str, Any]]:
-        """Crawl a single source asynchronously."""
-        articles = []
+        max_articles: int,
+        seen_urls: Set[str],
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Crawl a single source, from its feeds or its listing pages, yielding relevant articles."""
+        logger.info(f"Crawling {config['name']}...")
         
-        # Get URLs to crawl
-        urls_to_crawl = config.get('category_urls', [config['url']])
+        parsed_count = 0
+        relevant_count = 0
         
-        for url in urls_to_crawl:
-            try:
-                if not self.browser:
-                    raise RuntimeError("Browser not initialized")
-                
-                page = await self.browser.new_page()
-                await page.set_extra_http_headers({
-                    'User-Agent': self._get_random_user_agent(),
-                    'Accept-Language': 'vi-VN,vi;q=0.9',
-                })
-                
-                await page.goto(url, wait_until='networkidle', timeout=30000)
-                await asyncio.sleep(random.uniform(2, 3))
-                
-                content = await page.content()
-                soup = BeautifulSoup(content, 'lxml')
-                
-                # Parse articles
-                parsed = self._parse_source_articles(soup, source_name, config)
-                articles.extend(parsed[:max_articles])
-                
-                await page.close()
-                
-            except Exception as e:
-                logger.debug(f"Error crawling {url}: {e}")
-                continue
+        async for listing in self._source_listings(source_name, config, since):
+            articles = listing[:max(max_articles - parsed_count, 0)]
+            parsed_count += len(articles)
+            
+            # Filter by keywords, duplicates and articles stored by earlier runs
+            for article in articles:
+                url = article.get('source_url', '')
+                if url and url not in seen_urls and not self.is_known(url):
+                    if self._is_relevant_article(article):
+                        seen_urls.add(url)
+                        relevant_count += 1
+                        yield article
+        
+        logger.info(f"  ✓ {relevant_count} relevant articles from {config['name']}")
+    
+    async def _source_listings(
+        self,
+        source_name: str,
+        config: Dict[str, Any],
+        since: Optional[datetime] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Article lists of a source: one from its feeds if any can be read,
+        otherwise one per listing page as each finishes loading.
+        """
+        if settings.NEWS_FEED_DISCOVERY and config.get('feeds'):
+            entries = await self.discover_feeds_async(config['feeds'], since)
+            if entries is not None:
+                self.render_stats.count_renderer(FEED)
+                logger.info(f"  {config['name']}: {len(entries)} feed entries since {since or 'ever'}")
+                yield self._build_articles([entry.as_list_item() for entry in entries], source_name, config)
+                return
+            logger.info(f"  {config['name']}: no readable feed, scraping listing pages")
         
-        return articles[:max_articles]
+        urls_to_crawl = config.get('category_urls', [config['url']])
+        for listing in asyncio.as_completed([
+            self._crawl_listing_page_async(url, source_name, config) for url in urls_to_crawl
+        ]):
+            yield await listing
     
-    def _crawl_sync(
+    async def _crawl_listing_page_async(
         self,
-        sources: Optional[List[str]],
-        max_articles: int
+        url: str,
+        source_name: str,
+        config: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Sync crawl with requests."""
-        sources = sources or list(self.NEWS_SOURCES.keys())
-        all_articles = []
-        seen_urls: Set[str] = set()
+        """Load one listing URL with the source's renderer and parse its articles."""
+        profile = self.render_profile(config)
+        headers = {
+            'User-Agent': self._get_random_user_agent(),
+            'Accept-Language': 'vi-VN,vi;q=0.9',
+        }
         
-        for source_name in sources:
-            if source_name not in self.NEWS_SOURCES:
-                continue
-            
-            source_config = self.NEWS_SOURCES[source_name]
-            logger.info(f"Crawling {source_config['name']}...")
+        async def fetch_http() -> Optional[List[Dict[str, Any]]]:
+            document = await self.fetch_document_async(url, headers=headers)
+            return self._parse_source_articles(document, source_name, config) if document is not None else None
+        
+        async def render_browser() -> List[Dict[str, Any]]:
+            rendered = await self.browser_pool.render(
+                url,
+                profile,
+                headers=headers,
+                scheduler=self.scheduler,
+                extractor=ARTICLE_LIST_EXTRACTOR,
+                extractor_arg=self._list_selectors(config)
+            )
+            self.render_stats.record(rendered.metrics)
             
-            try:
-                # Update user agent
-                self.session.headers['User-Agent'] = self._get_random_user_agent()
-                
-                # Crawl main URL and category URLs
-                urls_to_crawl = source_config.get('category_urls', [source_config['url']])
-                
-                for url in urls_to_crawl:
-                    soup = self.fetch_page(url)
-                    if not soup:
-                        continue
-                    
-                    articles = self._parse_source_articles(soup, source_name, source_config)
-                    
-                    # Filter and add
-                    for article in articles[:max_articles]:
-                        url = article.get('source_url', '')
-                        if url and url not in seen_urls and self._is_relevant_article(article):
-                            seen_urls.add(url)
-                            all_articles.append(article)
-                
-                logger.info(f"  ✓ Articles from {source_config['name']}")
-                
-            except Exception as e:
-                logger.error(f"Error crawling {source_name}: {e}")
-                continue
+            if rendered.extracted is not None:
+                return self._build_articles(rendered.extracted, source_name, config)
+            # Extractor failed in the page: parse the serialized DOM instead
+            await self.archive_page_async(url, {}, rendered.html.encode('utf-8'), 'utf-8', renderer='browser')
+            return self._parse_source_articles(self.parse_html(rendered.html), source_name, config)
         
-        logger.info(f"✓ Total: {len(all_articles)} relevant articles")
-        return all_articles
+        try:
+            articles, renderer = await self.renderers.load(
+                source_name,
+                profile.ready_selector,
+                fetch_http=fetch_http,
+                render_browser=render_browser if self.use_playwright else None,
+                is_ready=bool
+            )
+            self.render_stats.count_renderer(renderer)
+            return articles or []
+            
+        except Exception as e:
+            logger.debug(f"Error crawling {url}: {e}")
+            return []
     
     def _parse_source_articles(
         self,
-        soup: BeautifulSoup,
+        soup: Any,
         source_name: str,
         config: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Parse articles from a specific source."""
-        articles = []
-        selectors = config.get('selectors', {})
+        """
+        Parse articles from a specific source.
+        
+        `soup` is a BeautifulSoup tree or a `parse_html` document; the
+        latter goes through the source's compiled listing extractor.
+        """
+        selectors = self._list_selectors(config)
+        backend = self.document_backend(soup)
+        if backend:
+            return self._build_articles(self._extract_list_items(soup, backend, selectors), source_name, config)
+        
+        raw_items = []
         
         # Find all article items
-        items = soup.select(selectors.get('article_list', '.article-item'))
+        items = soup.select(selectors['article_list'])
         
         for item in items:
             try:
                 # Extract title and link
-                title_elem = item.select_one(selectors.get('title', 'a'))
+                title_elem = item.select_one(selectors['title'])
                 if not title_elem:
                     continue
                 
-                title = title_elem.get_text(strip=True)
-                link = title_elem.get('href', '')
-                
-                # Complete relative URLs
-                if link and not link.startswith('http'):
-                    base_url = config['url'].split('/')[0] + '//' + config['url'].split('/')[2]
-                    if link.startswith('/'):
-                        link = base_url + link
-                    else:
-                        link = base_url + '/' + link
-                
-                # Extract summary
-                summary = self.extract_text(item, selectors.get('summary', '.summary'))
-                
                 # Extract image
-                img_elem = item.select_one(selectors.get('image', 'img'))
+                img_elem = item.select_one(selectors['image'])
                 img_url = img_elem.get('src') or img_elem.get('data-src') if img_elem else None
                 
-                article = {
-                    'source_name': source_name,
-                    'source_display_name': config['name'],
-                    'source_url': link,
-                    'title': title,
-                    'summary': summary,
-                    'featured_image_url': img_url,
-                    'crawled_at': datetime.now(),
-                    'is_company_source': config.get('is_company', False)
-                }
-                
-                articles.append(article)
+                raw_items.append({
+                    'title': title_elem.get_text(strip=True),
+                    'link': title_elem.get('href', ''),
+                    'summary': self.extract_text(item, selectors['summary']),
+                    'image': img_url,
+                })
                 
             except Exception as e:
                 logger.debug(f"Error parsing article item: {e}")
                 continue
         
-        return articles
+        return self._build_articles(raw_items, source_name, config)
     
-    def _is_relevant_article(self, article: Dict[str, Any]) -> bool:
+    def _extract_list_items(
+        self,
+        document: Any,
+        backend: HTMLBackend,
+        selectors: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """Raw list items of a `parse_html` document, each read in one pass over the item."""
+        extractor = listing_extractor(selectors['article_list'], (
+            ('title', selectors['title']),
+            ('summary', selectors['summary']),
+            ('image', selectors['image']),
+        ))
+        raw_items = []
+        for fields in extractor.extract(document, backend):
+            title_elem = fields.get('title')
+            if title_elem is None:
+                continue
+            summary_elem = fields.get('summary')
+            img_elem = fields.get('image')
+            raw_items.append({
+                'title': backend.text(title_elem),
+                'link': backend.attr(title_elem, 'href') or '',
+                'summary': backend.text(summary_elem) if summary_elem is not None else '',
+                'image': backend.attr(img_elem, 'src') or backend.attr(img_elem, 'data-src') if img_elem is not None else None,
+            })
+        return raw_items
+    
+    def _list_selectors(self, config: Dict[str, Any]) -> Dict[str, str]:
+        """A source's listing selectors with defaults filled in."""
+        selectors = config.get('selectors', {})
+        return {
+            'article_list': selectors.get('article_list', '.article-item'),
+            'title': selectors.get('title', 'a'),
+            'summary': selectors.get('summary', '.summary'),
+            'image': selectors.get('image', 'img'),
+        }
+    
+    def _build_articles(
+        self,
+        raw_items: List[Dict[str, Any]],
+        source_name: str,
+        config: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
         """
-        Filter articles by keywords.
+        Turn raw list items (title, link, summary, image) into article dicts.
         
-        Only accept articles containing:
-        - "Bảo hiểm"
-        - "Bồi thường"
-        - "Lợi nhuận bảo hiểm"
-        - "Phí bảo hiểm"
+        Shared by the BeautifulSoup parser and the in-page extractor.
         """
-        title = (article.get('title') or '').lower()
-        summary = (article.get('summary') or '').lower()
+        articles = []
         
-        combined_text = f"{title} {summary}"
+        for raw in raw_items:
+            # Absolute, canonical URL (relative links resolve against the source)
+            link = self.canonical_url(raw['link'], base=config['url']) if raw.get('link') else ''
+            
+            articles.append({
+                'source_name': source_name,
+                'source_display_name': config['name'],
+                'source_url': link,
+                'title': raw.get('title', ''),
+                'summary': raw.get('summary', ''),
+                'featured_image_url': raw.get('image'),
+                'crawled_at': datetime.now(),
+                'is_company_source': config.get('is_company', False)
+            })
         
-        # Check if any required keyword is present
-        for keyword in self.REQUIRED_KEYWORDS:
-            if keyword.lower() in combined_text:
-                return True
+        return articles
+    
+    def _is_relevant_article(self, article: Dict[str, Any]) -> bool:
+        """
+        Score an article against the insurance keywords.
         
-        return False
+        Stores `relevance_score` and `matched_keywords` on the article and
+        accepts it when the score reaches NEWS_MIN_RELEVANCE_SCORE. Matching
+        ignores diacritics, so "bao hiem" counts as "bảo hiểm".
+        """
+        relevance = self.relevance.score(article.get('title'), article.get('summary'))
+        article['relevance_score'] = relevance.score
+        article['matched_keywords'] = relevance.terms
+        
+        return relevance.score >= settings.NEWS_MIN_RELEVANCE_SCORE
     
     def fetch_article_content(self, url: str, source_name: str) -> Optional[str]:
         """
@@ -395,24 +531,50 @@ class NewsAggregatorAdvanced(BaseCrawler):
         Returns:
             HTML content
         """
-        soup = self.fetch_page(url)
-        if not soup:
+        document = self.fetch_document(url)
+        if document is None:
             return None
         
-        # Source-specific content selectors
-        content_selectors = {
-            'vnexpress': '.fck_detail, .content-detail',
-            'cafef': '.detail-content, .content',
-            'baoviet': '.news-content, .article-body',
-            'manulife': '.content, .article-content',
-            'prudential': '.content-body, .news-content',
-        }
+        return self._extract_article_content(document, source_name)
+    
+    async def fetch_article_content_async(self, url: str, source_name: str) -> Optional[str]:
+        """
+        Fetch full article content without blocking the event loop.
+        
+        Article pages rarely change once published, so a body already in
+        the HTTP cache is used as is, without a request. Otherwise the
+        page is fetched within the host's politeness slot.
+        
+        Args:
+            url: Article URL
+            source_name: Source identifier
+            
+        Returns:
+            Cleaned HTML content
+        """
+        url = self.canonical_url(url)
+        cached = await asyncio.to_thread(self.http_cache.get, url) if self.http_cache else None
+        if cached is not None:
+            document = self.parse_html(cached.body, cached.encoding)
+        else:
+            document = await self.fetch_document_async(url, headers={'User-Agent': self._get_random_user_agent()})
+        
+        if document is None:
+            return None
         
-        selector = content_selectors.get(source_name, '.content, .article-content, .detail-content')
-        content_elem = soup.select_one(selector)
+        return self._extract_article_content(document, source_name)
+    
+    def _extract_article_content(self, soup: Any, source_name: str) -> Optional[str]:
+        """
+        Cleaned HTML of the article body, using the source's content selector.
+        
+        Works on BeautifulSoup trees and `parse_html` documents alike.
+        """
+        selector = self.CONTENT_SELECTORS.get(source_name, self.DEFAULT_CONTENT_SELECTOR)
+        content_elem = self.select_first(soup, selector)
         
-        if content_elem:
-            return self.clean_html_content(str(content_elem))
+        if content_elem is not None:
+            return self.sanitize_element(content_elem)
         
         return None
 
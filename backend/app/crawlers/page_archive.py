@@ -0,0 +1,280 @@
+"""
+Raw-page archive - every fetched response, compressed and content-addressed.
+
+When a selector breaks, the pages already fetched can be parsed again
+(`reparse_archive.py`) instead of crawling the sites a second time.
+
+Bodies are zlib-compressed and appended to segment files
+(`segment-00000.z`, rolled over at CRAWLER_ARCHIVE_SEGMENT_MB); a body is
+stored once per BLAKE2b digest, so re-fetching an unchanged page only adds
+a fetch record. A SQLite index holds the fetch records (URL, fetch time,
+response headers, encoding, renderer) and where each body lives. Segments
+are never rewritten, so readers in other processes can open them while
+the crawler appends.
+
+The archive is bounded in age and size, a whole segment at a time:
+whenever a segment fills up, fetch records older than
+CRAWLER_ARCHIVE_MAX_AGE_DAYS are dropped, then segments no record refers
+to any more, then the oldest segments while the archive is over
+CRAWLER_ARCHIVE_MAX_MB.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Optional, Dict, Any, Iterator, Mapping, NamedTuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_NAME = 'segment-{:05d}.z'
+
+
+class ArchivedPage(NamedTuple):
+    """Fetch record of an archived page; the body is read with `read_body`."""
+    url: str
+    fetched_at: float
+    headers: Dict[str, str]
+    encoding: Optional[str]
+    renderer: str
+    digest: str
+    segment: str
+    offset: int
+    length: int
+
+
+def read_body(page: ArchivedPage) -> bytes:
+    """Decompress an archived body (usable from worker processes)."""
+    with open(page.segment, 'rb') as f:
+        f.seek(page.offset)
+        return zlib.decompress(f.read(page.length))
+
+
+class PageArchive:
+    """Append-only segment files plus a SQLite index of fetches."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        segment_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_age_days: Optional[float] = None
+    ):
+        self.directory = directory or settings.CRAWLER_ARCHIVE_DIR
+        self.segment_bytes = segment_bytes or settings.CRAWLER_ARCHIVE_SEGMENT_MB * 1024 * 1024
+        self.max_bytes = max_bytes or settings.CRAWLER_ARCHIVE_MAX_MB * 1024 * 1024
+        self.max_age = (max_age_days or settings.CRAWLER_ARCHIVE_MAX_AGE_DAYS) * 86400
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.directory, 'index.sqlite3'), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fetches (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                renderer TEXT NOT NULL,
+                digest TEXT NOT NULL REFERENCES blobs (digest)
+            );
+            CREATE INDEX IF NOT EXISTS idx_fetches_url ON fetches (url, fetched_at);
+        ''')
+        self._conn.commit()
+
+        # Evicted segments leave gaps; continue after the newest file on disk
+        row = self._conn.execute('SELECT MAX(segment) FROM blobs').fetchone()
+        on_disk = [
+            int(name[len('segment-'):-len('.z')]) for name in os.listdir(self.directory)
+            if name.startswith('segment-') and name.endswith('.z')
+        ]
+        self._segment = max([row[0] or 0] + on_disk)
+        self._file = None
+
+        # Counters for this process
+        self.stored = 0
+        self.deduplicated = 0
+        self.evictions = 0
+
+        with self._lock:
+            self._evict(time.time())
+            self._conn.commit()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, SEGMENT_NAME.format(segment))
+
+    def _append(self, data: bytes) -> tuple:
+        """Write a compressed body to the current segment; returns (segment, offset)."""
+        if self._file is None:
+            self._file = open(self._segment_path(self._segment), 'ab')
+        offset = self._file.tell()
+        if offset and offset + len(data) > self.segment_bytes:
+            self._file.close()
+            self._segment += 1
+            self._file = open(self._segment_path(self._segment), 'ab')
+            offset = 0
+            self._evict(time.time())
+        self._file.write(data)
+        self._file.flush()
+        return self._segment, offset
+
+    def _evict(self, now: float):
+        """
+        Drop expired fetch records, then whole segments: ones no record refers
+        to, and the oldest while the archive is over `max_bytes`. The segment
+        being appended to is kept.
+        """
+        self._conn.execute('DELETE FROM fetches WHERE fetched_at < ?', (now - self.max_age,))
+        self._conn.execute('DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM fetches)')
+        live = {segment for segment, in self._conn.execute('SELECT DISTINCT segment FROM blobs')}
+
+        sizes = {}
+        for segment in range(self._segment + 1):
+            path = self._segment_path(segment)
+            if os.path.exists(path):
+                sizes[segment] = os.path.getsize(path)
+        total = sum(sizes.values())
+
+        for segment, size in sizes.items():
+            if segment == self._segment or (segment in live and total <= self.max_bytes):
+                continue
+            self._conn.execute(
+                'DELETE FROM fetches WHERE digest IN (SELECT digest FROM blobs WHERE segment = ?)', (segment,)
+            )
+            self._conn.execute('DELETE FROM blobs WHERE segment = ?', (segment,))
+            os.remove(self._segment_path(segment))
+            total -= size
+            self.evictions += 1
+
+    def store(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        encoding: Optional[str] = None,
+        renderer: str = 'http'
+    ) -> str:
+        """
+        Archive one fetched response.
+
+        Args:
+            url: Canonical URL fetched
+            headers: Response headers
+            body: Raw (decoded transfer-encoding) body
+            encoding: Character encoding used to decode the body
+            renderer: 'http', or 'browser' for serialized rendered DOMs
+
+        Returns:
+            Content digest of the body
+        """
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        header_json = json.dumps({key.lower(): value for key, value in headers.items()}, ensure_ascii=False)
+
+        with self._lock:
+            known = self._conn.execute('SELECT 1 FROM blobs WHERE digest = ?', (digest,)).fetchone()
+            if known:
+                self.deduplicated += 1
+            else:
+                compressed = zlib.compress(body, 6)
+                segment, offset = self._append(compressed)
+                self._conn.execute(
+                    'INSERT INTO blobs (digest, segment, offset, length, size) VALUES (?, ?, ?, ?, ?)',
+                    (digest, segment, offset, len(compressed), len(body))
+                )
+                self.stored += 1
+
+            self._conn.execute(
+                'INSERT INTO fetches (url, fetched_at, headers, encoding, renderer, digest) VALUES (?, ?, ?, ?, ?, ?)',
+                (url, time.time(), header_json, encoding, renderer, digest)
+            )
+            self._conn.commit()
+        return digest
+
+    def pages(
+        self,
+        url_prefix: Optional[str] = None,
+        since: Optional[float] = None,
+        latest_only: bool = True
+    ) -> Iterator[ArchivedPage]:
+        """
+        Archived fetches, oldest first.
+
+        Args:
+            url_prefix: Only URLs starting with this prefix
+            since: Only fetches at or after this Unix time
+            latest_only: Only the most recent fetch of each URL
+        """
+        query = (
+            'SELECT f.url, f.fetched_at, f.headers, f.encoding, f.renderer, f.digest, b.segment, b.offset, b.length '
+            'FROM fetches f JOIN blobs b ON b.digest = f.digest WHERE 1 = 1'
+        )
+        params: list = []
+        if url_prefix:
+            query += ' AND f.url >= ? AND f.url < ?'
+            params += [url_prefix, url_prefix + '\uffff']
+        if since is not None:
+            query += ' AND f.fetched_at >= ?'
+            params.append(since)
+        if latest_only:
+            query += ' AND f.id = (SELECT MAX(id) FROM fetches WHERE url = f.url)'
+        query += ' ORDER BY f.fetched_at'
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        for url, fetched_at, headers, encoding, renderer, digest, segment, offset, length in rows:
+            yield ArchivedPage(
+                url, fetched_at, json.loads(headers), encoding, renderer, digest,
+                self._segment_path(segment), offset, length
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process plus archive totals."""
+        with self._lock:
+            fetches = self._conn.execute('SELECT COUNT(*) FROM fetches').fetchone()[0]
+            blobs, raw, compressed = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length), 0) FROM blobs'
+            ).fetchone()
+        return {
+            'stored': self.stored,
+            'deduplicated': self.deduplicated,
+            'evictions': self.evictions,
+            'fetches': fetches,
+            'bodies': blobs,
+            'raw_bytes': raw,
+            'compressed_bytes': compressed,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._conn.close()
+
+
+_page_archive: Optional[PageArchive] = None
+
+
+def get_page_archive() -> Optional[PageArchive]:
+    """Shared archive instance (None when CRAWLER_ARCHIVE_ENABLED is off)."""
+    global _page_archive
+    if not settings.CRAWLER_ARCHIVE_ENABLED:
+        return None
+    if _page_archive is None:
+        _page_archive = PageArchive()
+    return _page_archive
@@ -0,0 +1,236 @@
+"""
+Per-host politeness scheduler shared by all crawlers.
+
+Each host gets its own token bucket (rate budget) and concurrency limit, so
+requests to different sites interleave freely while every single site still
+sees at most one request per `CRAWLER_DELAY_SECONDS` (or its robots.txt
+`Crawl-delay`, whichever is stricter).
+"""
+
+import time
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Set, AsyncIterator
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import requests
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket.
+
+    `reserve()` always takes a token and returns how long the caller has to
+    wait for it, letting the balance go negative. Concurrent callers therefore
+    queue up in order without holding a lock while they sleep.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        """Change the refill rate (tokens per second)."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def reserve(self) -> float:
+        """Take one token; return seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class PolitenessScheduler:
+    """
+    Rate budget and concurrency limit per host.
+
+    Usage:
+        async with scheduler.slot(url):
+            response = await client.get(url)
+
+    or, from blocking code, `scheduler.wait_blocking(url)` before the request.
+    """
+
+    def __init__(
+        self,
+        default_delay: Optional[float] = None,
+        max_per_host: Optional[int] = None,
+        burst: Optional[int] = None,
+        host_delays: Optional[Dict[str, float]] = None,
+        respect_robots: Optional[bool] = None,
+        user_agent: Optional[str] = None
+    ):
+        self.default_delay = settings.CRAWLER_DELAY_SECONDS if default_delay is None else default_delay
+        self.max_per_host = max_per_host or settings.CRAWLER_MAX_PER_HOST
+        self.burst = burst or settings.CRAWLER_BURST
+        self.host_delays = settings.CRAWLER_HOST_DELAYS if host_delays is None else host_delays
+        self.respect_robots = settings.CRAWLER_RESPECT_ROBOTS if respect_robots is None else respect_robots
+        self.user_agent = user_agent or settings.CRAWLER_USER_AGENT
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._crawl_delays: Dict[str, float] = {}
+        self._robots_checked: Set[str] = set()
+
+        # asyncio primitives are tied to the loop that first uses them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._robots_pending: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Host used to group requests (lowercased netloc)."""
+        return urlsplit(url).netloc.lower()
+
+    def delay_for(self, host: str) -> float:
+        """Effective minimum interval between requests to a host."""
+        configured = self.host_delays.get(host, self.default_delay)
+        return max(configured, self._crawl_delays.get(host, 0.0))
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            delay = self.delay_for(host)
+            bucket = TokenBucket(rate=1.0 / delay if delay > 0 else 0.0, capacity=self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._slots = {}
+            self._robots_pending = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_per_host)
+            self._slots[host] = slot
+        return slot
+
+    # ------------------------------------------------------------------
+    # robots.txt
+    # ------------------------------------------------------------------
+
+    def _apply_robots(self, host: str, robots_txt: str):
+        """Parse robots.txt and tighten the host's rate if it asks for it."""
+        parser = RobotFileParser()
+        parser.parse(robots_txt.splitlines())
+
+        delay = parser.crawl_delay(self.user_agent)
+        rate = parser.request_rate(self.user_agent)
+        if rate and rate.requests:
+            delay = max(float(delay or 0), rate.seconds / rate.requests)
+
+        if delay:
+            self._crawl_delays[host] = float(delay)
+            effective = self.delay_for(host)
+            self._bucket(host).set_rate(1.0 / effective if effective > 0 else 0.0)
+            logger.info(f"robots.txt Crawl-delay for {host}: {float(delay):.1f}s")
+
+    @staticmethod
+    def _robots_url(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}/robots.txt"
+
+    async def _ensure_robots(self, url: str, client: Optional[httpx.AsyncClient]):
+        host = self.host_key(url)
+        if not self.respect_robots or host in self._robots_checked:
+            return
+
+        pending = self._robots_pending.get(host)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_robots(url, client))
+            self._robots_pending[host] = pending
+        await asyncio.shield(pending)
+
+    async def _fetch_robots(self, url: str, client: Optional[httpx.AsyncClient]):
+        host = self.host_key(url)
+        try:
+            if client is not None:
+                response = await client.get(self._robots_url(url))
+            else:
+                async with httpx.AsyncClient(timeout=settings.CRAWLER_TIMEOUT) as own_client:
+                    response = await own_client.get(self._robots_url(url))
+            if response.status_code == 200:
+                self._apply_robots(host, response.text)
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not read robots.txt for {host}: {e}")
+        finally:
+            self._robots_checked.add(host)
+
+    def _ensure_robots_blocking(self, url: str, session: Optional[requests.Session]):
+        host = self.host_key(url)
+        if not self.respect_robots or host in self._robots_checked:
+            return
+
+        try:
+            getter = session.get if session is not None else requests.get
+            response = getter(self._robots_url(url), timeout=settings.CRAWLER_TIMEOUT)
+            if response.status_code == 200:
+                self._apply_robots(host, response.text)
+        except requests.RequestException as e:
+            logger.debug(f"Could not read robots.txt for {host}: {e}")
+        finally:
+            self._robots_checked.add(host)
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, url: str, client: Optional[httpx.AsyncClient] = None) -> AsyncIterator[None]:
+        """
+        Hold one of the host's concurrency slots, after waiting for its rate budget.
+
+        Args:
+            url: URL about to be requested
+            client: Client used to fetch robots.txt on first contact with the host
+        """
+        self._bind_loop()
+        host = self.host_key(url)
+        await self._ensure_robots(url, client)
+
+        async with self._semaphore(host):
+            wait = self._bucket(host).reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+
+    def wait_blocking(self, url: str, session: Optional[requests.Session] = None):
+        """Blocking variant of `slot()` for the synchronous requests-based crawlers."""
+        host = self.host_key(url)
+        self._ensure_robots_blocking(url, session)
+
+        wait = self._bucket(host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Global scheduler shared by every crawler in the process
+politeness_scheduler = PolitenessScheduler()
@@ -0,0 +1,149 @@
+"""
+Keyword relevance matcher shared by all crawlers.
+
+Keywords are diacritic-folded ('Bảo hiểm' -> 'bao hiem') and compiled into
+one regular expression whose alternation is factored as a prefix trie
+(Aho-Corasick style), so a text is scanned once in C no matter how many
+keywords there are. Folding the text itself costs more than the scan, so
+it is not folded: each letter of the pattern accepts all of its accented
+forms, and combining marks after vowels, so 'bảo hiểm', 'bao hiem' and
+'bảo hiểm' in NFD form all match as written. Only matched spans are
+folded, to look up their keyword. Branches start with plain characters,
+which lets the regex engine skip ahead to candidate positions.
+
+Each match adds its keyword's weight to the score; matches in the title
+count TITLE_WEIGHT times.
+"""
+
+import re
+import unicodedata
+from typing import Optional, Dict, List, Iterable, NamedTuple
+
+# Insurance keywords and their weights; longer phrases outrank the bare term
+INSURANCE_KEYWORDS: Dict[str, float] = {
+    "bảo hiểm": 1.0,              # Insurance
+    "bồi thường": 1.0,            # Compensation/Claims
+    "lợi nhuận bảo hiểm": 2.0,    # Insurance profits
+    "phí bảo hiểm": 2.0,          # Insurance premiums
+    "doanh thu bảo hiểm": 2.0,    # Insurance revenue
+    "thị trường bảo hiểm": 2.0,   # Insurance market
+}
+
+# Multiplier for matches in the title
+TITLE_WEIGHT = 2.0
+
+# Lowercase Vietnamese letters with diacritics, matched wherever their base letter is
+VIETNAMESE_LETTERS = (
+    "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđ"
+)
+VOWELS = 'aeiouy'
+# Combining marks of NFD text (tone marks, breve, circumflex, horn)
+MARKS = r'[\u0300-\u036f]*'
+
+
+def fold_diacritics(text: str) -> str:
+    """
+    Lowercase and strip diacritics ('Bảo Hiểm' -> 'bao hiem').
+
+    NFD splits Vietnamese letters into an ASCII base plus combining marks;
+    encoding to ASCII then drops the marks in C (đ does not decompose and is
+    mapped first). Characters with no ASCII base are dropped as well.
+    """
+    folded = unicodedata.normalize('NFD', text.lower().replace('đ', 'd'))
+    return folded.encode('ascii', 'ignore').decode('ascii')
+
+
+class Relevance(NamedTuple):
+    """Weighted keyword score of an item."""
+    score: float
+    terms: List[str]      # Matched keywords (canonical form), in order of first match
+
+
+_ACCENTED: Dict[str, List[str]] = {}
+for _letter in VIETNAMESE_LETTERS:
+    _ACCENTED.setdefault(fold_diacritics(_letter), []).append(_letter)
+
+
+def _forms(char: str) -> List[str]:
+    """A folded character and its accented forms."""
+    return [char] + _ACCENTED.get(char, [])
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation of folded `words`, factored as a prefix trie, that
+    matches them in lowercase text with or without diacritics. Words
+    match whole: a word character before the first one is ruled out
+    right after it, so that each branch still starts with a literal.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def letter(char: str) -> str:
+        forms = _forms(char)
+        pattern = re.escape(char) if len(forms) == 1 else '[' + ''.join(forms) + ']'
+        return pattern + MARKS if char in VOWELS else pattern
+
+    def build(node: Dict[str, dict], first: bool) -> str:
+        ends_here = '' in node
+        branches = []
+        for char, child in sorted(node.items()):
+            if not char:
+                continue
+            rest = build(child, False)
+            if first:
+                marks = MARKS if char in VOWELS else ''
+                branches += [re.escape(form) + r'(?<![\w\u0300-\u036f].)' + marks + rest for form in _forms(char)]
+            else:
+                branches.append(letter(char) + rest)
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional suffix where a shorter keyword ends: the longest one wins
+        return '(?:' + body + ')?' if ends_here else body
+
+    return build(trie, True)
+
+
+class KeywordMatcher:
+    """Compiled multi-keyword matcher with diacritic folding and weights."""
+
+    def __init__(self, keywords: Dict[str, float], title_weight: float = TITLE_WEIGHT):
+        self.title_weight = title_weight
+        self.weights = dict(keywords)
+        # Folded form -> canonical keyword
+        self.keywords = {fold_diacritics(keyword): keyword for keyword in keywords}
+        self.pattern = re.compile(_trie_pattern(self.keywords) + r'(?!\w)', re.S)
+
+    def find(self, text: Optional[str]) -> List[str]:
+        """Canonical keywords matched in `text`, one entry per occurrence."""
+        if not text:
+            return []
+        return [self.keywords[fold_diacritics(match)] for match in self.pattern.findall(text.lower())]
+
+    def score(self, title: Optional[str], body: Optional[str] = None) -> Relevance:
+        """Weighted relevance of a title and body (summary or content), in one scan."""
+        title = (title or '').lower()
+        total = 0.0
+        terms: List[str] = []
+        for match in self.pattern.finditer(f"{title}\n{(body or '').lower()}"):
+            term = self.keywords[fold_diacritics(match.group())]
+            total += self.weights[term] * (self.title_weight if match.start() < len(title) else 1.0)
+            if term not in terms:
+                terms.append(term)
+        return Relevance(total, terms)
+
+
+_relevance_matcher: Optional[KeywordMatcher] = None
+
+
+def get_relevance_matcher() -> KeywordMatcher:
+    """Shared matcher for the insurance keywords."""
+    global _relevance_matcher
+    if _relevance_matcher is None:
+        _relevance_matcher = KeywordMatcher(INSURANCE_KEYWORDS)
+    return _relevance_matcher
@@ -0,0 +1,130 @@
+"""
+Adaptive renderer selection - plain HTTP first, headless browser only where needed.
+
+For every source key the page is fetched over HTTP and the source's ready
+selector is checked against the result; only when it comes back empty is
+the page rendered in Playwright. The outcome is persisted in a small JSON
+profile so later runs go straight to the cheaper path. Sources recorded as
+needing the browser are re-probed over HTTP after
+CRAWLER_RENDERER_RECHECK_HOURS in case the site changed.
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Renderer names
+HTTP = 'http'
+BROWSER = 'browser'
+
+# Loaders return a soup, or already-extracted items when paired with `is_ready`
+PageLoader = Callable[[], Awaitable[Any]]
+
+
+class RendererSelector:
+    """Per-source choice between HTTP and browser rendering, persisted as JSON."""
+
+    def __init__(self, path: Optional[str] = None, recheck_hours: Optional[float] = None):
+        self.path = path or os.path.join(settings.CRAWLER_CACHE_DIR, 'renderers.json')
+        self.recheck_seconds = (
+            settings.CRAWLER_RENDERER_RECHECK_HOURS if recheck_hours is None else recheck_hours
+        ) * 3600
+        self.profile: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable renderer profile {self.path}: {e}")
+            return {}
+
+    def renderer_for(self, key: str) -> Optional[str]:
+        """Recorded renderer for a source, or None if it should be probed over HTTP."""
+        entry = self.profile.get(key)
+        if not entry:
+            return None
+        if entry['renderer'] == BROWSER and time.time() - entry['checked_at'] > self.recheck_seconds:
+            return None
+        return entry['renderer']
+
+    def record(self, key: str, renderer: str):
+        entry = self.profile.get(key)
+        if not entry or entry['renderer'] != renderer:
+            logger.info(f"Renderer for {key}: {renderer}")
+        self.profile[key] = {'renderer': renderer, 'checked_at': time.time()}
+        self._dirty = True
+
+    async def load(
+        self,
+        key: str,
+        ready_selector: Optional[str],
+        fetch_http: PageLoader,
+        render_browser: Optional[PageLoader] = None,
+        is_ready: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Load a page with the cheapest renderer that satisfies `ready_selector`.
+
+        Args:
+            key: Source key the decision is remembered under
+            ready_selector: CSS selector that must match for the page to count
+            fetch_http: Loads the page over plain HTTP
+            render_browser: Renders the page in a browser (None = HTTP only)
+            is_ready: Replaces the selector check for loaders that return
+                extracted items instead of a soup
+
+        Returns:
+            (soup, renderer used); soup is whatever the last attempt produced,
+            which may not match the selector if neither renderer succeeded
+        """
+        if is_ready is None:
+            is_ready = lambda soup: not ready_selector or soup.select_one(ready_selector) is not None
+        soup = None
+
+        if self.renderer_for(key) != BROWSER or render_browser is None:
+            soup = await fetch_http()
+            if soup is not None and is_ready(soup):
+                self.record(key, HTTP)
+                return soup, HTTP
+            if render_browser is None:
+                return soup, HTTP
+
+        rendered = await render_browser()
+        if rendered is not None and is_ready(rendered):
+            self.record(key, BROWSER)
+            return rendered, BROWSER
+
+        # Neither renderer found the selector: keep the recorded choice
+        return rendered if rendered is not None else soup, BROWSER
+
+    def save(self):
+        """Write the profile if it changed."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.profile, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+_renderer_selector: Optional[RendererSelector] = None
+
+
+def get_renderer_selector() -> RendererSelector:
+    """Shared renderer profile."""
+    global _renderer_selector
+    if _renderer_selector is None:
+        _renderer_selector = RendererSelector()
+    return _renderer_selector
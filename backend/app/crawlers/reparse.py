@@ -0,0 +1,174 @@
+"""
+Re-parse archived pages with the current parsers - no network access.
+
+Each archived URL is classified by the crawler that fetched it (news
+listing, feed, news article, TVPL search results, TVPL document) and run
+through that crawler's parser. Pages are spread over a process pool, one
+crawler instance per worker, so a full archive re-parses on every core.
+Those crawlers are only used for their parsers: they open no HTTP cache,
+frontier or page archive. A page that can't be read or parsed is reported
+in its result and doesn't stop the run.
+"""
+
+import os
+import logging
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Any, Iterable, Iterator, Tuple, FrozenSet
+from urllib.parse import urlsplit
+
+from app.crawlers.urls import canonicalize_url, site_of
+from app.crawlers.feeds import parse_feed
+from app.crawlers.page_archive import ArchivedPage, read_body
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Page kinds
+NEWS_LISTING = 'news_listing'
+NEWS_FEED = 'news_feed'
+NEWS_ARTICLE = 'news_article'
+LEGAL_SEARCH = 'legal_search'
+LEGAL_DOCUMENT = 'legal_document'
+
+KINDS = (NEWS_LISTING, NEWS_FEED, NEWS_ARTICLE, LEGAL_SEARCH, LEGAL_DOCUMENT)
+
+
+def _news_sources() -> Dict[str, Dict[str, Any]]:
+    from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+    return NewsAggregatorAdvanced.NEWS_SOURCES
+
+
+@lru_cache(maxsize=None)
+def _source_urls() -> Dict[str, Tuple[str, FrozenSet[str], FrozenSet[str]]]:
+    """Per news source: site, canonical feed URLs, canonical listing URLs."""
+    return {
+        name: (
+            site_of(urlsplit(config['url']).hostname or ''),
+            frozenset(canonicalize_url(feed) for feed in config.get('feeds', [])),
+            frozenset(canonicalize_url(u) for u in config.get('category_urls', [config['url']])),
+        )
+        for name, config in _news_sources().items()
+    }
+
+
+def classify(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Kind of an archived page and its news source.
+
+    Returns:
+        (kind, source name); kind is None for pages no parser handles
+    """
+    site = site_of(urlsplit(url).hostname or '')
+
+    if site == site_of(urlsplit(settings.TVPL_BASE_URL).hostname or ''):
+        if url.startswith(canonicalize_url(settings.TVPL_SEARCH_URL)):
+            return LEGAL_SEARCH, None
+        return LEGAL_DOCUMENT, None
+
+    for name, (source_site, feeds, listings) in _source_urls().items():
+        if site != source_site:
+            continue
+        if url in feeds:
+            return NEWS_FEED, name
+        if url in listings:
+            return NEWS_LISTING, name
+        return NEWS_ARTICLE, name
+
+    return None, None
+
+
+# Per-process parser instances (created by `_init_worker`)
+_news_crawler = None
+_tvpl_crawler = None
+
+# Crawler stores the parsers don't need: building the crawlers with them off
+# keeps workers from opening (and evicting from) the archive being re-parsed
+PARSER_DISABLED_STORES = ('CRAWLER_CACHE_ENABLED', 'CRAWLER_FRONTIER_ENABLED', 'CRAWLER_ARCHIVE_ENABLED')
+
+
+def _init_worker():
+    global _news_crawler, _tvpl_crawler
+    from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+    from app.crawlers.tvpl_crawler_advanced import TVPLAdvancedCrawler
+
+    enabled = {name: getattr(settings, name) for name in PARSER_DISABLED_STORES}
+    for name in PARSER_DISABLED_STORES:
+        setattr(settings, name, False)
+    try:
+        _news_crawler = NewsAggregatorAdvanced(use_playwright=False)
+        _tvpl_crawler = TVPLAdvancedCrawler(use_playwright=False)
+    finally:
+        for name, value in enabled.items():
+            setattr(settings, name, value)
+
+
+def reparse_page(page: ArchivedPage) -> Optional[Dict[str, Any]]:
+    """
+    Parse one archived page with the current parsers.
+
+    Returns:
+        {'url', 'kind', 'source', 'fetched_at', 'fields', 'error'}, or None
+        if the page has no parser; `error` is set (and `fields` None) when
+        the body couldn't be read or parsed
+    """
+    if _news_crawler is None:
+        _init_worker()
+
+    kind, source = classify(page.url)
+    if kind is None:
+        return None
+
+    result = {'url': page.url, 'kind': kind, 'source': source, 'fetched_at': page.fetched_at}
+    try:
+        result['fields'], result['error'] = _parse(page, kind, source), None
+    except Exception as e:
+        logger.warning(f"Could not re-parse {page.url}: {e}")
+        result['fields'], result['error'] = None, f"{type(e).__name__}: {e}"
+    return result
+
+
+def _parse(page: ArchivedPage, kind: str, source: Optional[str]) -> Any:
+    """Fields parsed from an archived page of `kind`."""
+    body = read_body(page)
+    if kind == NEWS_FEED:
+        document = parse_feed(body)
+        fields: Any = [entry._asdict() for entry in document.entries] if document else []
+    else:
+        document = _news_crawler.parse_html(body, page.encoding)
+        if kind == NEWS_LISTING:
+            fields = _news_crawler._parse_source_articles(document, source, _news_sources()[source])
+        elif kind == NEWS_ARTICLE:
+            fields = {'content_html': _news_crawler._extract_article_content(document, source)}
+        elif kind == LEGAL_SEARCH:
+            fields = _tvpl_crawler.parse_search_results(document)
+        else:
+            fields = _tvpl_crawler._extract_document_fields(document, page.url)
+    return fields
+
+
+def reparse_pages(
+    pages: Iterable[ArchivedPage],
+    workers: Optional[int] = None,
+    chunksize: int = 16
+) -> Iterator[Dict[str, Any]]:
+    """
+    Re-parse pages across a process pool, yielding results in input order.
+
+    Args:
+        pages: Archived pages (e.g. `PageArchive.pages()`)
+        workers: Worker processes (default: one per core; 1 parses in-process)
+        chunksize: Pages handed to a worker at a time
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for page in pages:
+            result = reparse_page(page)
+            if result:
+                yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for result in executor.map(reparse_page, pages, chunksize=chunksize):
+            if result:
+                yield result
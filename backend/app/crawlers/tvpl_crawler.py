@@ -186,7 +186,7 @@ class TVPLCrawler(BaseCrawler):
             # Extract content
             content_elem = soup.select_one('.doc-content, .content, .noi-dung')
             if content_elem:
-                data['content_full'] = self.clean_html_content(str(content_elem))
+                data['content_full'] = self.sanitize_element(content_elem)
                 # Generate summary from first 500 characters
                 text = content_elem.get_text(strip=True)
                 data['content_summary'] = text[:500] + '...' if len(text) > 500 else text
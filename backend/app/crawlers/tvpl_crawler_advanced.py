@@ -5,20 +5,19 @@ Enhanced with Playwright, proxy rotation, and comprehensive field extraction.
 
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from datetime import datetime
 import re
 import random
 
-try:
-    from playwright.async_api import async_playwright, Page, Browser
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    logging.warning("Playwright not available. Install with: pip install playwright && playwright install")
-
-from bs4 import BeautifulSoup
 from app.crawlers.base_crawler import BaseCrawler
+from app.crawlers.html_backend import listing_extractor, field_extractor
+from app.crawlers.browser_pool import BrowserPool, RenderProfile, RenderStats, PLAYWRIGHT_AVAILABLE
+from app.crawlers.renderer import RendererSelector, get_renderer_selector
+from app.crawlers.politeness import PolitenessScheduler
+from app.crawlers.http_cache import HTTPCache
+from app.crawlers.page_archive import PageArchive
+from app.crawlers.frontier import FingerprintStore, LEGAL_DOCS, normalize_doc_number
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -58,12 +57,57 @@ class TVPLAdvancedCrawler(BaseCrawler):
         "Chỉ thị",        # Directive
     ]
     
-    def __init__(self, use_playwright: bool = True):
-        super().__init__()
+    FRONTIER_NAME = LEGAL_DOCS
+    
+    # Rendering: ready once result rows / document body are in the DOM
+    LISTING_RENDERER = 'tvpl:listing'
+    DETAIL_RENDERER = 'tvpl:detail'
+    LISTING_PROFILE = RenderProfile(ready_selector='.item-row, .document-item, .result-item, .itemdoc')
+    DETAIL_PROFILE = RenderProfile(ready_selector='.noi-dung, .content, .doc-content, .fullcontent', timeout=20000)
+    
+    # Search result rows and the fields read from each (first match per field)
+    RESULT_ITEMS = '.item-row, .document-item, .result-item, .itemdoc'
+    PREVIEW_FIELDS = {
+        'link': 'a.title, a.doc-title, h3 a, a.linktitle',
+        'doc_number': '.so-hieu, .doc-number, .number',
+        'abstract': '.trich-yeu, .abstract, .sapo, .summary',
+        'issue_date': '.ngay-ban-hanh, .issue-date, .date',
+        'doc_type': '.loai-van-ban, .doc-type, .type',
+    }
+    
+    # Detail page fields (first match each) and tag links (every match)
+    DOCUMENT_FIELDS = {
+        'title': 'h1, .doc-title, .title',
+        'doc_number': '.so-hieu, .doc-number',
+        'doc_type': '.loai-van-ban, .doc-type',
+        'issuing_body': '.co-quan-ban-hanh, .issuing-body',
+        'signer': '.nguoi-ky, .signer',
+        'issue_date': '.ngay-ban-hanh, .issue-date',
+        'effective_date': '.ngay-hieu-luc, .effective-date',
+        'status': '.tinh-trang, .status, .hieu-luc',
+        'abstract': '.trich-yeu, .abstract, .tomtat',
+        'content': '.noi-dung, .content, .doc-content, .fullcontent',
+        'pdf': 'a[href*=".pdf"], .download-pdf a, a.btnpdf',
+    }
+    DOCUMENT_TAGS = '.tags a, .keywords a, .tag-item'
+    
+    def __init__(
+        self,
+        use_playwright: bool = True,
+        scheduler: Optional[PolitenessScheduler] = None,
+        http_cache: Optional[HTTPCache] = None,
+        frontier: Optional[FingerprintStore] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        renderers: Optional[RendererSelector] = None,
+        archive: Optional[PageArchive] = None
+    ):
+        super().__init__(scheduler=scheduler, http_cache=http_cache, frontier=frontier, archive=archive)
         self.base_url = settings.TVPL_BASE_URL
         self.search_url = settings.TVPL_SEARCH_URL
         self.use_playwright = use_playwright and PLAYWRIGHT_AVAILABLE
-        self.browser: Optional[Browser] = None
+        self.browser_pool = browser_pool  # Shared pool from the engine, or created per crawl
+        self.render_stats = RenderStats()  # Time/bytes per rendered page, last crawl
+        self.renderers = renderers or get_renderer_selector()
         self.proxies = self._load_proxies()
     
     def _load_proxies(self) -> List[str]:
@@ -106,195 +150,273 @@ class TVPLAdvancedCrawler(BaseCrawler):
         ]
         return random.choice(user_agents)
     
-    async def _init_playwright(self):
-        """Initialize Playwright browser with anti-detection measures."""
-        if not PLAYWRIGHT_AVAILABLE:
-            raise ImportError("Playwright not available. Install with: pip install playwright && playwright install")
-        
-        playwright = await async_playwright().start()
-        
-        # Launch with anti-detection measures
-        launch_options = {
-            'headless': True,
-            'args': [
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-            ]
+    async def _load_page(self, url: str, renderer_key: str, profile: RenderProfile) -> Any:
+        """
+        Load a URL over plain HTTP, falling back to a pooled browser page
+        when the profile's ready selector is missing from the HTML (and
+        Playwright is enabled).
+        """
+        headers = {
+            'User-Agent': self._get_random_user_agent(),
+            'Accept-Language': 'vi-VN,vi;q=0.9,en-US;q=0.8,en;q=0.7',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         }
         
-        # Add proxy if available
-        proxy = self._get_random_proxy()
-        if proxy:
-            launch_options['proxy'] = {'server': proxy}
-            logger.info(f"Using proxy: {proxy}")
-        
-        self.browser = await playwright.chromium.launch(**launch_options)
-    
-    async def _close_playwright(self):
-        """Close Playwright browser."""
-        if self.browser:
-            await self.browser.close()
+        async def render_browser() -> Any:
+            rendered = await self.browser_pool.render(url, profile, headers=headers, scheduler=self.scheduler)
+            self.render_stats.record(rendered.metrics)
+            await self.archive_page_async(url, {}, rendered.html.encode('utf-8'), 'utf-8', renderer='browser')
+            return self.parse_html(rendered.html)
+        
+        document, renderer = await self.renderers.load(
+            renderer_key,
+            profile.ready_selector,
+            fetch_http=lambda: self.fetch_document_async(url, headers=headers),
+            render_browser=render_browser if self.use_playwright else None,
+            is_ready=lambda doc: self.select_first(doc, profile.ready_selector) is not None
+        )
+        self.render_stats.count_renderer(renderer)
+        return document
     
-    def crawl(self, max_pages: int = 5, queries: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def crawl(
+        self,
+        max_pages: int = 5,
+        queries: Optional[List[str]] = None,
+        stop_after_known: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Main crawl method - orchestrates the crawling process.
         
         Args:
             max_pages: Maximum pages per query
             queries: Custom search queries (default: predefined)
+            stop_after_known: Stop paging a query after this many consecutive
+                already-stored results (default: TVPL_INCREMENTAL_STOP_AFTER, 0 = off)
             
         Returns:
             List of legal document dictionaries
         """
-        if self.use_playwright:
-            return asyncio.run(self._crawl_async(max_pages, queries))
-        else:
-            return self._crawl_sync(max_pages, queries)
+        return self.run_async(self.crawl_async(max_pages, queries, stop_after_known))
     
-    async def _crawl_async(self, max_pages: int, queries: Optional[List[str]]) -> List[Dict[str, Any]]:
-        """Async crawl using Playwright for better anti-bot evasion."""
-        queries = queries or self.SEARCH_QUERIES
-        all_documents = []
-        seen_doc_numbers = set()
-        
-        await self._init_playwright()
+    async def crawl_async(
+        self,
+        max_pages: int = 5,
+        queries: Optional[List[str]] = None,
+        stop_after_known: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async crawl entry point for callers already inside an event loop.
         
-        try:
-            for query_idx, query in enumerate(queries, 1):
-                logger.info(f"[{query_idx}/{len(queries)}] Crawling TVPL for: '{query}'")
-                
-                for page_num in range(1, max_pages + 1):
-                    try:
-                        search_url = self.build_search_url(keyword=query, page=page_num)
-                        
-                        # Create new page with anti-detection
-                        browser_page = await self.browser.new_page()
-                        
-                        # Set headers
-                        await browser_page.set_extra_http_headers({
-                            'User-Agent': self._get_random_user_agent(),
-                            'Accept-Language': 'vi-VN,vi;q=0.9,en-US;q=0.8,en;q=0.7',
-                            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                        })
-                        
-                        # Navigate with timeout
-                        logger.info(f"  Page {page_num}/{max_pages}: {search_url}")
-                        await browser_page.goto(search_url, wait_until='networkidle', timeout=30000)
-                        
-                        # Random human-like delay
-                        await asyncio.sleep(random.uniform(2, 4))
-                        
-                        # Get page content
-                        content = await browser_page.content()
-                        soup = BeautifulSoup(content, 'lxml')
-                        
-                        # Parse results
-                        documents = self.parse_search_results(soup)
-                        
-                        if not documents:
-                            logger.info(f"  No documents found on page {page_num} for '{query}'")
-                            break
-                        
-                        # Filter duplicates and validate
-                        new_docs = []
-                        for doc in documents:
-                            doc_num = doc.get('doc_number')
-                            if doc_num and doc_num not in seen_doc_numbers:
-                                # Fetch full details if needed
-                                if not doc.get('content_summary'):
-                                    full_details = await self._fetch_document_details_async(doc.get('original_link'), browser_page)
-                                    if full_details:
-                                        doc.update(full_details)
-                                
-                                seen_doc_numbers.add(doc_num)
-                                new_docs.append(doc)
-                        
-                        all_documents.extend(new_docs)
-                        logger.info(f"  Found {len(new_docs)} new documents (Total: {len(all_documents)})")
-                        
-                        await browser_page.close()
-                        
-                    except Exception as e:
-                        logger.error(f"  Error on page {page_num}: {e}")
-                        continue
-                    
-                    # Delay between pages
-                    await asyncio.sleep(random.uniform(3, 6))
-                
-                # Delay between queries
-                if query_idx < len(queries):
-                    await asyncio.sleep(random.uniform(5, 10))
+        Collects `crawl_stream()` into a list.
         
-        finally:
-            await self._close_playwright()
+        Args:
+            max_pages: Maximum pages per query
+            queries: Custom search queries (default: predefined)
+            stop_after_known: Stop paging a query after this many consecutive
+                already-stored results (default: TVPL_INCREMENTAL_STOP_AFTER, 0 = off)
+            
+        Returns:
+            List of legal document dictionaries
+        """
+        return [doc async for doc in self.crawl_stream(max_pages, queries, stop_after_known)]
+    
+    async def crawl_stream(
+        self,
+        max_pages: int = 5,
+        queries: Optional[List[str]] = None,
+        stop_after_known: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield legal documents as soon as their details are fetched.
         
-        # Filter by document type priority
-        filtered_docs = self._filter_priority_documents(all_documents)
+        Queries run concurrently; the politeness scheduler spaces out the
+        requests to thuvienphapluat.vn instead of fixed sleeps. Listing and
+        detail pages are tried over plain HTTP first and rendered in the
+        browser only when their selectors are missing.
         
-        logger.info(f"✓ Crawling complete: {len(filtered_docs)}/{len(all_documents)} priority documents")
-        return filtered_docs
-    
-    async def _fetch_document_details_async(self, url: str, page: Page) -> Optional[Dict[str, Any]]:
-        """Fetch full document details using existing Playwright page."""
-        if not url:
-            return None
+        Priority document types are yielded immediately. Other documents
+        are held back and only yielded if the crawl finds no priority
+        document at all (same result as `_filter_priority_documents`).
         
-        try:
-            await page.goto(url, wait_until='networkidle', timeout=20000)
-            await asyncio.sleep(random.uniform(1, 2))
-            
-            content = await page.content()
-            soup = BeautifulSoup(content, 'lxml')
+        Args:
+            max_pages: Maximum pages per query
+            queries: Custom search queries (default: predefined)
+            stop_after_known: Stop paging a query after this many consecutive
+                already-stored results (default: TVPL_INCREMENTAL_STOP_AFTER, 0 = off)
             
-            return self._extract_document_fields(soup, url)
+        Yields:
+            Legal document dictionaries
+        """
+        if stop_after_known is None:
+            stop_after_known = settings.TVPL_INCREMENTAL_STOP_AFTER
         
-        except Exception as e:
-            logger.error(f"Error fetching details from {url}: {e}")
-            return None
-    
-    def _crawl_sync(self, max_pages: int, queries: Optional[List[str]]) -> List[Dict[str, Any]]:
-        """Synchronous crawl using requests (fallback method)."""
+        self.render_stats = RenderStats()
         queries = queries or self.SEARCH_QUERIES
-        all_documents = []
-        seen_doc_numbers = set()
+        seen_doc_numbers: set = set()
+        held_back: List[Dict[str, Any]] = []
+        total = 0
+        priority = 0
+        
+        # Standalone runs launch their own browser; the engine passes a shared pool
+        owns_pool = self.use_playwright and self.browser_pool is None
+        if owns_pool:
+            self.browser_pool = BrowserPool(proxy=self._get_random_proxy())
         
-        for query_idx, query in enumerate(queries, 1):
-            logger.info(f"[{query_idx}/{len(queries)}] Crawling TVPL for: '{query}'")
+        try:
+            async for doc in self.iter_concurrently(
+                self._crawl_query_stream(
+                    f"{query_idx}/{len(queries)}", query, max_pages, seen_doc_numbers, stop_after_known
+                )
+                for query_idx, query in enumerate(queries, 1)
+            ):
+                total += 1
+                if self._is_priority_document(doc):
+                    priority += 1
+                    held_back.clear()
+                    yield doc
+                elif not priority:
+                    held_back.append(doc)
             
-            for page_num in range(1, max_pages + 1):
-                # Update user agent for each request
-                self.session.headers['User-Agent'] = self._get_random_user_agent()
-                
+            # No priority matches: return everything
+            for doc in held_back:
+                yield doc
+        finally:
+            if owns_pool:
+                await self.browser_pool.close()
+                self.browser_pool = None
+            self.renderers.save()
+        
+        logger.info(f"✓ Crawling complete: {priority or total}/{total} priority documents")
+    
+    async def _crawl_query_stream(
+        self,
+        label: str,
+        query: str,
+        max_pages: int,
+        seen_doc_numbers: set,
+        stop_after_known: int = 0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Walk the result pages of a single search query, yielding each new document."""
+        logger.info(f"[{label}] Crawling TVPL for: '{query}'")
+        known_streak = 0
+        
+        for page_num in range(1, max_pages + 1):
+            try:
                 search_url = self.build_search_url(keyword=query, page=page_num)
-                soup = self.fetch_page(search_url)
                 
-                if not soup:
-                    logger.warning(f"  Failed to fetch page {page_num}")
+                logger.info(f"  Page {page_num}/{max_pages}: {search_url}")
+                soup = await self._load_page(search_url, self.LISTING_RENDERER, self.LISTING_PROFILE)
+                if soup is None:
+                    logger.warning(f"  Failed to load page {page_num} for '{query}'")
                     continue
                 
+                # Parse results
                 documents = self.parse_search_results(soup)
                 
                 if not documents:
-                    logger.info(f"  No documents found on page {page_num}")
+                    logger.info(f"  No documents found on page {page_num} for '{query}'")
                     break
                 
-                # Filter duplicates
-                new_docs = []
-                for doc in documents:
-                    doc_num = doc.get('doc_number')
-                    if doc_num and doc_num not in seen_doc_numbers:
-                        seen_doc_numbers.add(doc_num)
-                        new_docs.append(doc)
+                # Filter duplicates and documents stored by earlier runs
+                new_docs, known_streak = self._select_new_documents(documents, seen_doc_numbers, known_streak)
+                logger.info(f"  Found {len(new_docs)} new documents for '{query}' (page {page_num})")
+                
+                # Documents with a summary are ready; the rest wait for their
+                # detail page, fetched concurrently and yielded as each arrives
+                pending = []
+                for doc in new_docs:
+                    if doc.get('content_summary') or not doc.get('original_link'):
+                        yield doc
+                    else:
+                        pending.append(self._with_details(doc))
                 
-                all_documents.extend(new_docs)
-                logger.info(f"  Found {len(new_docs)} new documents (Total: {len(all_documents)})")
+                for detailed in asyncio.as_completed(pending):
+                    yield await detailed
+                
+                if self._reached_known_results(query, known_streak, stop_after_known):
+                    break
+                
+            except Exception as e:
+                logger.error(f"  Error on page {page_num}: {e}")
+                continue
+    
+    async def _with_details(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the fields of a document's detail page into it."""
+        full_details = await self._fetch_document_details_async(doc['original_link'])
+        if full_details:
+            # Fields missing on the detail page keep their search-result value
+            doc.update({key: value for key, value in full_details.items() if value})
+        return doc
+    
+    async def _fetch_document_details_async(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch full document details (plain HTTP, or a pooled browser page if needed)."""
+        if not url:
+            return None
+        
+        try:
+            soup = await self._load_page(url, self.DETAIL_RENDERER, self.DETAIL_PROFILE)
+            if soup is None:
+                return None
+            return self._extract_document_fields(soup, url)
         
-        filtered_docs = self._filter_priority_documents(all_documents)
-        logger.info(f"✓ Crawling complete: {len(filtered_docs)}/{len(all_documents)} priority documents")
-        return filtered_docs
+        except Exception as e:
+            logger.error(f"Error fetching details from {url}: {e}")
+            return None
+    
+    def frontier_key(self, key: str) -> str:
+        """Frontier keys are normalized document numbers."""
+        return normalize_doc_number(key)
+    
+    def _select_new_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        seen_doc_numbers: set,
+        known_streak: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Drop documents seen earlier in this run or already stored by a
+        previous run, before any detail page is fetched.
+        
+        `seen_doc_numbers` is shared by concurrently running queries.
+        Results are newest first, so the length of the current run of
+        already-stored documents is tracked for incremental early stop.
+        Documents another query claimed in this run are not stored yet,
+        and non-priority types (Thông báo, Văn bản hợp nhất...) usually
+        never are: both leave the streak unchanged.
+        
+        Returns:
+            (new documents, updated count of consecutive stored documents)
+        """
+        new_docs = []
+        known = 0
+        
+        for doc in documents:
+            doc_num = doc.get('doc_number')
+            if not doc_num:
+                continue
+            if doc_num in seen_doc_numbers:
+                continue
+            seen_doc_numbers.add(doc_num)
+            
+            if self.is_known(doc_num):
+                known += 1
+                known_streak += 1
+                continue
+            
+            if self._is_priority_document(doc):
+                known_streak = 0
+            new_docs.append(doc)
+        
+        if known:
+            logger.info(f"  Skipped {known} documents already stored")
+        return new_docs, known_streak
+    
+    def _reached_known_results(self, query: str, known_streak: int, stop_after_known: int) -> bool:
+        """Incremental mode: stop paging once we are into already-stored results."""
+        if stop_after_known and known_streak >= stop_after_known:
+            logger.info(f"  '{query}': {known_streak} consecutive documents already stored, stopping early")
+            return True
+        return False
     
     def build_search_url(self, keyword: str, page: int = 1, doc_type: Optional[str] = None) -> str:
         """Build TVPL search URL with parameters."""
@@ -312,16 +434,30 @@ class TVPLAdvancedCrawler(BaseCrawler):
         query_string = urllib.parse.urlencode(params, encoding='utf-8')
         return f"{self.search_url}?{query_string}"
     
-    def parse_search_results(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def parse_search_results(self, soup: Any) -> List[Dict[str, Any]]:
         """
         Parse search results page.
         
         Extraction: Số hiệu văn bản, Ngày ban hành, Trích yếu, Link toàn văn
+        
+        `soup` is a BeautifulSoup tree or a `parse_html` document; the
+        latter reads each result row in one pass.
         """
         documents = []
         
+        backend = self.document_backend(soup)
+        if backend:
+            extractor = listing_extractor(self.RESULT_ITEMS, tuple(self.PREVIEW_FIELDS.items()))
+            for fields in extractor.extract(soup, backend):
+                link_elem = fields.pop('link', None)
+                if link_elem is None:
+                    continue
+                texts = {name: backend.text(elem) for name, elem in fields.items()}
+                documents.append(self._preview_record(backend.text(link_elem), backend.attr(link_elem, 'href') or '', texts))
+            return documents
+        
         # TVPL selectors (adjust based on actual site structure)
-        result_items = soup.select('.item-row, .document-item, .result-item, .itemdoc')
+        result_items = soup.select(self.RESULT_ITEMS)
         
         for item in result_items:
             try:
@@ -337,92 +473,98 @@ class TVPLAdvancedCrawler(BaseCrawler):
     def _extract_preview_data(self, item) -> Optional[Dict[str, Any]]:
         """Extract data from search result item."""
         # Extract link
-        link_elem = item.select_one('a.title, a.doc-title, h3 a, a.linktitle')
+        link_elem = item.select_one(self.PREVIEW_FIELDS['link'])
         if not link_elem:
             return None
         
-        doc_url = link_elem.get('href', '')
-        if doc_url and not doc_url.startswith('http'):
-            doc_url = f"{self.base_url}{doc_url}"
-        
-        # Extract fields
-        title = link_elem.get_text(strip=True)
-        doc_number = self.extract_text(item, '.so-hieu, .doc-number, .number')
-        abstract = self.extract_text(item, '.trich-yeu, .abstract, .sapo, .summary')
-        
-        # Extract date
-        date_str = self.extract_text(item, '.ngay-ban-hanh, .issue-date, .date')
-        issue_date = self.parse_vietnamese_date(date_str)
-        
-        # Extract doc type
-        doc_type = self.extract_text(item, '.loai-van-ban, .doc-type, .type')
+        texts = {
+            name: self.extract_text(item, selector)
+            for name, selector in self.PREVIEW_FIELDS.items()
+            if name != 'link'
+        }
+        return self._preview_record(link_elem.get_text(strip=True), link_elem.get('href', ''), texts)
+    
+    def _preview_record(self, title: str, href: str, texts: Dict[str, str]) -> Dict[str, Any]:
+        """Search-result document from its link and field texts."""
+        doc_url = self.canonical_url(href, base=self.base_url) if href else href
         
         return {
-            'doc_number': doc_number or self._extract_doc_number_from_text(title),
+            'doc_number': texts.get('doc_number') or self._extract_doc_number_from_text(title),
             'title': title,
-            'abstract': abstract,
-            'doc_type': doc_type,
-            'issue_date': issue_date,
+            'abstract': texts.get('abstract', ''),
+            'doc_type': texts.get('doc_type', ''),
+            'issue_date': self.parse_vietnamese_date(texts.get('issue_date', '')),
             'original_link': doc_url,
             'crawled_at': datetime.now()
         }
     
-    def _extract_document_fields(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    def _extract_document_fields(self, soup: Any, url: str) -> Dict[str, Any]:
         """
         Extract all fields from document detail page.
         
         Fields: Số hiệu, Ngày ban hành, Trích yếu, Status (Hiệu lực), Content
+        
+        A `parse_html` document is read in a single pass for all fields;
+        the content element is cleaned in place either way.
         """
+        backend = self.document_backend(soup)
+        if backend:
+            extractor = field_extractor(tuple(self.DOCUMENT_FIELDS.items()), (('tags', self.DOCUMENT_TAGS),))
+            found = extractor.extract(soup, backend)
+            content_elem = found.pop('content', None)
+            pdf_elem = found.pop('pdf', None)
+            tag_elems = found.pop('tags')
+            texts = {name: backend.text(elem) for name, elem in found.items()}
+            pdf_href = backend.attr(pdf_elem, 'href') or '' if pdf_elem is not None else None
+            tags = [backend.text(tag) for tag in tag_elems]
+            text_of = backend.text
+        else:
+            texts = {
+                name: self.extract_text(soup, selector)
+                for name, selector in self.DOCUMENT_FIELDS.items()
+                if name not in ('content', 'pdf')
+            }
+            content_elem = soup.select_one(self.DOCUMENT_FIELDS['content'])
+            pdf_link = soup.select_one(self.DOCUMENT_FIELDS['pdf'])
+            pdf_href = pdf_link.get('href', '') if pdf_link else None
+            tags = [tag.get_text(strip=True) for tag in soup.select(self.DOCUMENT_TAGS)]
+            text_of = lambda elem: elem.get_text(strip=True)
+        
         data = {
             'original_link': url,
-            'title': self.extract_text(soup, 'h1, .doc-title, .title'),
-            'doc_number': self.extract_text(soup, '.so-hieu, .doc-number'),
-            'doc_type': self.extract_text(soup, '.loai-van-ban, .doc-type'),
-            'issuing_body': self.extract_text(soup, '.co-quan-ban-hanh, .issuing-body'),
-            'signer': self.extract_text(soup, '.nguoi-ky, .signer'),
+            'title': texts.get('title', ''),
+            'doc_number': texts.get('doc_number', ''),
+            'doc_type': texts.get('doc_type', ''),
+            'issuing_body': texts.get('issuing_body', ''),
+            'signer': texts.get('signer', ''),
         }
         
         # Dates
-        issue_date_str = self.extract_text(soup, '.ngay-ban-hanh, .issue-date')
-        effective_date_str = self.extract_text(soup, '.ngay-hieu-luc, .effective-date')
-        
-        data['issue_date'] = self.parse_vietnamese_date(issue_date_str)
-        data['effective_date'] = self.parse_vietnamese_date(effective_date_str)
+        data['issue_date'] = self.parse_vietnamese_date(texts.get('issue_date', ''))
+        data['effective_date'] = self.parse_vietnamese_date(texts.get('effective_date', ''))
         
         # Status (Còn hiệu lực / Hết hiệu lực)
-        status_text = self.extract_text(soup, '.tinh-trang, .status, .hieu-luc')
-        data['status'] = self._parse_status(status_text)
+        data['status'] = self._parse_status(texts.get('status', ''))
         
         # Abstract/Summary
-        abstract = self.extract_text(soup, '.trich-yeu, .abstract, .tomtat')
+        abstract = texts.get('abstract', '')
         data['abstract'] = abstract
         
         # Full content
-        content_elem = soup.select_one('.noi-dung, .content, .doc-content, .fullcontent')
-        if content_elem:
-            data['content_full'] = self.clean_html_content(str(content_elem))
+        if content_elem is not None:
+            data['content_full'] = self.sanitize_element(content_elem)
             
             # Generate summary if abstract is empty
             if not abstract:
-                text = content_elem.get_text(strip=True)
+                text = text_of(content_elem)
                 data['abstract'] = text[:500] + '...' if len(text) > 500 else text
         
         # PDF link
-        pdf_link = soup.select_one('a[href*=".pdf"], .download-pdf a, a.btnpdf')
-        if pdf_link:
-            pdf_url = pdf_link.get('href', '')
-            if pdf_url and not pdf_url.startswith('http'):
-                pdf_url = f"{self.base_url}{pdf_url}"
-            data['pdf_url'] = pdf_url
+        if pdf_href is not None:
+            data['pdf_url'] = self.canonical_url(pdf_href, base=self.base_url) if pdf_href else pdf_href
         
         # Tags
-        tags = []
-        tag_elems = soup.select('.tags a, .keywords a, .tag-item')
-        for tag in tag_elems:
-            tag_text = tag.get_text(strip=True)
-            if tag_text:
-                tags.append(tag_text)
-        data['tags'] = tags
+        data['tags'] = [tag for tag in tags if tag]
         
         return data
     
@@ -456,19 +598,19 @@ class TVPLAdvancedCrawler(BaseCrawler):
         match = re.search(pattern, text)
         return match.group(0) if match else ''
     
+    def _is_priority_document(self, doc: Dict[str, Any]) -> bool:
+        """Priority types (Nghị định, Thông tư, Công văn...) or currently active documents."""
+        doc_type = doc.get('doc_type') or ''
+        
+        # Check if it's a priority document type
+        if any(priority_type in doc_type for priority_type in self.PRIORITY_DOC_TYPES):
+            return True
+        # Also include if status is Active
+        return doc.get('status') == 'Active'
+    
     def _filter_priority_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter documents by priority types (Nghị định, Thông tư, Công văn)."""
-        filtered = []
-        
-        for doc in documents:
-            doc_type = doc.get('doc_type', '')
-            
-            # Check if it's a priority document type
-            if any(priority_type in doc_type for priority_type in self.PRIORITY_DOC_TYPES):
-                filtered.append(doc)
-            # Also include if status is Active
-            elif doc.get('status') == 'Active':
-                filtered.append(doc)
+        filtered = [doc for doc in documents if self._is_priority_document(doc)]
         
         return filtered if filtered else documents  # Return all if no priority matches
 
@@ -0,0 +1,121 @@
+"""
+URL canonicalization - one spelling per page for dedup, caching and storage.
+
+Listing pages link the same article in several forms: relative paths,
+`m.` mobile hosts, tracking parameters (utm_*, fbclid, vnexpress' vn_*),
+fragments and trailing-slash variants. Every crawler passes URLs through
+`canonicalize_url` before frontier checks and HTTP-cache lookups, and the
+processor stores only the canonical form in `Article.source_url`.
+
+Generic rules: resolve against the page URL, lowercase scheme and host,
+drop default ports, fragments and tracking parameters, sort the remaining
+query and strip the trailing slash. Per-source `URLRules` (keyed by site,
+i.e. host without `www.`/`m.`) pick the preferred host, which query
+parameters select content and the site's own tracking parameters.
+Canonicalizing a canonical URL returns it unchanged.
+"""
+
+from typing import Optional, Dict, FrozenSet, Mapping, NamedTuple, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only identify the referrer / campaign
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'gclsrc', 'dclid', 'msclkid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', 'zarsrc', 'zacc',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+MOBILE_PREFIXES = ('m.', 'mobile.')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class URLRules(NamedTuple):
+    """Canonicalization rules for one source site."""
+    host: Optional[str] = None                  # Preferred host for every variant of the site
+    https: bool = True                          # Site serves everything over HTTPS
+    keep_query: Optional[FrozenSet[str]] = None  # Params that select content (None: all non-tracking)
+    trailing_slash: bool = False                # Site serves paths with a trailing slash
+    tracking_prefixes: Tuple[str, ...] = ()     # Site-specific tracking params, on top of TRACKING_PREFIXES
+
+
+# Per-source rules, keyed by site (see `site_of`)
+URL_RULES: Dict[str, URLRules] = {
+    'cafef.vn': URLRules(host='cafef.vn', keep_query=frozenset()),
+    'vnexpress.net': URLRules(host='vnexpress.net', keep_query=frozenset(), tracking_prefixes=('vn_',)),
+    'baoviet.com.vn': URLRules(host='www.baoviet.com.vn'),
+    'manulife.com.vn': URLRules(host='www.manulife.com.vn', keep_query=frozenset()),
+    'prudential.com.vn': URLRules(host='www.prudential.com.vn', trailing_slash=True),
+    'thuvienphapluat.vn': URLRules(host='thuvienphapluat.vn'),
+}
+
+
+def site_of(host: str) -> str:
+    """Site key of a host: 'm.vnexpress.net' -> 'vnexpress.net'."""
+    host = host.lower().rstrip('.')
+    for prefix in ('www.',) + MOBILE_PREFIXES:
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+
+def _is_tracking(param: str, site_prefixes: Tuple[str, ...] = ()) -> bool:
+    param = param.lower()
+    return param in TRACKING_PARAMS or param.startswith(TRACKING_PREFIXES + site_prefixes)
+
+
+def canonicalize_url(
+    url: str,
+    base: Optional[str] = None,
+    rules: Optional[Mapping[str, URLRules]] = None
+) -> str:
+    """
+    Canonical form of a (possibly relative) URL.
+
+    Args:
+        url: URL or link as found in the page
+        base: URL of the page the link was found on
+        rules: Per-site rules (default: URL_RULES)
+
+    Returns:
+        Canonical absolute URL; non-HTTP links are returned stripped
+    """
+    url = (url or '').strip()
+    if base:
+        url = urljoin(base, url)
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.rstrip('.')
+    site_rules = (URL_RULES if rules is None else rules).get(site_of(host))
+
+    if site_rules:
+        host = site_rules.host or host
+        if site_rules.https:
+            scheme = 'https'
+    elif host.startswith(MOBILE_PREFIXES):
+        host = site_of(host)
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+
+    path = parts.path or '/'
+    if path != '/' and not (site_rules and site_rules.trailing_slash):
+        path = path.rstrip('/') or '/'
+    elif site_rules and site_rules.trailing_slash and not path.endswith('/') and '.' not in path.rsplit('/', 1)[-1]:
+        path += '/'
+
+    keep = site_rules.keep_query if site_rules else None
+    site_prefixes = site_rules.tracking_prefixes if site_rules else ()
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking(key, site_prefixes) and (keep is None or key in keep)
+    )
+
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
@@ -3,6 +3,7 @@ Article model - news articles crawled and processed by AI.
 """
 
 from beanie import Document
+from pymongo import ASCENDING, IndexModel
 from pydantic import Field
 from datetime import datetime
 from typing import Optional, List
@@ -19,9 +20,10 @@ class Article(Document):
     content_html: str = Field(...)
     
     # Source information
-    source_url: Optional[str] = None
+    source_url: Optional[str] = Field(default=None, description="Canonical URL of the original article")
     source_name: Optional[str] = None
     original_author: Optional[str] = None
+    duplicate_urls: List[str] = Field(default_factory=list, description="Other URLs publishing the same story")
     
     # Author type and disclaimer
     author_type: str = Field(default='Bot', description="'Bot' or 'Human'")
@@ -31,6 +33,10 @@ class Article(Document):
     category_id: Optional[ObjectId] = None
     tags: List[str] = Field(default_factory=list)
     
+    # Keyword relevance (set by the crawler, used for ranking)
+    relevance_score: float = Field(default=0.0)
+    matched_keywords: List[str] = Field(default_factory=list)
+    
     # Related entities
     related_companies: List[ObjectId] = Field(default_factory=list)
     related_legal_docs: List[ObjectId] = Field(default_factory=list)
@@ -62,11 +68,20 @@ class Article(Document):
         name = "articles"
         indexes = [
             "slug",
+            # One article per canonical URL (human-written articles have none)
+            IndexModel(
+                [("source_url", ASCENDING)],
+                name="source_url_unique",
+                unique=True,
+                partialFilterExpression={"source_url": {"$type": "string"}},
+            ),
+            "duplicate_urls",
             "status",
             "published_at",
             "is_featured",
             "is_trending",
             "created_at",
+            "relevance_score",
         ]
     
     class Config:
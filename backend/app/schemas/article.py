@@ -40,6 +40,7 @@ class ArticleResponse(ArticleBase):
     share_count: int
     is_featured: bool
     is_trending: bool
+    relevance_score: float = 0.0
     published_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
@@ -1,244 +1,626 @@
 """
 Content Processor - Async version for MongoDB with Beanie ODM.
 Processes crawled content through AI pipeline.
+
+Items run through a CrawlPipeline of LLM_MAX_CONCURRENCY workers (the
+engine adds the same process stages to its crawl pipelines), and LLM calls
+use the providers' async clients, so a batch of articles takes about as
+long as a few LLM round-trips instead of one per article.
+
+In batch mode (LLM_BATCH_MODE) items are stored unprocessed and
+`process_pending_batches` rewrites / summarizes them later through the
+providers' batch APIs - slower to finish, cheaper per item.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable
+from datetime import datetime, date
 
 from app.services.llm_service import LLMService, LLMProvider
+from app.services.pipeline import CrawlPipeline
 from app.models.article import Article
 from app.models.legal_doc import LegalDocument
 from app.models.crawl_log import CrawlLog
 from app.core.config import settings
+from app.crawlers.frontier import get_fingerprint_store, normalize_doc_number, LEGAL_DOCS, NEWS_URLS
+from app.crawlers.near_duplicates import get_near_duplicate_index, article_signature
+from app.crawlers.urls import canonicalize_url
+from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
 from slugify import slugify
 
 logger = logging.getLogger(__name__)
 
+# Shorter article bodies are stored as crawled, not rewritten
+MIN_REWRITE_LENGTH = 100
+
+
+async def _iterate(items: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+    """Adapt a list to a pipeline source."""
+    for item in items:
+        yield item
+
 
 class ContentProcessorAsync:
     """Async content processor for MongoDB."""
     
-    def __init__(self, llm_provider: LLMProvider = LLMProvider.OPENAI):
-        """Initialize content processor with LLM service."""
+    def __init__(
+        self,
+        llm_provider: LLMProvider = LLMProvider.OPENAI,
+        workers: Optional[int] = None,
+        batch_mode: Optional[bool] = None
+    ):
+        """
+        Initialize content processor with LLM service.
+        
+        Args:
+            llm_provider: LLM provider to use
+            workers: Items processed concurrently by the `*_from_data` methods
+                (default: LLM_MAX_CONCURRENCY)
+            batch_mode: Leave AI processing to `process_pending_batches`
+                (default: LLM_BATCH_MODE)
+        """
         self.llm_service = LLMService(provider=llm_provider)
+        self.workers = workers or settings.LLM_MAX_CONCURRENCY
+        self.batch_mode = settings.LLM_BATCH_MODE if batch_mode is None else batch_mode
+        
+        # Crawl frontiers: items recorded here are skipped by the crawlers next run
+        self.legal_frontier = get_fingerprint_store(LEGAL_DOCS)
+        self.news_frontier = get_fingerprint_store(NEWS_URLS)
+        
+        # Near-duplicate index: re-published stories are linked, not rewritten again
+        self.near_duplicates = get_near_duplicate_index()
+        # Canonical articles still being rewritten -> duplicate URLs to link once stored
+        self._pending_links: Dict[PydanticObjectId, List[str]] = {}
+        # LLM cache and usage counters when each open crawl log started (reported as the run's delta)
+        self._llm_cache_marks: Dict[Any, Dict[str, int]] = {}
+        self._llm_usage_marks: Dict[Any, Dict[str, float]] = {}
     
-    async def process_legal_documents_from_data(self, documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def process_legal_documents_from_data(
+        self,
+        documents: List[Dict[str, Any]],
+        crawl_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Process pre-crawled legal documents data.
         
         Args:
             documents: List of document dictionaries
+            crawl_metadata: Crawl statistics stored on the crawl log
             
         Returns:
             Processing results
         """
-        # Create crawl log
-        crawl_log = CrawlLog(
+        return await self._process_items(
+            documents,
+            module="legal",
             source="TVPL_Advanced",
             crawl_type="legal_docs",
-            status="started",
-            items_found=len(documents)
+            process_item=self.process_legal_document,
+            crawl_metadata=crawl_metadata
         )
-        await crawl_log.insert()  # type: ignore
-        
-        processed_count = 0
-        
-        try:
-            for doc_data in documents:
-                try:
-                    doc_number = doc_data.get('doc_number')
-                    if not doc_number:
-                        continue
-                    
-                    # Check if document already exists
-                    existing_doc = await LegalDocument.find_one(
-                        LegalDocument.doc_number == doc_number
-                    )
-                    
-                    if existing_doc:
-                        logger.info(f"Document {doc_number} already exists, skipping...")
-                        continue
-                    
-                    # Process with AI if enabled
-                    content_summary = doc_data.get('content_summary') or doc_data.get('abstract')
-                    if settings.AI_REWRITE_ENABLED and doc_data.get('content_full') and not content_summary:
-                        summary_data = self.llm_service.summarize_legal_doc(
-                            doc_title=doc_data.get('title', ''),
-                            doc_content=doc_data.get('content_full', ''),
-                            doc_number=doc_number
-                        )
-                        content_summary = summary_data.get('executive_summary', '')
-                    
-                    # Create legal document
-                    issue_date = doc_data.get('issue_date')
-                    if not issue_date:
-                        # Use today's date if missing
-                        from datetime import date
-                        issue_date = date.today()
-                    
-                    legal_doc = LegalDocument(
-                        doc_number=doc_number,
-                        doc_type=doc_data.get('doc_type', 'Unknown'),
-                        title=doc_data.get('title', ''),
-                        issue_date=issue_date,
-                        effective_date=doc_data.get('effective_date'),
-                        signer=doc_data.get('signer'),
-                        issuing_body=doc_data.get('issuing_body'),
-                        content_summary=content_summary,
-                        content_full=doc_data.get('content_full'),
-                        original_link=doc_data.get('original_link', ''),
-                        pdf_url=doc_data.get('pdf_url'),
-                        tags=doc_data.get('tags', [])
-                    )
-                    
-                    await legal_doc.insert()  # type: ignore
-                    processed_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error processing document: {e}")
-                    continue
-            
-            # Update crawl log
-            crawl_log.items_processed = processed_count
-            crawl_log.status = "completed"
-            crawl_log.completed_at = datetime.utcnow()
-            await crawl_log.save()  # type: ignore
-            
-            logger.info(f"Successfully processed {processed_count}/{len(documents)} legal documents")
-            
-            return {
-                "status": "success",
-                "items_found": len(documents),
-                "items_processed": processed_count
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in legal document processing: {e}")
-            crawl_log.status = "failed"
-            crawl_log.error_message = str(e)
-            crawl_log.completed_at = datetime.utcnow()
-            await crawl_log.save()  # type: ignore
-            
-            return {
-                "status": "error",
-                "error": str(e)
-            }
     
-    async def process_news_articles_from_data(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def process_news_articles_from_data(
+        self,
+        articles: List[Dict[str, Any]],
+        crawl_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Process pre-crawled news articles data.
         
         Args:
             articles: List of article dictionaries
+            crawl_metadata: Crawl statistics stored on the crawl log
             
         Returns:
             Processing results
         """
-        # Create crawl log
-        crawl_log = CrawlLog(
+        return await self._process_items(
+            articles,
+            module="news",
             source="NewsAggregator_Advanced",
             crawl_type="news_articles",
-            status="started",
-            items_found=len(articles)
+            process_item=self.process_news_article,
+            crawl_metadata=crawl_metadata
         )
-        await crawl_log.insert()  # type: ignore
+    
+    async def _process_items(
+        self,
+        items: List[Dict[str, Any]],
+        module: str,
+        source: str,
+        crawl_type: str,
+        process_item: Callable[[Dict[str, Any]], Awaitable[bool]],
+        crawl_metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run items through a `<module>.crawl -> <module>.process` CrawlPipeline
+        of `self.workers` workers, recording the crawl log like the engine's
+        modules (per-stage stats under 'pipeline').
+        """
+        crawl_log = await self.open_crawl_log(source, crawl_type)
         
-        processed_count = 0
+        pipeline = CrawlPipeline(max_concurrency=self.workers)
+        found = pipeline.add_source(f"{module}.crawl", _iterate(items))
+        pipeline.add_stage(f"{module}.process", found, process_item, workers=self.workers)
         
         try:
-            for article_data in articles:
-                try:
-                    source_url = article_data.get('source_url')
-                    if not source_url:
-                        continue
-                    
-                    # Check if article already exists
-                    existing_article = await Article.find_one(
-                        Article.source_url == source_url
-                    )
-                    
-                    if existing_article:
-                        logger.info(f"Article from {source_url} already exists, skipping...")
-                        continue
-                    
-                    # Get content
-                    title = article_data.get('title', '')
-                    content_html = article_data.get('content_html', '')
-                    summary = article_data.get('summary', title[:200] if title else '')
-                    
-                    # Process with AI if enabled and content is available
-                    if settings.AI_REWRITE_ENABLED and content_html and len(content_html) > 100:
-                        try:
-                            rewritten_data = self.llm_service.rewrite_article(
-                                original_text=content_html,
-                                title=title,
-                                source=article_data.get('source_name', '')
-                            )
-                            
-                            title = rewritten_data.get('title', title)
-                            content_html = rewritten_data.get('content_html', content_html)
-                            summary = rewritten_data.get('summary', summary)
-                            
-                            # Generate SEO metadata
-                            seo_data = self.llm_service.generate_seo_metadata(title, content_html)
-                            meta_title = seo_data.get('meta_title', title)
-                            meta_description = seo_data.get('meta_description', summary)
-                        except Exception as e:
-                            logger.warning(f"AI processing failed, using original: {e}")
-                            meta_title = title
-                            meta_description = summary
-                    else:
-                        meta_title = title
-                        meta_description = summary
-                    
-                    # Create article
-                    article = Article(
-                        title=title,
-                        slug=slugify(title) if title else f"article-{datetime.utcnow().timestamp()}",
-                        summary=summary,
-                        content_html=content_html or f"<p>{summary}</p>",
-                        source_url=source_url,
-                        source_name=article_data.get('source_name'),
-                        author_type='Bot',
-                        disclaimer_level='Medium',
-                        meta_title=meta_title,
-                        meta_description=meta_description,
-                        featured_image_url=article_data.get('featured_image_url'),
-                        status='published' if settings.AUTO_PUBLISH_ENABLED else 'draft',
-                        published_at=datetime.utcnow() if settings.AUTO_PUBLISH_ENABLED else None
-                    )
-                    
-                    await article.insert()  # type: ignore
-                    processed_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error processing article: {e}")
-                    continue
-            
-            # Update crawl log
-            crawl_log.items_processed = processed_count
-            crawl_log.status = "completed"
-            crawl_log.completed_at = datetime.utcnow()
-            await crawl_log.save()  # type: ignore
-            
-            logger.info(f"Successfully processed {processed_count}/{len(articles)} articles")
-            
-            return {
-                "status": "success",
-                "items_found": len(articles),
-                "items_processed": processed_count
-            }
-            
+            report = await pipeline.run()
         except Exception as e:
-            logger.error(f"Error in news article processing: {e}")
-            crawl_log.status = "failed"
-            crawl_log.error_message = str(e)
-            crawl_log.completed_at = datetime.utcnow()
-            await crawl_log.save()  # type: ignore
+            logger.error(f"Error in {crawl_type} processing: {e}")
+            await self.close_crawl_log(
+                crawl_log,
+                items_found=pipeline.stats(f"{module}.crawl").items_out,
+                items_processed=pipeline.stats(f"{module}.process").items_out,
+                error=str(e)
+            )
             
             return {
                 "status": "error",
                 "error": str(e)
             }
+        
+        found_count = report[f"{module}.crawl"]['items_out']
+        processed_count = report[f"{module}.process"]['items_out']
+        await self.close_crawl_log(
+            crawl_log,
+            items_found=found_count,
+            items_processed=processed_count,
+            metadata={**(crawl_metadata or {}), 'pipeline': report}
+        )
+        
+        logger.info(f"Successfully processed {processed_count}/{found_count} {crawl_type}")
+        
+        return {
+            "status": "success",
+            "items_found": found_count,
+            "items_processed": processed_count
+        }
+    
+    async def open_crawl_log(self, source: str, crawl_type: str) -> CrawlLog:
+        """Insert a 'started' crawl log for a run."""
+        crawl_log = CrawlLog(
+            source=source,
+            crawl_type=crawl_type,
+            status="started"
+        )
+        await crawl_log.insert()  # type: ignore
+        if self.llm_service.cache:
+            self._llm_cache_marks[crawl_log.id] = self.llm_service.cache.counters()
+        self._llm_usage_marks[crawl_log.id] = dict(self.llm_service.usage)
+        return crawl_log
+    
+    async def last_successful_crawl(self, source: str, crawl_type: str) -> Optional[datetime]:
+        """Start time of the latest completed crawl of a source (None if there was none)."""
+        crawl_log = await CrawlLog.find(
+            CrawlLog.source == source,
+            CrawlLog.crawl_type == crawl_type,
+            CrawlLog.status == "completed"
+        ).sort(-CrawlLog.started_at).first_or_none()
+        return crawl_log.started_at if crawl_log else None
+    
+    async def close_crawl_log(
+        self,
+        crawl_log: CrawlLog,
+        items_found: int,
+        items_processed: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        """
+        Finish a crawl log (completed, or failed when `error` is set).
+        
+        Also flushes the crawl frontier of the log's crawl type so the
+        items stored in this run are skipped by the next one, and records
+        the LLM cache hits, misses and tokens saved since the log was
+        opened, as well as the LLM requests, tokens and seconds spent and
+        the SEO requests that rewrites with built-in SEO metadata saved
+        (runs of both modules at once share these counters).
+        """
+        frontier = self.legal_frontier if crawl_log.crawl_type == "legal_docs" else self.news_frontier
+        if frontier:
+            frontier.flush()
+        if self.near_duplicates and crawl_log.crawl_type != "legal_docs":
+            self.near_duplicates.flush()
+        
+        crawl_log.items_found = items_found
+        crawl_log.items_processed = items_processed
+        if metadata:
+            crawl_log.metadata.update(metadata)
+        mark = self._llm_cache_marks.pop(crawl_log.id, None)
+        if mark is not None:
+            counters = self.llm_service.cache.counters()
+            crawl_log.metadata['llm_cache'] = {name: counters[name] - mark[name] for name in counters}
+        mark = self._llm_usage_marks.pop(crawl_log.id, None)
+        if mark is not None:
+            crawl_log.metadata['llm_usage'] = self._usage_since(mark)
+        crawl_log.status = "failed" if error else "completed"
+        crawl_log.error_message = error
+        crawl_log.completed_at = datetime.utcnow()
+        await crawl_log.save()  # type: ignore
+    
+    def _usage_since(self, mark: Dict[str, float]) -> Dict[str, float]:
+        """LLM usage since `mark`, with the time saved by skipped SEO requests (at the run's seconds per token)."""
+        usage = {name: value - mark[name] for name, value in self.llm_service.usage.items()}
+        seconds_per_token = usage['seconds'] / usage['tokens'] if usage['tokens'] else 0.0
+        usage['seconds'] = round(usage['seconds'], 2)
+        usage['seo_seconds_saved'] = round(usage['seo_tokens_saved'] * seconds_per_token, 2)
+        if usage['seo_calls_saved']:
+            logger.info(
+                f"LLM: {usage['calls']} requests, {usage['tokens']} tokens, {usage['seconds']}s; "
+                f"SEO metadata from the rewrites saved {usage['seo_calls_saved']} requests, "
+                f"~{usage['seo_tokens_saved']} tokens, ~{usage['seo_seconds_saved']}s"
+            )
+        return usage
+    
+    async def is_article_stored(self, source_url: str) -> bool:
+        """Whether an article from this URL (or linked as a duplicate) is already in MongoDB."""
+        source_url = canonicalize_url(source_url)
+        if await self._find_article_by_url(source_url):
+            self._remember_news_url(source_url)
+            return True
+        return False
+    
+    async def process_legal_document(self, doc_data: Dict[str, Any]) -> bool:
+        """Summarize and store one legal document. Returns True if it was inserted."""
+        doc_number = doc_data.get('doc_number')
+        if not doc_number:
+            return False
+        
+        # Check if document already exists
+        existing_doc = await LegalDocument.find_one(
+            LegalDocument.doc_number == doc_number
+        )
+        
+        if existing_doc:
+            logger.info(f"Document {doc_number} already exists, skipping...")
+            self._remember_legal_doc(doc_number)
+            return False
+        
+        # Process with AI if enabled (in batch mode: later, by process_pending_batches)
+        content_summary = doc_data.get('content_summary') or doc_data.get('abstract')
+        if settings.AI_REWRITE_ENABLED and not self.batch_mode and doc_data.get('content_full') and not content_summary:
+            issue_date = doc_data.get('issue_date')
+            effective_date = doc_data.get('effective_date')
+            summary_data = await self.llm_service.summarize_legal_doc_async(
+                doc_title=doc_data.get('title', ''),
+                doc_content=doc_data.get('content_full', ''),
+                doc_number=doc_number,
+                doc_type=doc_data.get('doc_type') or "Văn bản",
+                issue_date=str(issue_date) if issue_date else None,
+                effective_date=str(effective_date) if effective_date else None,
+                issuing_body=doc_data.get('issuing_body')
+            )
+            content_summary = summary_data.get('executive_summary', '')
+        
+        # Create legal document
+        issue_date = doc_data.get('issue_date')
+        if not issue_date:
+            # Use today's date if missing
+            issue_date = date.today()
+        
+        legal_doc = LegalDocument(
+            doc_number=doc_number,
+            doc_type=doc_data.get('doc_type', 'Unknown'),
+            title=doc_data.get('title', ''),
+            issue_date=issue_date,
+            effective_date=doc_data.get('effective_date'),
+            signer=doc_data.get('signer'),
+            issuing_body=doc_data.get('issuing_body'),
+            content_summary=content_summary,
+            content_full=doc_data.get('content_full'),
+            original_link=doc_data.get('original_link', ''),
+            pdf_url=doc_data.get('pdf_url'),
+            tags=doc_data.get('tags', [])
+        )
+        
+        await legal_doc.insert()  # type: ignore
+        self._remember_legal_doc(doc_number)
+        return True
+    
+    async def process_news_article(self, article_data: Dict[str, Any]) -> bool:
+        """Rewrite and store one news article. Returns True if it was inserted."""
+        if not article_data.get('source_url'):
+            return False
+        
+        # Check if article already exists (tracking params, mobile hosts etc. removed)
+        source_url = canonicalize_url(article_data['source_url'])
+        existing_article = await self._find_article_by_url(source_url)
+        
+        if existing_article:
+            logger.info(f"Article from {source_url} already exists, skipping...")
+            self._remember_news_url(source_url)
+            return False
+        
+        # Get content
+        title = article_data.get('title', '')
+        content_html = article_data.get('content_html', '')
+        summary = article_data.get('summary', title[:200] if title else '')
+        
+        # Same story already stored (or being rewritten) under another URL
+        article_id = PydanticObjectId()
+        signature = article_signature(title, content_html or summary) if self.near_duplicates else None
+        if signature is not None:
+            canonical_id = self.near_duplicates.find(signature)
+            if canonical_id:
+                await self._link_duplicate(PydanticObjectId(canonical_id), source_url)
+                return False
+            self.near_duplicates.add(signature, article_id.binary)
+            self._pending_links[article_id] = []
+        
+        inserted = False
+        try:
+            inserted = await self._rewrite_and_store_article(
+                article_id, source_url, article_data, title, content_html, summary
+            )
+        finally:
+            waiting_urls = self._pending_links.pop(article_id, [])
+            if not inserted and signature is not None:
+                self.near_duplicates.discard(article_id.binary)
+        
+        if not inserted:
+            return False
+        
+        for duplicate_url in waiting_urls:
+            await self._link_duplicate(article_id, duplicate_url)
+        return True
+    
+    async def _rewrite_and_store_article(
+        self,
+        article_id: PydanticObjectId,
+        source_url: str,
+        article_data: Dict[str, Any],
+        title: str,
+        content_html: str,
+        summary: str
+    ) -> bool:
+        """
+        Rewrite an article with AI (when enabled) and insert it under `article_id`.
+        
+        Returns False if another worker stored the same canonical URL first.
+        """
+        # Process with AI if enabled and content is available
+        processed_at = None
+        rewritable = settings.AI_REWRITE_ENABLED and content_html and len(content_html) > MIN_REWRITE_LENGTH
+        if rewritable and not self.batch_mode:
+            try:
+                rewritten_data = await self.llm_service.rewrite_article_async(
+                    original_text=content_html,
+                    title=title,
+                    source=article_data.get('source_name', '')
+                )
+                
+                title = rewritten_data.get('title', title)
+                content_html = rewritten_data.get('content_html', content_html)
+                summary = rewritten_data.get('summary', summary)
+                processed_at = datetime.utcnow()
+                
+                # SEO metadata comes with the rewrite
+                meta_title = rewritten_data.get('meta_title') or title
+                meta_description = rewritten_data.get('meta_description') or summary
+                tags = rewritten_data.get('tags', [])
+            except Exception as e:
+                logger.warning(f"AI processing failed, using original: {e}")
+                meta_title = title
+                meta_description = summary
+                tags = []
+        else:
+            meta_title = title
+            meta_description = summary
+            tags = []
+        
+        # Drafts awaiting a batch rewrite are published when it is applied
+        publish = settings.AUTO_PUBLISH_ENABLED and not (rewritable and self.batch_mode)
+        
+        # Create article
+        article = Article(
+            id=article_id,
+            title=title,
+            slug=slugify(title) if title else f"article-{datetime.utcnow().timestamp()}",
+            summary=summary,
+            content_html=content_html or f"<p>{summary}</p>",
+            source_url=source_url,
+            source_name=article_data.get('source_name'),
+            author_type='Bot',
+            disclaimer_level='Medium',
+            tags=tags,
+            meta_title=meta_title,
+            meta_description=meta_description,
+            featured_image_url=article_data.get('featured_image_url'),
+            relevance_score=article_data.get('relevance_score', 0.0),
+            matched_keywords=article_data.get('matched_keywords', []),
+            status='published' if publish else 'draft',
+            published_at=datetime.utcnow() if publish else None,
+            processed_at=processed_at
+        )
+        
+        try:
+            await article.insert()  # type: ignore
+        except DuplicateKeyError:
+            logger.info(f"Article from {source_url} was stored concurrently, skipping...")
+            self._remember_news_url(source_url)
+            return False
+        
+        self._remember_news_url(source_url)
+        return True
+    
+    async def process_pending_batches(
+        self,
+        limit: Optional[int] = None,
+        since: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Rewrite draft articles and summarize legal documents that have not
+        been through the LLM yet, using provider batch jobs.
+        
+        Pending articles are bot drafts without `processed_at` (articles
+        stored before it was recorded count too - narrow with `since`);
+        pending documents have full text but no summary. Items whose
+        request fails stay pending for the next run.
+        
+        Args:
+            limit: At most this many articles and this many documents
+            since: Only items crawled at or after this time (naive UTC)
+            
+        Returns:
+            Processing results
+        """
+        crawl_log = await self.open_crawl_log("LLM_Batch", "llm_batch")
+        
+        article_query = [Article.processed_at == None, Article.author_type == 'Bot', Article.status == 'draft']  # noqa: E711
+        document_query = [LegalDocument.content_summary == None, LegalDocument.content_full != None]  # noqa: E711
+        if since:
+            article_query.append(Article.crawled_at >= since)
+            document_query.append(LegalDocument.crawled_at >= since)
+        
+        try:
+            articles = await Article.find(*article_query).limit(limit).to_list()
+            documents = await LegalDocument.find(*document_query).limit(limit).to_list()
+            result = await self.process_batches(articles, documents)
+        except Exception as e:
+            logger.error(f"Error in batch processing: {e}")
+            await self.close_crawl_log(crawl_log, items_found=0, items_processed=0, error=str(e))
+            return {"status": "error", "error": str(e)}
+        
+        await self.close_crawl_log(
+            crawl_log,
+            items_found=result['items_found'],
+            items_processed=result['items_processed'],
+            metadata={'batch': result}
+        )
+        return result
+    
+    async def process_batches(self, articles: List[Article], documents: List[LegalDocument]) -> Dict[str, Any]:
+        """
+        Rewrite `articles` and summarize `documents` in batch jobs, saving
+        each item as its result is applied.
+        
+        Returns:
+            Processing results
+        """
+        llm = self.llm_service
+        articles_by_id = {f"article-{a.id}": a for a in articles if len(a.content_html or '') > MIN_REWRITE_LENGTH}
+        documents_by_id = {f"legal-{d.id}": d for d in documents if d.content_full}
+        summary_args = {
+            custom_id: dict(
+                doc_title=doc.title,
+                doc_content=doc.content_full,
+                doc_number=doc.doc_number,
+                doc_type=doc.doc_type,
+                issue_date=str(doc.issue_date) if doc.issue_date else None,
+                effective_date=str(doc.effective_date) if doc.effective_date else None,
+                issuing_body=doc.issuing_body
+            )
+            for custom_id, doc in documents_by_id.items()
+        }
+        # Documents too long for one prompt need map-reduce: summarized
+        # interactively while the batch job runs
+        oversized = [custom_id for custom_id, args in summary_args.items() if not llm.legal_summary_fits(**args)]
+        
+        requests = {
+            custom_id: llm.rewrite_request(article.content_html, article.title, article.source_name or '')
+            for custom_id, article in articles_by_id.items()
+        }
+        requests.update({
+            custom_id: llm.legal_summary_request(**args)
+            for custom_id, args in summary_args.items() if custom_id not in oversized
+        })
+        
+        results, *briefs = await asyncio.gather(
+            llm.run_batch(requests) if requests else asyncio.sleep(0, {}),
+            *(llm.summarize_legal_doc_async(**summary_args[custom_id]) for custom_id in oversized),
+            return_exceptions=True
+        )
+        if isinstance(results, BaseException):
+            raise results
+        
+        articles_done = documents_done = failed = 0
+        for custom_id, result in results.items():
+            if result.text is None:
+                failed += 1
+                logger.warning(f"Batch request {custom_id} failed: {result.error}")
+                continue
+            if custom_id in articles_by_id:
+                article = articles_by_id[custom_id]
+                await self._apply_rewrite(article, llm.parse_rewrite(result.text, article.title))
+                articles_done += 1
+            else:
+                doc = documents_by_id[custom_id]
+                await self._apply_summary(doc, llm.parse_legal_summary(result.text, doc.doc_number, doc.doc_type))
+                documents_done += 1
+        
+        for custom_id, brief in zip(oversized, briefs):
+            if isinstance(brief, BaseException):
+                failed += 1
+                logger.warning(f"Summarizing {custom_id} failed: {brief}")
+                continue
+            await self._apply_summary(documents_by_id[custom_id], brief)
+            documents_done += 1
+        
+        items = len(requests) + len(oversized)
+        logger.info(
+            f"Batch processing: {articles_done} articles rewritten, {documents_done} documents summarized "
+            f"({len(oversized)} long ones interactively), {failed} failed, "
+            f"{items - articles_done - documents_done - failed} without result"
+        )
+        return {
+            "status": "success",
+            "items_found": items,
+            "items_processed": articles_done + documents_done,
+            "articles": articles_done,
+            "legal_docs": documents_done,
+            "failed": items - articles_done - documents_done,
+        }
+    
+    async def _apply_summary(self, doc: LegalDocument, brief: Dict[str, Any]):
+        """Store a policy brief's summary on a legal document."""
+        doc.content_summary = brief.get('executive_summary', '')
+        doc.updated_at = datetime.utcnow()
+        await doc.save()  # type: ignore
+    
+    async def _apply_rewrite(self, article: Article, rewritten_data: Dict[str, Any]):
+        """Store a rewrite on a draft, like `_rewrite_and_store_article` does at insert."""
+        now = datetime.utcnow()
+        article.title = rewritten_data.get('title', article.title)
+        article.slug = slugify(article.title) if article.title else article.slug
+        article.content_html = rewritten_data.get('content_html', article.content_html)
+        article.summary = rewritten_data.get('summary', article.summary)
+        article.meta_title = rewritten_data.get('meta_title') or article.title
+        article.meta_description = rewritten_data.get('meta_description') or article.summary
+        article.tags = rewritten_data.get('tags') or article.tags
+        article.processed_at = now
+        article.updated_at = now
+        if settings.AUTO_PUBLISH_ENABLED:
+            article.status = 'published'
+            article.published_at = now
+        await article.save()  # type: ignore
+    
+    async def _find_article_by_url(self, source_url: str) -> Optional[Article]:
+        """Stored article published at `source_url`, directly or as a linked duplicate."""
+        return await Article.find_one(
+            {"$or": [{"source_url": source_url}, {"duplicate_urls": source_url}]}
+        )
+    
+    async def _link_duplicate(self, canonical_id: PydanticObjectId, source_url: str):
+        """Record `source_url` as another copy of a stored article instead of processing it."""
+        if canonical_id in self._pending_links:
+            # Canonical still being rewritten: linked once it is inserted
+            self._pending_links[canonical_id].append(source_url)
+            return
+        
+        logger.info(f"Article from {source_url} duplicates {canonical_id}, linking...")
+        await Article.find_one(Article.id == canonical_id).update(
+            {"$addToSet": {"duplicate_urls": source_url}}
+        )
+        self._remember_news_url(source_url)
+    
+    def _remember_legal_doc(self, doc_number: str):
+        """Record a stored document so the crawler skips it next run."""
+        if self.legal_frontier:
+            self.legal_frontier.add(normalize_doc_number(doc_number))
+    
+    def _remember_news_url(self, source_url: str):
+        """Record a stored article URL so the crawler skips it next run."""
+        if self.news_frontier:
+            self.news_frontier.add(source_url.strip())
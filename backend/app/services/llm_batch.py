@@ -0,0 +1,213 @@
+"""
+Provider batch APIs (OpenAI Batch API, Anthropic Message Batches).
+
+Non-urgent work - backfilling thousands of drafts - is submitted as one
+job instead of thousands of interactive requests. Batch jobs finish
+within 24 hours at about half the price, and they don't count against
+the interactive rate limits. The pinned SDKs predate these endpoints,
+so they are called over plain httpx; `llm_stub.py` emulates both for
+offline runs.
+"""
+
+import json
+import time
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, Tuple, NamedTuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BatchJob(NamedTuple):
+    """State of a submitted batch job."""
+    id: str
+    status: str                  # Provider status ('in_progress', 'completed', 'ended', ...)
+    done: bool
+    output: Optional[str]        # OpenAI output file id / Anthropic results URL
+    errors: Optional[str] = None  # OpenAI error file id
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one request of a batch."""
+    custom_id: str
+    text: Optional[str]          # None when the request failed
+    tokens: int = 0
+    error: Optional[str] = None
+
+
+class ProviderBatches(ABC):
+    """Batch endpoints of one provider."""
+
+    def __init__(self, base_url: str, headers: Dict[str, str], transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.http = httpx.AsyncClient(base_url=base_url, headers=headers, transport=transport, timeout=120)
+
+    @abstractmethod
+    async def submit(self, requests: List[Tuple[str, Dict[str, Any]]]) -> BatchJob:
+        """Start a job over (custom_id, request body) pairs."""
+        pass
+
+    @abstractmethod
+    async def get(self, batch_id: str) -> BatchJob:
+        """Current state of a job."""
+        pass
+
+    @abstractmethod
+    async def cancel(self, batch_id: str):
+        """Ask the provider to stop a job."""
+        pass
+
+    @abstractmethod
+    async def results(self, job: BatchJob) -> List[BatchResult]:
+        """Per-request results of a finished job."""
+        pass
+
+    async def wait(self, job: BatchJob, poll_interval: Optional[float] = None, timeout: Optional[float] = None) -> BatchJob:
+        """
+        Poll until a job finishes.
+
+        A job still running after `timeout` seconds is cancelled (so its
+        items are not paid for twice when the next run resubmits them)
+        and TimeoutError is raised.
+        """
+        poll_interval = settings.LLM_BATCH_POLL_SECONDS if poll_interval is None else poll_interval
+        timeout = settings.LLM_BATCH_TIMEOUT_HOURS * 3600 if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while not job.done:
+            if time.monotonic() >= deadline:
+                await self.cancel(job.id)
+                raise TimeoutError(f"Batch {job.id} still {job.status} after {timeout:.0f}s, cancelled")
+            await asyncio.sleep(poll_interval)
+            job = await self.get(job.id)
+        return job
+
+    async def _json(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+        response = await self.http.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def _jsonl(self, url: str) -> List[Dict[str, Any]]:
+        response = await self.http.get(url)
+        response.raise_for_status()
+        return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+    async def aclose(self):
+        await self.http.aclose()
+
+
+class OpenAIBatches(ProviderBatches):
+    """OpenAI Batch API: a JSONL file of /v1/chat/completions requests."""
+
+    TERMINAL = ('completed', 'failed', 'expired', 'cancelled')
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(
+            base_url or settings.OPENAI_BASE_URL,
+            {'Authorization': f'Bearer {api_key}'},
+            transport
+        )
+
+    @classmethod
+    def _job(cls, batch: Dict[str, Any]) -> BatchJob:
+        return BatchJob(
+            batch['id'],
+            batch['status'],
+            batch['status'] in cls.TERMINAL,
+            batch.get('output_file_id'),
+            batch.get('error_file_id')
+        )
+
+    async def submit(self, requests: List[Tuple[str, Dict[str, Any]]]) -> BatchJob:
+        jsonl = '\n'.join(
+            json.dumps({'custom_id': custom_id, 'method': 'POST', 'url': '/v1/chat/completions', 'body': body},
+                       ensure_ascii=False)
+            for custom_id, body in requests
+        )
+        uploaded = await self._json(
+            'POST', '/files',
+            data={'purpose': 'batch'},
+            files={'file': ('batch.jsonl', jsonl.encode('utf-8'), 'application/jsonl')}
+        )
+        batch = await self._json('POST', '/batches', json={
+            'input_file_id': uploaded['id'],
+            'endpoint': '/v1/chat/completions',
+            'completion_window': '24h',
+        })
+        return self._job(batch)
+
+    async def get(self, batch_id: str) -> BatchJob:
+        return self._job(await self._json('GET', f'/batches/{batch_id}'))
+
+    async def cancel(self, batch_id: str):
+        await self._json('POST', f'/batches/{batch_id}/cancel')
+
+    async def results(self, job: BatchJob) -> List[BatchResult]:
+        lines = []
+        for file_id in (job.output, job.errors):
+            if file_id:
+                lines.extend(await self._jsonl(f'/files/{file_id}/content'))
+
+        results = []
+        for line in lines:
+            response = line.get('response') or {}
+            body = response.get('body') or {}
+            if line.get('error') or response.get('status_code') != 200:
+                error = line.get('error') or body.get('error') or f"HTTP {response.get('status_code')}"
+                results.append(BatchResult(line['custom_id'], None, error=json.dumps(error, ensure_ascii=False)))
+                continue
+            usage = body.get('usage') or {}
+            text = body['choices'][0]['message']['content'].strip()
+            results.append(BatchResult(line['custom_id'], text, usage.get('total_tokens', 0)))
+        return results
+
+
+class AnthropicBatches(ProviderBatches):
+    """Anthropic Message Batches: Messages API params per request."""
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        super().__init__(
+            base_url or settings.ANTHROPIC_BASE_URL,
+            {'x-api-key': api_key, 'anthropic-version': '2023-06-01'},
+            transport
+        )
+
+    @staticmethod
+    def _job(batch: Dict[str, Any]) -> BatchJob:
+        status = batch['processing_status']
+        return BatchJob(batch['id'], status, status == 'ended', batch.get('results_url'))
+
+    async def submit(self, requests: List[Tuple[str, Dict[str, Any]]]) -> BatchJob:
+        batch = await self._json('POST', '/v1/messages/batches', json={
+            'requests': [{'custom_id': custom_id, 'params': body} for custom_id, body in requests]
+        })
+        return self._job(batch)
+
+    async def get(self, batch_id: str) -> BatchJob:
+        return self._job(await self._json('GET', f'/v1/messages/batches/{batch_id}'))
+
+    async def cancel(self, batch_id: str):
+        await self._json('POST', f'/v1/messages/batches/{batch_id}/cancel')
+
+    async def results(self, job: BatchJob) -> List[BatchResult]:
+        if not job.output:
+            return []
+
+        results = []
+        for line in await self._jsonl(job.output):
+            result = line['result']
+            if result['type'] != 'succeeded':
+                error = result.get('error') or result['type']
+                results.append(BatchResult(line['custom_id'], None, error=json.dumps(error, ensure_ascii=False)))
+                continue
+            message = result['message']
+            usage = message.get('usage') or {}
+            text = message['content'][0]['text'].strip()
+            results.append(BatchResult(
+                line['custom_id'], text, usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+            ))
+        return results
@@ -0,0 +1,195 @@
+"""
+Persistent LLM response cache.
+
+Re-running the pipeline (after a failed run, a selector fix or a
+re-crawl) sends the same source text to the LLM again. Completions are
+stored under a hash of everything that determines them - provider,
+model, temperature, max tokens, prompt template version, system prompt
+and the whitespace-normalized input - and identical requests are
+answered from disk. The cache is a single SQLite file, bounded in size
+(LRU eviction) and age.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Optional, Dict, Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_input(text: Optional[str]) -> str:
+    """NFC-normalize and collapse whitespace, so re-crawled copies of a text share a key."""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    prompt_version: Optional[str],
+    system_message: Optional[str],
+    prompt: str
+) -> str:
+    """SHA-256 key of a completion request."""
+    payload = json.dumps(
+        [provider, model, round(temperature, 3), max_tokens, prompt_version or '',
+         normalize_input(system_message), normalize_input(prompt)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed completion cache with size-bounded LRU and age eviction."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_age_days: Optional[float] = None
+    ):
+        self.path = path or os.path.join(settings.LLM_CACHE_DIR, 'responses.sqlite3')
+        self.max_bytes = max_bytes or settings.LLM_CACHE_MAX_MB * 1024 * 1024
+        self.max_age = (max_age_days or settings.LLM_CACHE_MAX_AGE_DAYS) * 86400
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                prompt_version TEXT,
+                response BLOB NOT NULL,
+                tokens INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_completions_access ON completions (last_access)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_completions_created ON completions (created_at)')
+        self._conn.commit()
+
+        # Counters for this process
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached completion for a key (None on a miss or an expired entry)."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, tokens, created_at FROM completions WHERE key = ?', (key,)
+            ).fetchone()
+            if row and now - row[2] > self.max_age:
+                self._conn.execute('DELETE FROM completions WHERE key = ?', (key,))
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE completions SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+            self.tokens_saved += row[1]
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def store(self, key: str, response: str, tokens: int = 0, model: str = '', prompt_version: Optional[str] = None):
+        """
+        Record a completion.
+
+        Args:
+            key: `cache_key()` of the request
+            response: Completion text
+            tokens: Prompt + completion tokens the request cost
+            model: Model name (kept for inspection)
+            prompt_version: Template version (kept for inspection)
+        """
+        compressed = zlib.compress(response.encode('utf-8'), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO completions '
+                '(key, model, prompt_version, response, tokens, size, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, model, prompt_version, compressed, tokens, len(compressed), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones until the cache fits `max_bytes`."""
+        expired = self._conn.execute('DELETE FROM completions WHERE created_at < ?', (now - self.max_age,))
+        self.evictions += expired.rowcount
+
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM completions').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute('SELECT key, size FROM completions ORDER BY last_access'):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+
+        self._conn.executemany('DELETE FROM completions WHERE key = ?', victims)
+        self.evictions += len(victims)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def counters(self) -> Dict[str, int]:
+        """Hit/miss/token counters for this process (diff two snapshots for one run)."""
+        return {'hits': self.hits, 'misses': self.misses, 'tokens_saved': self.tokens_saved}
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process plus current on-disk size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions'
+            ).fetchone()
+        return {
+            **self.counters(),
+            'hit_rate': round(self.hit_rate, 3),
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Shared cache instance (None when LLM_CACHE_ENABLED is off)."""
+    global _llm_cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache()
+    return _llm_cache
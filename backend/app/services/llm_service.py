@@ -1,21 +1,57 @@
 """
 LLM Service - integrates with OpenAI and Anthropic APIs.
+
+Every operation has a blocking version (`rewrite_article`) and an async
+one (`rewrite_article_async`) built on the providers' async clients. Async
+calls share one semaphore per service, so at most LLM_MAX_CONCURRENCY
+requests are in flight however many coroutines call in.
+
+Completions are cached on disk (`llm_cache.py`), so re-running the
+pipeline over the same source text does not pay for it twice. Bulk,
+non-urgent work goes through `run_batch` (provider batch APIs,
+`llm_batch.py`) instead of one interactive request per item.
+
+Prompts are kept within AIContentEngineConfig.MAX_INPUT_TOKENS: inputs
+are measured in model tokens (`tokens.py`) and truncated to fit. Legal
+documents too long for one prompt are summarized map-reduce - notes on
+each part (runs of Chương/Điều) in parallel, then one summary of the
+notes - so a long decree costs two rounds of requests, not an overflow.
+
+A news rewrite returns the article and its SEO metadata in one JSON
+response, validated against `NewsRewriteOutput`; `usage` counts the
+requests, tokens and seconds spent and the SEO requests this saves.
 """
 
+import json
+import time
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Tuple, List, Callable
 from enum import Enum
 from datetime import datetime
 
+from pydantic import ValidationError
+
 from app.core.config import settings
+from app.services.llm_cache import LLMResponseCache, get_llm_cache, cache_key
+from app.services.llm_batch import ProviderBatches, OpenAIBatches, AnthropicBatches, BatchResult
+from app.services.tokens import get_token_counter, split_legal_text, legal_text
 from app.services.prompt_templates import (
     InsuranceJournalistPrompts,
-    AIContentEngineConfig
+    AIContentEngineConfig,
+    NewsRewriteOutput
 )
 
 logger = logging.getLogger(__name__)
 
 
+def _json_object(text: str) -> str:
+    """The JSON object in a completion, without the ```json fence models sometimes add."""
+    start, end = text.find("{"), text.rfind("}")
+    return text[start:end + 1] if 0 <= start < end else text
+
+
 class LLMProvider(str, Enum):
     """Supported LLM providers."""
     OPENAI = "openai"
@@ -25,32 +61,67 @@ class LLMProvider(str, Enum):
 class LLMService:
     """Service for interacting with LLM APIs."""
     
-    def __init__(self, provider: LLMProvider = LLMProvider.OPENAI):
+    def __init__(
+        self,
+        provider: LLMProvider = LLMProvider.OPENAI,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[LLMResponseCache] = None
+    ):
         """
         Initialize LLM service.
         
         Args:
             provider: LLM provider to use (openai or anthropic)
+            max_concurrency: In-flight async requests (default: LLM_MAX_CONCURRENCY)
+            cache: Response cache (default: the shared one, None when LLM_CACHE_ENABLED is off)
         """
         self.provider = provider
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.cache = cache if cache is not None else get_llm_cache()
         
         if provider == LLMProvider.OPENAI:
             import openai
-            self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+            self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+            self.async_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+            self.batches: ProviderBatches = OpenAIBatches(settings.OPENAI_API_KEY)
             self.model = settings.OPENAI_MODEL
         elif provider == LLMProvider.ANTHROPIC:
             import anthropic
-            self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+            self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY, base_url=settings.ANTHROPIC_BASE_URL)
+            self.async_client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, base_url=settings.ANTHROPIC_BASE_URL)
+            self.batches = AnthropicBatches(settings.ANTHROPIC_API_KEY or '')
             self.model = settings.ANTHROPIC_MODEL
         else:
             raise ValueError(f"Unsupported provider: {provider}")
+        
+        self.tokens = get_token_counter(self.model)
+        
+        # Interactive provider requests (cache hits and batch jobs excluded),
+        # and the SEO requests saved by rewrites carrying their own metadata
+        self.usage: Dict[str, float] = {
+            "calls": 0, "tokens": 0, "seconds": 0.0, "seo_calls_saved": 0, "seo_tokens_saved": 0
+        }
+        self._seo_tokens: Optional[int] = None
+        
+        # asyncio primitives are tied to the loop that first uses them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
     
     def generate_completion(
         self,
         prompt: str,
         system_message: Optional[str] = None,
         max_tokens: int = 4000,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        prompt_version: Optional[str] = None,
+        json_output: bool = False
     ) -> str:
         """
         Generate text completion using the selected LLM.
@@ -60,27 +131,251 @@ class LLMService:
             system_message: System message for context
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0-1)
+            prompt_version: Version of the template the prompt came from
+                (part of the cache key)
+            json_output: Constrain the output to a JSON object (OpenAI JSON
+                mode; Anthropic relies on the prompt)
             
         Returns:
             Generated text
         """
+        return self._complete(prompt, system_message, max_tokens, temperature, prompt_version, json_output)[0]
+    
+    def _complete(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        prompt_version: Optional[str] = None,
+        json_output: bool = False
+    ) -> Tuple[str, bool]:
+        """`generate_completion`, and whether the provider answered (False: served from the cache)."""
+        key = self._cache_key(prompt, system_message, max_tokens, temperature, prompt_version)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached, False
+        
+        self._check_budget(prompt, system_message)
+        started = time.perf_counter()
         try:
             if self.provider == LLMProvider.OPENAI:
-                return self._openai_completion(prompt, system_message, max_tokens, temperature)
+                text, tokens = self._openai_completion(prompt, system_message, max_tokens, temperature, json_output)
             elif self.provider == LLMProvider.ANTHROPIC:
-                return self._anthropic_completion(prompt, system_message, max_tokens, temperature)
+                text, tokens = self._anthropic_completion(prompt, system_message, max_tokens, temperature)
         except Exception as e:
             logger.error(f"Error generating completion: {e}")
             raise
+        self._record_usage(tokens, time.perf_counter() - started)
+        
+        if key:
+            self.cache.store(key, text, tokens, self.model, prompt_version)
+        return text, True
     
-    def _openai_completion(
+    async def generate_completion_async(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        prompt_version: Optional[str] = None,
+        json_output: bool = False
+    ) -> str:
+        """
+        Async `generate_completion`; waits for a free slot when
+        `max_concurrency` requests are already in flight (cache hits don't).
+        """
+        return (await self._complete_async(prompt, system_message, max_tokens, temperature, prompt_version, json_output))[0]
+    
+    async def _complete_async(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        prompt_version: Optional[str] = None,
+        json_output: bool = False
+    ) -> Tuple[str, bool]:
+        """Async `_complete`; the response cache is read and written in worker threads."""
+        key = self._cache_key(prompt, system_message, max_tokens, temperature, prompt_version)
+        cached = await asyncio.to_thread(self.cache.get, key) if key else None
+        if cached is not None:
+            return cached, False
+        
+        self._check_budget(prompt, system_message)
+        async with self._semaphore():
+            started = time.perf_counter()
+            try:
+                if self.provider == LLMProvider.OPENAI:
+                    response = await self.async_client.chat.completions.create(
+                        **self._openai_request(prompt, system_message, max_tokens, temperature, json_output)
+                    )
+                    text, tokens = self._openai_result(response)
+                elif self.provider == LLMProvider.ANTHROPIC:
+                    response = await self.async_client.messages.create(
+                        **self._anthropic_request(prompt, system_message, max_tokens, temperature)
+                    )
+                    text, tokens = self._anthropic_result(response)
+            except Exception as e:
+                logger.error(f"Error generating completion: {e}")
+                raise
+            self._record_usage(tokens, time.perf_counter() - started)
+        
+        if key:
+            await asyncio.to_thread(self.cache.store, key, text, tokens, self.model, prompt_version)
+        return text, True
+    
+    async def run_batch(
+        self,
+        requests: Dict[str, Dict[str, Any]],
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, BatchResult]:
+        """
+        Complete many requests through the provider's batch API.
+        
+        Requests already in the response cache are answered from it; the
+        rest are split into jobs of LLM_BATCH_MAX_ITEMS, submitted
+        together and polled until they finish. A job that fails or times
+        out is logged and its requests are missing from the result.
+        
+        Args:
+            requests: custom_id -> `generate_completion` keyword arguments
+                (e.g. from `rewrite_request`); ids are 1-64 of [A-Za-z0-9_-]
+            poll_interval: Seconds between status checks (default: LLM_BATCH_POLL_SECONDS)
+            timeout: Seconds before an unfinished job is cancelled
+                (default: LLM_BATCH_TIMEOUT_HOURS)
+            
+        Returns:
+            custom_id -> result
+        """
+        results: Dict[str, BatchResult] = {}
+        keys: Dict[str, Optional[str]] = {}
+        bodies: List[Tuple[str, Dict[str, Any]]] = []
+        
+        # Cache lookups and stores run in a worker thread, off the event loop
+        request_keys = {custom_id: self._cache_key(**request) for custom_id, request in requests.items()}
+        cached_texts = await asyncio.to_thread(
+            lambda: {custom_id: self.cache.get(key) if key else None for custom_id, key in request_keys.items()}
+        )
+        
+        for custom_id, request in requests.items():
+            key, cached = request_keys[custom_id], cached_texts[custom_id]
+            if cached is not None:
+                results[custom_id] = BatchResult(custom_id, cached)
+                continue
+            keys[custom_id] = key
+            bodies.append((custom_id, self._request_body(**request)))
+        
+        size = settings.LLM_BATCH_MAX_ITEMS
+        jobs = [bodies[i:i + size] for i in range(0, len(bodies), size)]
+        outcomes = await asyncio.gather(
+            *(self._run_batch_job(job, poll_interval, timeout) for job in jobs),
+            return_exceptions=True
+        )
+        
+        completed: List[BatchResult] = []
+        for job, outcome in zip(jobs, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Batch job of {len(job)} requests failed: {outcome}")
+                continue
+            for result in outcome:
+                if result.custom_id not in keys:
+                    continue
+                results[result.custom_id] = result
+                if keys[result.custom_id] and result.text is not None:
+                    completed.append(result)
+        
+        def store_completed():
+            for result in completed:
+                prompt_version = requests[result.custom_id].get('prompt_version')
+                self.cache.store(keys[result.custom_id], result.text, result.tokens, self.model, prompt_version)
+        
+        if completed:
+            await asyncio.to_thread(store_completed)
+        return results
+    
+    async def _run_batch_job(
+        self,
+        bodies: List[Tuple[str, Dict[str, Any]]],
+        poll_interval: Optional[float],
+        timeout: Optional[float]
+    ) -> List[BatchResult]:
+        job = await self.batches.submit(bodies)
+        logger.info(f"Submitted batch {job.id} ({len(bodies)} requests)")
+        job = await self.batches.wait(job, poll_interval, timeout)
+        logger.info(f"Batch {job.id} {job.status}")
+        return await self.batches.results(job)
+    
+    def _request_body(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        prompt_version: Optional[str] = None,
+        json_output: bool = False
+    ) -> Dict[str, Any]:
+        """Provider request body of `generate_completion` arguments."""
+        if self.provider == LLMProvider.OPENAI:
+            return self._openai_request(prompt, system_message, max_tokens, temperature, json_output)
+        return self._anthropic_request(prompt, system_message, max_tokens, temperature)
+    
+    def _record_usage(self, tokens: int, seconds: float):
+        self.usage["calls"] += 1
+        self.usage["tokens"] += tokens
+        self.usage["seconds"] += seconds
+    
+    def _check_budget(self, prompt: str, system_message: Optional[str]) -> int:
+        """Tokens of a prompt; warns when it is over MAX_INPUT_TOKENS (callers fit their inputs)."""
+        tokens = self.tokens.count(prompt) + self.tokens.count(system_message or '')
+        if tokens > AIContentEngineConfig.MAX_INPUT_TOKENS:
+            logger.warning(f"Prompt of {tokens} tokens exceeds MAX_INPUT_TOKENS ({AIContentEngineConfig.MAX_INPUT_TOKENS})")
+        else:
+            logger.debug(f"Prompt of {tokens} tokens")
+        return tokens
+    
+    def _content_budget(self, build: Callable[[str], Dict[str, str]]) -> int:
+        """Tokens left for the input of the prompts `build(input)` makes."""
+        empty = build('')
+        return (
+            AIContentEngineConfig.MAX_INPUT_TOKENS
+            - self.tokens.count(empty["system_prompt"])
+            - self.tokens.count(empty["user_prompt"])
+        )
+    
+    def _fit_prompt(self, build: Callable[[str], Dict[str, str]], content: str) -> Dict[str, str]:
+        """`build(content)`, with `content` truncated to what fits MAX_INPUT_TOKENS."""
+        budget = self._content_budget(build)
+        tokens = self.tokens.count(content)
+        if tokens > budget:
+            logger.warning(f"Input of {tokens} tokens truncated to {budget} to fit the prompt")
+            content = self.tokens.truncate(content, budget)
+        return build(content)
+    
+    def _cache_key(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        prompt_version: Optional[str] = None,
+        json_output: bool = False
+    ) -> Optional[str]:
+        # json_output comes with the template, so prompt_version covers it
+        if self.cache is None:
+            return None
+        return cache_key(self.provider.value, self.model, temperature, max_tokens, prompt_version, system_message, prompt)
+    
+    def _openai_request(
         self,
         prompt: str,
         system_message: Optional[str],
         max_tokens: int,
-        temperature: float
-    ) -> str:
-        """Generate completion using OpenAI."""
+        temperature: float,
+        json_output: bool = False
+    ) -> Dict[str, Any]:
+        """Chat Completions request body."""
         messages = []
         
         if system_message:
@@ -88,14 +383,58 @@ class LLMService:
         
         messages.append({"role": "user", "content": prompt})
         
+        request = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        if json_output:
+            request["response_format"] = {"type": "json_object"}
+        return request
+    
+    def _anthropic_request(
+        self,
+        prompt: str,
+        system_message: Optional[str],
+        max_tokens: int,
+        temperature: float
+    ) -> Dict[str, Any]:
+        """Messages API request body."""
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system_message or "",
+            "messages": [{"role": "user", "content": prompt}]
+        }
+    
+    @staticmethod
+    def _openai_result(response: Any) -> Tuple[str, int]:
+        """Completion text and total tokens of a Chat Completions response."""
+        tokens = response.usage.total_tokens if response.usage else 0
+        return response.choices[0].message.content.strip(), tokens
+    
+    @staticmethod
+    def _anthropic_result(response: Any) -> Tuple[str, int]:
+        """Completion text and total tokens of a Messages API response."""
+        tokens = response.usage.input_tokens + response.usage.output_tokens if response.usage else 0
+        return response.content[0].text.strip(), tokens
+    
+    def _openai_completion(
+        self,
+        prompt: str,
+        system_message: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        json_output: bool = False
+    ) -> Tuple[str, int]:
+        """Generate completion using OpenAI (text, tokens used)."""
         response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_tokens=max_tokens,
-            temperature=temperature
+            **self._openai_request(prompt, system_message, max_tokens, temperature, json_output)
         )
         
-        return response.choices[0].message.content.strip()
+        return self._openai_result(response)
     
     def _anthropic_completion(
         self,
@@ -103,17 +442,13 @@ class LLMService:
         system_message: Optional[str],
         max_tokens: int,
         temperature: float
-    ) -> str:
-        """Generate completion using Anthropic."""
+    ) -> Tuple[str, int]:
+        """Generate completion using Anthropic (text, tokens used)."""
         response = self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            system=system_message or "",
-            messages=[{"role": "user", "content": prompt}]
+            **self._anthropic_request(prompt, system_message, max_tokens, temperature)
         )
         
-        return response.content[0].text.strip()
+        return self._anthropic_result(response)
     
     def rewrite_article(
         self,
@@ -132,28 +467,66 @@ class LLMService:
             published_date: Original publication date
             
         Returns:
-            Dictionary with rewritten content following journalist standards
+            Dictionary with rewritten content following journalist standards,
+            and its SEO metadata (meta_title, meta_description, keywords,
+            og_title, og_description) - no `generate_seo_metadata` call needed
         """
+        request = self.rewrite_request(original_text, title, source, published_date)
+        response, answered = self._complete(**request)
+        return self._rewrite_result(response, title, answered)
+    
+    async def rewrite_article_async(
+        self,
+        original_text: str,
+        title: str,
+        source: str,
+        published_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async `rewrite_article`."""
+        request = self.rewrite_request(original_text, title, source, published_date)
+        response, answered = await self._complete_async(**request)
+        return self._rewrite_result(response, title, answered)
+    
+    def rewrite_request(
+        self,
+        original_text: str,
+        title: str,
+        source: str,
+        published_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """`generate_completion` arguments of `rewrite_article` (e.g. for `run_batch`)."""
+        published_date = published_date or datetime.now().strftime("%Y-%m-%d")
+        
         # Generate prompts using the professional template
-        prompts = InsuranceJournalistPrompts.get_news_rewrite_prompt(
-            original_title=title,
-            original_content=original_text,
-            source_name=source,
-            published_date=published_date or datetime.now().strftime("%Y-%m-%d")
-        )
+        def build(content: str) -> Dict[str, str]:
+            return InsuranceJournalistPrompts.get_news_rewrite_prompt(
+                original_title=title,
+                original_content=content,
+                source_name=source,
+                published_date=published_date
+            )
         
-        # Generate completion with professional journalist persona
-        response = self.generate_completion(
-            prompt=prompts["user_prompt"],
-            system_message=prompts["system_prompt"],
-            max_tokens=AIContentEngineConfig.MAX_OUTPUT_TOKENS,
-            temperature=AIContentEngineConfig.TEMPERATURE_NEWS
-        )
+        prompts = self._fit_prompt(build, original_text)
         
-        # Parse JSON response
-        import json
+        # Professional journalist persona
+        return {
+            "prompt": prompts["user_prompt"],
+            "system_message": prompts["system_prompt"],
+            "max_tokens": AIContentEngineConfig.MAX_OUTPUT_TOKENS,
+            "temperature": AIContentEngineConfig.TEMPERATURE_NEWS,
+            "prompt_version": InsuranceJournalistPrompts.VERSION,
+            "json_output": True
+        }
+    
+    def parse_rewrite(self, response: str, title: str) -> Dict[str, Any]:
+        """`rewrite_article` result from a completion."""
+        return self._parse_rewrite(response, title)[0]
+    
+    def _parse_rewrite(self, response: str, title: str) -> Tuple[Dict[str, Any], bool]:
+        """`parse_rewrite`, and whether the response matched the schema (False: fallback)."""
+        # Parse and validate the JSON response
         try:
-            result = json.loads(response)
+            result = NewsRewriteOutput.model_validate_json(_json_object(response)).model_dump()
             
             # Construct full HTML article from structured parts
             content_html = f"""
@@ -181,17 +554,23 @@ class LLMService:
             """
             
             return {
-                "title": result.get("rewritten_title", title),
+                "title": result["rewritten_title"],
                 "content_html": content_html,
-                "summary": result.get("meta_description", ""),
-                "key_points": result.get("tags", []),
-                "tags": result.get("tags", []),
-                "reading_time": result.get("estimated_reading_time", 5),
-                "has_disclaimer": result.get("disclaimer") is not None
-            }
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            logger.warning("Failed to parse JSON response, returning raw text")
+                "summary": result["meta_description"],
+                "key_points": result["tags"],
+                "tags": result["tags"],
+                "reading_time": result["estimated_reading_time"],
+                "has_disclaimer": result["disclaimer"] is not None,
+                "meta_title": result["meta_title"],
+                "meta_description": result["meta_description"],
+                "keywords": result["keywords"],
+                "og_title": result["og_title"],
+                "og_description": result["og_description"]
+            }, True
+        except ValidationError as e:
+            # Fallback if the response is not JSON or misses required fields
+            problems = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'response'}: {err['msg']}" for err in e.errors()[:3])
+            logger.warning(f"Rewrite response does not match the schema ({problems}), returning raw text")
             return {
                 "title": title,
                 "content_html": f"<p>{response}</p>",
@@ -199,8 +578,34 @@ class LLMService:
                 "key_points": [],
                 "tags": [],
                 "reading_time": 5,
-                "has_disclaimer": False
-            }
+                "has_disclaimer": False,
+                "meta_title": title[:60],
+                "meta_description": response[:160],
+                "keywords": [],
+                "og_title": title,
+                "og_description": response[:160]
+            }, False
+    
+    def _rewrite_result(self, response: str, title: str, answered: bool) -> Dict[str, Any]:
+        """
+        `parse_rewrite`, counting the `generate_seo_metadata` request it made
+        unnecessary - only for provider answers (a cache hit saved nothing)
+        that carry valid metadata (the fallback's would be regenerated).
+        """
+        rewrite, valid = self._parse_rewrite(response, title)
+        if answered and valid:
+            if self._seo_tokens is None:
+                # Prompt and output tokens of one SEO request, estimated on the first rewrite
+                request = self._seo_request(rewrite["title"], rewrite["content_html"])
+                seo = {field: rewrite[field] for field in ("meta_title", "meta_description", "keywords", "og_title", "og_description")}
+                self._seo_tokens = (
+                    self.tokens.count(request["system_message"])
+                    + self.tokens.count(request["prompt"])
+                    + self.tokens.count(json.dumps(seo, ensure_ascii=False))
+                )
+            self.usage["seo_calls_saved"] += 1
+            self.usage["seo_tokens_saved"] += self._seo_tokens
+        return rewrite
     
     def summarize_legal_doc(
         self,
@@ -227,26 +632,171 @@ class LLMService:
         Returns:
             Dictionary with policy brief in structured format
         """
+        notes_requests, summary_request = self._legal_requests(
+            doc_title, doc_content, doc_number, doc_type, issue_date, effective_date, issuing_body
+        )
+        notes = []
+        if notes_requests:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                notes = list(pool.map(lambda request: self.generate_completion(**request), notes_requests))
+        
+        request = summary_request(notes)
+        return self.parse_legal_summary(self.generate_completion(**request), doc_number, doc_type)
+    
+    async def summarize_legal_doc_async(
+        self,
+        doc_title: str,
+        doc_content: str,
+        doc_number: str,
+        doc_type: str = "Văn bản",
+        issue_date: Optional[str] = None,
+        effective_date: Optional[str] = None,
+        issuing_body: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Async `summarize_legal_doc`."""
+        notes_requests, summary_request = self._legal_requests(
+            doc_title, doc_content, doc_number, doc_type, issue_date, effective_date, issuing_body
+        )
+        notes = await asyncio.gather(*(self.generate_completion_async(**request) for request in notes_requests))
+        
+        request = summary_request(list(notes))
+        return self.parse_legal_summary(await self.generate_completion_async(**request), doc_number, doc_type)
+    
+    def legal_summary_request(
+        self,
+        doc_title: str,
+        doc_content: str,
+        doc_number: str,
+        doc_type: str = "Văn bản",
+        issue_date: Optional[str] = None,
+        effective_date: Optional[str] = None,
+        issuing_body: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        `generate_completion` arguments of `summarize_legal_doc` (e.g. for
+        `run_batch`) in a single prompt: a text over the budget (see
+        `legal_summary_fits`) is truncated.
+        """
+        build = self._legal_prompt(doc_title, doc_number, doc_type, issue_date, effective_date, issuing_body)
+        return self._legal_request(self._fit_prompt(build, legal_text(doc_content)))
+    
+    def legal_summary_fits(
+        self,
+        doc_title: str,
+        doc_content: str,
+        doc_number: str,
+        doc_type: str = "Văn bản",
+        issue_date: Optional[str] = None,
+        effective_date: Optional[str] = None,
+        issuing_body: Optional[str] = None
+    ) -> bool:
+        """Whether `doc_content` fits one summary prompt; `summarize_legal_doc` goes map-reduce otherwise."""
+        build = self._legal_prompt(doc_title, doc_number, doc_type, issue_date, effective_date, issuing_body)
+        return self.tokens.count(legal_text(doc_content)) <= self._content_budget(build)
+    
+    def _legal_prompt(
+        self,
+        doc_title: str,
+        doc_number: str,
+        doc_type: str,
+        issue_date: Optional[str],
+        effective_date: Optional[str],
+        issuing_body: Optional[str],
+        parts: int = 0
+    ) -> Callable[[str], Dict[str, str]]:
+        """Legal summary prompts of a document, as a function of its content."""
         # Generate prompts using the professional legal template
-        prompts = InsuranceJournalistPrompts.get_legal_summary_prompt(
-            doc_number=doc_number,
-            doc_type=doc_type,
-            doc_title=doc_title,
-            doc_content=doc_content,
-            issue_date=issue_date or datetime.now().strftime("%Y-%m-%d"),
-            effective_date=effective_date or "Chưa rõ",
-            issuing_body=issuing_body or "Chưa rõ"
+        def build(content: str) -> Dict[str, str]:
+            return InsuranceJournalistPrompts.get_legal_summary_prompt(
+                doc_number=doc_number,
+                doc_type=doc_type,
+                doc_title=doc_title,
+                doc_content=content,
+                issue_date=issue_date or "Chưa rõ",
+                effective_date=effective_date or "Chưa rõ",
+                issuing_body=issuing_body or "Chưa rõ",
+                parts=parts
+            )
+        
+        return build
+    
+    def _legal_request(
+        self,
+        prompts: Dict[str, str],
+        max_tokens: int = AIContentEngineConfig.MAX_OUTPUT_TOKENS
+    ) -> Dict[str, Any]:
+        # Lower temperature for legal accuracy
+        return {
+            "prompt": prompts["user_prompt"],
+            "system_message": prompts["system_prompt"],
+            "max_tokens": max_tokens,
+            "temperature": AIContentEngineConfig.TEMPERATURE_LEGAL,
+            "prompt_version": InsuranceJournalistPrompts.VERSION
+        }
+    
+    def _legal_requests(
+        self,
+        doc_title: str,
+        doc_content: str,
+        doc_number: str,
+        doc_type: str = "Văn bản",
+        issue_date: Optional[str] = None,
+        effective_date: Optional[str] = None,
+        issuing_body: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Callable[[List[str]], Dict[str, Any]]]:
+        """
+        Requests of `summarize_legal_doc`: the notes requests (map), one per
+        part of a text too long for one prompt, and a function making the
+        summary request (reduce) from their completions. A text that fits
+        has no notes requests and is summarized directly. HTML content is
+        reduced to text first, so that parts follow its Chương/Điều headings.
+        """
+        doc_content = legal_text(doc_content)
+        if self.legal_summary_fits(
+            doc_title, doc_content, doc_number, doc_type, issue_date, effective_date, issuing_body
+        ):
+            request = self.legal_summary_request(
+                doc_title, doc_content, doc_number, doc_type, issue_date, effective_date, issuing_body
+            )
+            return [], lambda notes: request
+        
+        def notes_prompt(text: str, part: int = 9999, parts: int = 9999, max_points: int = 99) -> Dict[str, str]:
+            return InsuranceJournalistPrompts.get_legal_notes_prompt(
+                doc_number, doc_type, doc_title, text, part, parts, max_points
+            )
+        
+        chunks = split_legal_text(doc_content, self._content_budget(notes_prompt), self.tokens)
+        summary_prompt = self._legal_prompt(
+            doc_title, doc_number, doc_type, issue_date, effective_date, issuing_body, parts=len(chunks)
         )
         
-        # Generate completion with lower temperature for legal accuracy
-        response = self.generate_completion(
-            prompt=prompts["user_prompt"],
-            system_message=prompts["system_prompt"],
-            max_tokens=AIContentEngineConfig.MAX_OUTPUT_TOKENS,
-            temperature=AIContentEngineConfig.TEMPERATURE_LEGAL
+        # Notes sized so that all of them fit the summary prompt
+        summary_budget = self._content_budget(summary_prompt)
+        notes_tokens = min(
+            max(summary_budget // len(chunks), AIContentEngineConfig.LEGAL_NOTES_MIN_TOKENS),
+            AIContentEngineConfig.LEGAL_NOTES_MAX_TOKENS
+        )
+        logger.info(
+            f"{doc_type} {doc_number}: {self.tokens.count(doc_content)} tokens, "
+            f"summarizing {len(chunks)} parts of up to {notes_tokens} tokens of notes each"
         )
+        notes_requests = [
+            self._legal_request(notes_prompt(chunk, part, len(chunks), max(3, notes_tokens // 60)), notes_tokens)
+            for part, chunk in enumerate(chunks, 1)
+        ]
         
-        import json
+        def summary_request(notes: List[str]) -> Dict[str, Any]:
+            sections = [f"### Phần {part}/{len(notes)}\n{note.strip()}" for part, note in enumerate(notes, 1)]
+            if sum(self.tokens.count(section) for section in sections) > summary_budget:
+                # Many parts at the minimum notes size: every part gets an equal share
+                share = summary_budget // len(sections) - 2
+                sections = [self.tokens.truncate(section, share) for section in sections]
+            return self._legal_request(self._fit_prompt(summary_prompt, "\n\n".join(sections)))
+        
+        return notes_requests, summary_request
+    
+    def parse_legal_summary(self, response: str, doc_number: str, doc_type: str = "Văn bản") -> Dict[str, Any]:
+        """`summarize_legal_doc` result from a completion."""
         try:
             result = json.loads(response)
             
@@ -294,6 +844,18 @@ class LLMService:
         Returns:
             Dictionary with extracted entities
         """
+        return self._parse_entities(self.generate_completion(**self._entities_request(text)))
+    
+    async def extract_entities_async(self, text: str) -> Dict[str, Any]:
+        """Async `extract_entities`."""
+        return self._parse_entities(await self.generate_completion_async(**self._entities_request(text)))
+    
+    def _entities_request(self, text: str) -> Dict[str, Any]:
+        prompts = self._fit_prompt(self._entities_prompt, text)
+        return {"prompt": prompts["user_prompt"], "system_message": prompts["system_prompt"], "max_tokens": 1000, "temperature": 0.3}
+    
+    @staticmethod
+    def _entities_prompt(text: str) -> Dict[str, str]:
         system_message = """You are an NLP expert. Extract named entities from insurance-related text in Vietnam.
 Focus on: insurance companies, executives, dates, monetary amounts, and regulations."""
         
@@ -311,9 +873,9 @@ Return JSON:
 }}
 """
         
-        response = self.generate_completion(prompt, system_message, max_tokens=1000, temperature=0.3)
-        
-        import json
+        return {"system_prompt": system_message, "user_prompt": prompt}
+    
+    def _parse_entities(self, response: str) -> Dict[str, Any]:
         try:
             return json.loads(response)
         except json.JSONDecodeError:
@@ -340,6 +902,13 @@ Return JSON:
         Returns:
             Dictionary with SEO metadata
         """
+        return self._parse_seo(self.generate_completion(**self._seo_request(title, content)), title, content)
+    
+    async def generate_seo_metadata_async(self, title: str, content: str) -> Dict[str, Any]:
+        """Async `generate_seo_metadata`."""
+        return self._parse_seo(await self.generate_completion_async(**self._seo_request(title, content)), title, content)
+    
+    def _seo_request(self, title: str, content: str) -> Dict[str, Any]:
         system_message = """You are an SEO expert for Vietnamese content. Generate optimal metadata."""
         
         prompt = f"""Generate SEO metadata for this insurance article:
@@ -357,9 +926,9 @@ Return JSON:
 }}
 """
         
-        response = self.generate_completion(prompt, system_message, max_tokens=500, temperature=0.5)
-        
-        import json
+        return {"prompt": prompt, "system_message": system_message, "max_tokens": 500, "temperature": 0.5}
+    
+    def _parse_seo(self, response: str, title: str, content: str) -> Dict[str, Any]:
         try:
             return json.loads(response)
         except json.JSONDecodeError:
@@ -0,0 +1,211 @@
+"""
+Local stand-in for the OpenAI and Anthropic APIs - no keys, no network.
+
+Serves chat completions, messages and both providers' batch endpoints
+from memory, so the AI pipeline and the batch mode run offline:
+
+    uvicorn app.services.llm_stub:app --port 8090
+    OPENAI_BASE_URL=http://localhost:8090/v1 ANTHROPIC_BASE_URL=http://localhost:8090 \\
+        python run_llm_batch.py
+
+Tests mount the app on httpx.ASGITransport instead of a socket.
+Completions come from a responder, by default one JSON object that
+every LLMService parser accepts; a responder that raises makes that
+request fail (an error line in batch results). Batches finish after
+`polls` status checks.
+"""
+
+import json
+import time
+import uuid
+import hashlib
+from typing import Optional, Dict, Any, List, Callable
+
+from fastapi import FastAPI, Request, UploadFile, File, Form, HTTPException
+from fastapi.responses import PlainTextResponse
+
+# (system message, user prompt) -> completion text
+Responder = Callable[[str, str], str]
+
+
+def default_responder(system_message: str, prompt: str) -> str:
+    """JSON with the fields of every LLMService output, derived from the prompt."""
+    digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]
+    return json.dumps({
+        "rewritten_title": f"Bản tin bảo hiểm {digest}",
+        "lead_paragraph": "Thị trường bảo hiểm ghi nhận diễn biến mới.",
+        "analysis_section": "<p>Phân tích.</p>",
+        "impact_section": "<p>Tác động.</p>",
+        "conclusion": "Kết luận.",
+        "meta_description": f"Tóm tắt {digest}",
+        "tags": ["bảo hiểm"],
+        "policy_brief_title": f"[Mới] Văn bản {digest}",
+        "executive_summary": f"Tóm tắt văn bản {digest}",
+        "meta_title": f"Bản tin bảo hiểm {digest}",
+        "keywords": ["bảo hiểm"],
+    }, ensure_ascii=False)
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def create_stub_app(responder: Optional[Responder] = None, polls: int = 1) -> FastAPI:
+    """
+    Build a stub API server.
+
+    Args:
+        responder: Produces each completion (default: `default_responder`)
+        polls: Status checks a batch reports 'in progress' before finishing
+    """
+    respond = responder or default_responder
+    app = FastAPI(title="LLM API stub")
+    files: Dict[str, bytes] = {}
+    batches: Dict[str, Dict[str, Any]] = {}
+    pending_polls: Dict[str, int] = {}
+    results: Dict[str, str] = {}
+
+    def chat_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = body['messages']
+        system = next((m['content'] for m in messages if m['role'] == 'system'), '')
+        prompt = messages[-1]['content']
+        text = respond(system, prompt)
+        return {
+            'id': f'chatcmpl-{uuid.uuid4().hex[:12]}', 'object': 'chat.completion', 'created': int(time.time()),
+            'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': text}}],
+            'usage': {'prompt_tokens': _tokens(system + prompt), 'completion_tokens': _tokens(text),
+                      'total_tokens': _tokens(system + prompt) + _tokens(text)},
+        }
+
+    def message(params: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = params['messages'][-1]['content']
+        text = respond(params.get('system') or '', prompt)
+        return {
+            'id': f'msg_{uuid.uuid4().hex[:12]}', 'type': 'message', 'role': 'assistant', 'model': params['model'],
+            'content': [{'type': 'text', 'text': text}], 'stop_reason': 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': _tokens(prompt), 'output_tokens': _tokens(text)},
+        }
+
+    def advance(batch_id: str):
+        """Count a status check; finish the batch once `polls` checks have been made."""
+        if batch_id not in batches:
+            raise HTTPException(404, f"No batch {batch_id}")
+        if pending_polls[batch_id] > 0:
+            pending_polls[batch_id] -= 1
+            return
+        batch = batches[batch_id]
+        if batch.get('processing_status') in ('in_progress', 'canceling'):
+            batch['processing_status'] = 'ended'
+        elif batch.get('status') in ('validating', 'in_progress'):
+            batch['status'] = 'completed'
+
+    # --- OpenAI --------------------------------------------------------
+
+    @app.post('/v1/chat/completions')
+    async def create_chat_completion(request: Request):
+        return chat_completion(await request.json())
+
+    @app.post('/v1/files')
+    async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)):
+        file_id = f'file-{uuid.uuid4().hex[:12]}'
+        files[file_id] = await file.read()
+        return {'id': file_id, 'object': 'file', 'purpose': purpose, 'bytes': len(files[file_id])}
+
+    @app.get('/v1/files/{file_id}/content')
+    async def file_content(file_id: str):
+        if file_id not in files:
+            raise HTTPException(404, f"No file {file_id}")
+        return PlainTextResponse(files[file_id].decode('utf-8'))
+
+    @app.post('/v1/batches')
+    async def create_batch(request: Request):
+        body = await request.json()
+        lines = [json.loads(line) for line in files[body['input_file_id']].decode('utf-8').splitlines() if line]
+        output = []
+        for line in lines:
+            try:
+                status, response = 200, chat_completion(line['body'])
+            except Exception as e:
+                status, response = 500, {'error': {'message': str(e), 'type': 'server_error'}}
+            output.append({
+                'id': f'batch_req_{uuid.uuid4().hex[:12]}', 'custom_id': line['custom_id'], 'error': None,
+                'response': {'status_code': status, 'request_id': uuid.uuid4().hex, 'body': response},
+            })
+        output_id = f'file-{uuid.uuid4().hex[:12]}'
+        files[output_id] = '\n'.join(json.dumps(item, ensure_ascii=False) for item in output).encode('utf-8')
+
+        batch_id = f'batch_{uuid.uuid4().hex[:12]}'
+        batches[batch_id] = {
+            'id': batch_id, 'object': 'batch', 'endpoint': body['endpoint'], 'status': 'validating',
+            'input_file_id': body['input_file_id'], 'output_file_id': output_id, 'error_file_id': None,
+            'request_counts': {
+                'total': len(lines),
+                'completed': sum(item['response']['status_code'] == 200 for item in output),
+                'failed': sum(item['response']['status_code'] != 200 for item in output),
+            },
+        }
+        pending_polls[batch_id] = polls
+        return batches[batch_id]
+
+    @app.get('/v1/batches/{batch_id}')
+    async def get_batch(batch_id: str):
+        advance(batch_id)
+        return batches[batch_id]
+
+    @app.post('/v1/batches/{batch_id}/cancel')
+    async def cancel_batch(batch_id: str):
+        batches[batch_id]['status'] = 'cancelled'
+        return batches[batch_id]
+
+    # --- Anthropic -----------------------------------------------------
+
+    @app.post('/v1/messages')
+    async def create_message(request: Request):
+        return message(await request.json())
+
+    @app.post('/v1/messages/batches')
+    async def create_message_batch(request: Request):
+        body = await request.json()
+        batch_id = f'msgbatch_{uuid.uuid4().hex[:12]}'
+        items: List[Dict[str, Any]] = []
+        for item in body['requests']:
+            try:
+                result = {'type': 'succeeded', 'message': message(item['params'])}
+            except Exception as e:
+                result = {'type': 'errored', 'error': {'type': 'api_error', 'message': str(e)}}
+            items.append({'custom_id': item['custom_id'], 'result': result})
+        results[batch_id] = '\n'.join(json.dumps(item, ensure_ascii=False) for item in items)
+        batches[batch_id] = {
+            'id': batch_id, 'type': 'message_batch', 'processing_status': 'in_progress',
+            'request_counts': {
+                'processing': 0,
+                'succeeded': sum(item['result']['type'] == 'succeeded' for item in items),
+                'errored': sum(item['result']['type'] == 'errored' for item in items),
+                'canceled': 0,
+                'expired': 0,
+            },
+            'results_url': str(request.url_for('message_batch_results', batch_id=batch_id)),
+        }
+        pending_polls[batch_id] = polls
+        return {**batches[batch_id], 'results_url': None}
+
+    @app.get('/v1/messages/batches/{batch_id}')
+    async def get_message_batch(batch_id: str):
+        advance(batch_id)
+        batch = batches[batch_id]
+        return batch if batch['processing_status'] == 'ended' else {**batch, 'results_url': None}
+
+    @app.post('/v1/messages/batches/{batch_id}/cancel')
+    async def cancel_message_batch(batch_id: str):
+        batches[batch_id]['processing_status'] = 'canceling'
+        return batches[batch_id]
+
+    @app.get('/v1/messages/batches/{batch_id}/results', name='message_batch_results')
+    async def message_batch_results(batch_id: str):
+        return PlainTextResponse(results[batch_id], media_type='application/x-jsonl')
+
+    return app
+
+
+app = create_stub_app()
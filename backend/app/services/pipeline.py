@@ -0,0 +1,209 @@
+"""
+Concurrent crawl pipeline - stages joined by bounded queues.
+
+A source stage drains an async iterator (e.g. `crawl_stream()`) into a
+queue; worker stages pull from their input queue, call an async function
+per item and optionally push the result on to the next stage. Queues are
+bounded, so a slow stage pauses the ones feeding it. All worker calls
+share one semaphore, the global concurrency budget, so LLM and database
+load stays bounded however many modules run at once.
+
+Cancelling `run()` (Ctrl-C) cancels every stage and closes the sources.
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, AsyncGenerator, Callable, Awaitable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a queue's input, one per consuming worker
+_END = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput counters of one stage."""
+    name: str
+    workers: int = 1
+    items_in: int = 0
+    items_out: int = 0         # Items passed on (worker result not None/False)
+    errors: int = 0
+    busy_seconds: float = 0.0  # Time spent inside the stage function, summed over workers
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = self.elapsed
+        return {
+            'workers': self.workers,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'errors': self.errors,
+            'seconds': round(elapsed, 2),
+            'items_per_second': round(self.items_in / elapsed, 2) if elapsed else 0.0,
+            'busy_seconds': round(self.busy_seconds, 2),
+        }
+
+
+@dataclass
+class _Stage:
+    stats: StageStats
+    source: Optional[AsyncGenerator[Any, None]] = None
+    func: Optional[Callable[[Any], Awaitable[Any]]] = None
+    inbox: Optional[asyncio.Queue] = None
+    outbox: Optional[asyncio.Queue] = None
+    budgeted: bool = True              # Calls count against the global budget
+    consumers: int = 0                 # Workers of the stage reading `outbox`
+    tasks: List[asyncio.Task] = field(default_factory=list)
+
+
+class CrawlPipeline:
+    """Supervisor running source and worker stages concurrently."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, queue_size: Optional[int] = None):
+        self.max_concurrency = max_concurrency or settings.PIPELINE_MAX_CONCURRENCY
+        self.queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.stages: List[_Stage] = []
+        self._budget: Optional[asyncio.Semaphore] = None
+
+    def _new_queue(self) -> asyncio.Queue:
+        return asyncio.Queue(maxsize=self.queue_size)
+
+    def stats(self, name: str) -> StageStats:
+        return next(stage.stats for stage in self.stages if stage.stats.name == name)
+
+    def add_source(self, name: str, source: AsyncGenerator[Any, None]) -> asyncio.Queue:
+        """Add a stage draining `source`; returns the queue it fills."""
+        stage = _Stage(StageStats(name), source=source, outbox=self._new_queue())
+        self.stages.append(stage)
+        return stage.outbox
+
+    def add_stage(
+        self,
+        name: str,
+        inbox: asyncio.Queue,
+        func: Callable[[Any], Awaitable[Any]],
+        workers: Optional[int] = None,
+        emit: bool = False,
+        budgeted: bool = True
+    ) -> Optional[asyncio.Queue]:
+        """
+        Add a worker stage reading `inbox`.
+
+        Args:
+            name: Stage name used in the report
+            inbox: Queue returned by `add_source` or an earlier `add_stage(emit=True)`
+            func: Called once per item, under the global concurrency budget
+            workers: Concurrent calls of `func` in this stage
+            emit: Pass non-None results on to a new queue (returned)
+            budgeted: False for stages already bounded elsewhere (e.g. HTTP
+                fetches, limited per host by the politeness scheduler)
+        """
+        workers = workers or settings.PIPELINE_WORKERS
+        stage = _Stage(
+            StageStats(name, workers=workers),
+            func=func,
+            inbox=inbox,
+            outbox=self._new_queue() if emit else None,
+            budgeted=budgeted
+        )
+        for upstream in self.stages:
+            if upstream.outbox is inbox:
+                upstream.consumers += workers
+        self.stages.append(stage)
+        return stage.outbox
+
+    async def _run_source(self, stage: _Stage):
+        stats = stage.stats
+        stats.started_at = time.perf_counter()
+        try:
+            async for item in stage.source:
+                stats.items_in += 1
+                stats.items_out += 1
+                await stage.outbox.put(item)
+        except Exception as e:
+            stats.errors += 1
+            logger.error(f"Pipeline source {stats.name} failed: {e}")
+        finally:
+            await stage.source.aclose()
+            stats.finished_at = time.perf_counter()
+        await self._close_outbox(stage)
+
+    async def _run_worker(self, stage: _Stage):
+        stats = stage.stats
+        while True:
+            item = await stage.inbox.get()
+            if item is _END:
+                return
+            stats.items_in += 1
+
+            async with self._budget if stage.budgeted else nullcontext():
+                started = time.perf_counter()
+                try:
+                    result = await stage.func(item)
+                except Exception as e:
+                    stats.errors += 1
+                    logger.error(f"Pipeline stage {stats.name} failed on an item: {e}")
+                    result = None
+                finally:
+                    stats.busy_seconds += time.perf_counter() - started
+
+            if result is not None and result is not False:
+                stats.items_out += 1
+                if stage.outbox is not None:
+                    await stage.outbox.put(result)
+
+    async def _run_workers(self, stage: _Stage):
+        stage.stats.started_at = time.perf_counter()
+        try:
+            await asyncio.gather(*(self._run_worker(stage) for _ in range(stage.stats.workers)))
+        finally:
+            stage.stats.finished_at = time.perf_counter()
+        await self._close_outbox(stage)
+
+    async def _close_outbox(self, stage: _Stage):
+        if stage.outbox is not None:
+            for _ in range(stage.consumers):
+                await stage.outbox.put(_END)
+
+    async def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run every stage until all sources are exhausted and all queues drained.
+
+        Returns:
+            Per-stage throughput report, keyed by stage name
+        """
+        self._budget = asyncio.Semaphore(self.max_concurrency)
+
+        for stage in self.stages:
+            runner = self._run_source(stage) if stage.source is not None else self._run_workers(stage)
+            stage.tasks.append(asyncio.create_task(runner, name=stage.stats.name))
+
+        tasks = [task for stage in self.stages for task in stage.tasks]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            logger.warning("Pipeline cancelled, stopping all stages...")
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return self.report()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage throughput (also available after a cancelled run)."""
+        return {stage.stats.name: stage.stats.summary() for stage in self.stages}
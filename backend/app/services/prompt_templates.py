@@ -3,9 +3,11 @@ AI Content Engine - Prompt Templates for Insurance Journalism
 System prompts and task-specific templates for processing crawled data.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from pydantic import BaseModel, Field, model_validator
+
 
 class InsuranceJournalistPrompts:
     """
@@ -16,6 +18,10 @@ class InsuranceJournalistPrompts:
     Mission: Clarify complex legal/insurance terms for the general public
     """
     
+    # Bump when a template or its expected JSON output changes:
+    # cached LLM responses are keyed on it (see llm_cache.py)
+    VERSION = "3"
+    
     # =========================================================================
     # SYSTEM PROMPT - The AI's Core Identity
     # =========================================================================
@@ -130,6 +136,12 @@ BẮT BUỘC thêm đoạn disclaimer này:
 - Tóm tắt 1 câu
 - Hoặc câu hỏi mở (thought-provoking question)
 
+**5. SEO METADATA (cho bài viết MỚI, không phải bài gốc)**
+- meta_title: 55-60 ký tự, chứa từ khóa chính
+- meta_description: 150-160 ký tự, hấp dẫn, tóm tắt nội dung
+- keywords: 3-5 từ khóa tìm kiếm chính
+- og_title / og_description: phiên bản chia sẻ mạng xã hội
+
 ---
 
 **OUTPUT FORMAT (JSON):**
@@ -141,7 +153,11 @@ BẮT BUỘC thêm đoạn disclaimer này:
     "impact_section": "Phần tác động đến người dùng (HTML)",
     "disclaimer": "Disclaimer nếu cần (hoặc null nếu không cần)",
     "conclusion": "Câu kết",
+    "meta_title": "Tiêu đề SEO (55-60 ký tự)",
     "meta_description": "Mô tả SEO (150-160 ký tự)",
+    "keywords": ["từ khóa 1", "từ khóa 2", "từ khóa 3"],
+    "og_title": "Tiêu đề chia sẻ mạng xã hội",
+    "og_description": "Mô tả chia sẻ mạng xã hội",
     "tags": ["tag1", "tag2", "tag3"],
     "estimated_reading_time": 5
 }}
@@ -170,7 +186,8 @@ BẮT BUỘC thêm đoạn disclaimer này:
         doc_content: str,
         issue_date: str,
         effective_date: str = None,
-        issuing_body: str = None
+        issuing_body: str = None,
+        parts: int = 0
     ) -> Dict[str, str]:
         """
         Generate prompt for summarizing legal documents.
@@ -183,11 +200,21 @@ BẮT BUỘC thêm đoạn disclaimer này:
             issue_date: Date issued
             effective_date: Date takes effect
             issuing_body: Issuing authority
+            parts: For texts too long for one prompt, the number of parts
+                `doc_content` holds notes on (see get_legal_notes_prompt)
             
         Returns:
             Dictionary with system_prompt and user_prompt
         """
         
+        if parts:
+            content_heading = (
+                f"**Ghi chú nội dung theo từng phần** (văn bản dài, đã được tóm lược "
+                f"thành {parts} phần theo thứ tự Chương/Điều):"
+            )
+        else:
+            content_heading = "**Nội dung đầy đủ:**"
+        
         user_prompt = f"""**NHIỆM VỤ: TÓM TẮT VĂN BẢN PHÁP LUẬT BẢO HIỂM**
 
 **Input - Văn bản pháp luật từ Thư viện Pháp luật:**
@@ -201,8 +228,8 @@ BẮT BUỘC thêm đoạn disclaimer này:
 **Tên văn bản:**
 {doc_title}
 
-**Nội dung đầy đủ:**
-{doc_content[:8000]}  # Limit to avoid token overflow
+{content_heading}
+{doc_content}
 
 ---
 
@@ -211,7 +238,7 @@ BẮT BUỘC thêm đoạn disclaimer này:
 Tạo một bản tin ngắn gọn, dễ hiểu cho độc giả không chuyên pháp luật, theo cấu trúc sau:
 
 **1. TIÊU ĐỀ**
-Format: `[Mới] {doc_type} {doc_number}: {Tóm tắt nội dung chính}`
+Format: `[Mới] {doc_type} {doc_number}: {{Tóm tắt nội dung chính}}`
 
 Ví dụ: "[Mới] Thông tư 08/2024/TT-BTC: Quy định hoa hồng bảo hiểm tối đa 30%"
 
@@ -333,6 +360,61 @@ Cho từng đối tượng, cung cấp lời khuyên cụ thể:
             "user_prompt": user_prompt
         }
     
+    @staticmethod
+    def get_legal_notes_prompt(
+        doc_number: str,
+        doc_type: str,
+        doc_title: str,
+        section_text: str,
+        part: int,
+        parts: int,
+        max_points: int = 12
+    ) -> Dict[str, str]:
+        """
+        Generate prompt for taking notes on one part of a long legal document.
+        
+        The notes of all parts replace the full text in the legal summary
+        prompt (map-reduce over documents too long for one prompt).
+        
+        Args:
+            doc_number: Document number (e.g., "52/2024/NĐ-CP")
+            doc_type: Type (Nghị định, Thông tư, Công văn, etc.)
+            doc_title: Full official title
+            section_text: Consecutive chapters/articles of the document
+            part: Position of this part (1-based)
+            parts: Number of parts the document was split into
+            max_points: Most bullet points to write
+            
+        Returns:
+            Dictionary with system_prompt and user_prompt
+        """
+        
+        user_prompt = f"""**NHIỆM VỤ: GHI CHÚ MỘT PHẦN CỦA VĂN BẢN PHÁP LUẬT**
+
+Văn bản {doc_type} {doc_number} - "{doc_title}" quá dài để xử lý một lần nên được chia theo Chương/Điều.
+Dưới đây là phần {part}/{parts}.
+
+**Nội dung phần {part}/{parts}:**
+{section_text}
+
+---
+
+**Yêu cầu:**
+Ghi chú tối đa {max_points} gạch đầu dòng về những quy định quan trọng nhất của phần này:
+- Quy định mới, nghĩa vụ, quyền lợi, mức phí, tỷ lệ, mức phạt (giữ nguyên con số)
+- Đối tượng áp dụng (người mua bảo hiểm, đại lý/môi giới, công ty bảo hiểm)
+- Ngày hiệu lực, thời hạn chuyển tiếp, văn bản được thay thế hoặc hướng dẫn
+- Ghi số Điều ở đầu mỗi gạch đầu dòng, ví dụ: "- Điều 12: ..."
+
+Chỉ ghi những gì có trong phần này, không suy đoán nội dung các phần khác.
+Trả về văn bản thuần (không JSON), không lời mở đầu hay kết luận.
+"""
+        
+        return {
+            "system_prompt": InsuranceJournalistPrompts.SYSTEM_PROMPT,
+            "user_prompt": user_prompt
+        }
+    
     # =========================================================================
     # ADDITIONAL UTILITY PROMPTS
     # =========================================================================
@@ -441,6 +523,41 @@ class PromptExamples:
         return prompts
 
 
+# =============================================================================
+# OUTPUT SCHEMAS
+# =============================================================================
+
+class NewsRewriteOutput(BaseModel):
+    """
+    JSON output of `get_news_rewrite_prompt`: the rewritten article and its
+    SEO metadata. Missing SEO fields are derived from the article.
+    """
+    
+    rewritten_title: str = Field(..., min_length=1)
+    lead_paragraph: str = Field(..., min_length=1)
+    analysis_section: str
+    impact_section: str
+    disclaimer: Optional[str] = None
+    conclusion: str = ""
+    
+    meta_title: Optional[str] = None
+    meta_description: str = ""
+    keywords: List[str] = Field(default_factory=list)
+    og_title: Optional[str] = None
+    og_description: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+    estimated_reading_time: int = 5
+    
+    @model_validator(mode="after")
+    def fill_seo_defaults(self) -> "NewsRewriteOutput":
+        self.meta_title = self.meta_title or self.rewritten_title[:60]
+        self.meta_description = self.meta_description or self.lead_paragraph[:160]
+        self.og_title = self.og_title or self.meta_title
+        self.og_description = self.og_description or self.meta_description
+        self.keywords = self.keywords or self.tags
+        return self
+
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -453,9 +570,13 @@ class AIContentEngineConfig:
     FALLBACK_MODEL = "gpt-4o-mini"
     
     # Token limits
-    MAX_INPUT_TOKENS = 8000
+    MAX_INPUT_TOKENS = 8000  # Per prompt (system + user); longer inputs are truncated
     MAX_OUTPUT_TOKENS = 4000
     
+    # Legal documents over MAX_INPUT_TOKENS: notes per part, then one summary of the notes
+    LEGAL_NOTES_MAX_TOKENS = 800
+    LEGAL_NOTES_MIN_TOKENS = 150
+    
     # Temperature settings (0-1)
     TEMPERATURE_NEWS = 0.7  # More creative for news
     TEMPERATURE_LEGAL = 0.3  # More conservative for legal docs
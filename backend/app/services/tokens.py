@@ -0,0 +1,180 @@
+"""
+Token counting and budgeting for LLM prompts.
+
+Prompts are measured with the model's tiktoken encoding so that variable
+inputs (article bodies, legal texts) can be cut to what fits
+AIContentEngineConfig.MAX_INPUT_TOKENS instead of overflowing the context
+window. Without tiktoken, or when its encoding files can't be fetched
+(offline machines), counts fall back to an estimate from the UTF-8 length
+that errs on the high side - Vietnamese with diacritics runs at about one
+token per 2-3 bytes - so budgets stay safe.
+
+Legal texts too long for one prompt are split along their own structure:
+Chương (chapter) headings first, then Điều (article), then paragraphs.
+Crawled documents are stored as HTML, so they are reduced to plain text
+(one block per line) first.
+"""
+
+import re
+import html
+import math
+import logging
+import unicodedata
+from functools import lru_cache
+from typing import List, Pattern
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Fallback estimate: one token per this many UTF-8 bytes
+BYTES_PER_TOKEN = 3
+
+# Split points, coarsest first. Headings at line starts: "Chương II", "CHƯƠNG 3",
+# "Điều 5.", "Điều 12a:"; then "Điều N." inside run-on text (pages extracted
+# without line breaks), then line breaks, then sentence ends.
+LEGAL_BOUNDARIES: List[Pattern] = [
+    re.compile(r'^[ \t]*(?:Chương|CHƯƠNG)[ \t]+[IVXLCDM\d]+\b', re.M),
+    re.compile(r'^[ \t]*Điều[ \t]+\d+[a-zđ]?[ \t]*[.:]', re.M),
+    re.compile(r'(?<=\s)Điều \d+[a-zđ]?\s*[.:]'),
+    re.compile(r'(?<=\n)(?=\S)'),
+    re.compile(r'(?<=[.;:])\s+(?=\S)'),
+]
+
+# Tags and comments in stored documents; block tags become line breaks
+HTML_MARKUP = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)\b[^>]*>|<!--.*?-->', re.S)
+BLOCK_TAGS = {
+    'address', 'article', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'li', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+}
+
+
+class TokenCounter:
+    """Counts and truncates text in the tokens of one model."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.encoding = self._load_encoding(model) if TIKTOKEN_AVAILABLE else None
+
+    @staticmethod
+    def _load_encoding(model: str):
+        """The model's encoding, cl100k_base for models tiktoken doesn't know (Claude, newer GPTs)."""
+        try:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                return tiktoken.get_encoding('cl100k_base')
+        except Exception as e:
+            logger.warning(f"tiktoken encoding for {model} unavailable ({e}), estimating token counts")
+            return None
+
+    def count(self, text: str) -> int:
+        """Tokens in `text`."""
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text.encode('utf-8')) / BYTES_PER_TOKEN)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of `text` within `max_tokens`, ending at a word boundary where possible."""
+        if self.count(text) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ''
+
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            head = self.encoding.decode_bytes(tokens[:max_tokens]).decode('utf-8', errors='ignore')
+        else:
+            head = text.encode('utf-8')[:max_tokens * BYTES_PER_TOKEN].decode('utf-8', errors='ignore')
+
+        # Don't end on half a word, unless that would drop most of the text
+        cut = head.rstrip().rfind(' ')
+        if cut > len(head) // 2:
+            head = head[:cut + 1]
+        return head
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model: str) -> TokenCounter:
+    """Shared counter per model (loading an encoding is slow)."""
+    return TokenCounter(model)
+
+
+def legal_text(content: str) -> str:
+    """
+    Plain text of a legal document stored as HTML (`content_full` is
+    sanitized markup), one block per line so that Chương/Điều headings
+    start lines. Text without markup is returned unchanged.
+    """
+    if not content or not HTML_MARKUP.search(content):
+        return content or ''
+
+    def replace(match: re.Match) -> str:
+        tag = match.group(2)
+        return '\n' if tag and tag.lower() in BLOCK_TAGS else ''
+
+    text = html.unescape(HTML_MARKUP.sub(replace, content))
+    lines = (' '.join(line.split()) for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def split_legal_text(text: str, max_tokens: int, counter: TokenCounter) -> List[str]:
+    """
+    Split a legal text into consecutive chunks of at most `max_tokens`.
+
+    Each chunk is a run of whole chapters where they fit, otherwise of
+    whole articles, paragraphs or sentences; a single sentence over the
+    budget is cut at it.
+
+    Args:
+        text: Legal document text
+        max_tokens: Token budget per chunk
+        counter: Token counter of the model the chunks are for
+
+    Returns:
+        Chunks in document order
+    """
+    text = unicodedata.normalize('NFC', text).strip()
+    pieces = _split(text, max_tokens, counter, 0)
+
+    chunks: List[str] = []
+    current, current_tokens = '', 0
+    for piece in pieces:
+        tokens = counter.count(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(current.strip())
+            current, current_tokens = '', 0
+        current += piece
+        current_tokens += tokens
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+def _split(text: str, max_tokens: int, counter: TokenCounter, level: int) -> List[str]:
+    """Pieces of `text` within `max_tokens`, split at the coarsest boundary present."""
+    if counter.count(text) <= max_tokens:
+        return [text]
+
+    for depth in range(level, len(LEGAL_BOUNDARIES)):
+        starts = [m.start() for m in LEGAL_BOUNDARIES[depth].finditer(text) if m.start() > 0]
+        if starts:
+            bounds = [0] + starts + [len(text)]
+            return [
+                piece
+                for start, end in zip(bounds, bounds[1:])
+                for piece in _split(text[start:end], max_tokens, counter, depth + 1)
+            ]
+
+    pieces = []
+    while text:
+        head = counter.truncate(text, max_tokens) or text[:1]
+        pieces.append(head)
+        text = text[len(head):]
+    return pieces
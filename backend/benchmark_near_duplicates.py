@@ -0,0 +1,88 @@
+"""
+Benchmark near-duplicate lookups in a large MinHash-LSH index.
+
+Writes an index file of random signatures (what the news index holds
+after a few years of crawling), then times `find` for one near copy of
+a stored signature followed by random, unmatched ones.
+
+    python benchmark_near_duplicates.py
+    python benchmark_near_duplicates.py --articles 1000000 --lookups 5000
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.near_duplicates import NearDuplicateIndex, RECORD_DTYPE, NUM_PERM
+
+
+def write_index_file(path: str, size: int, seed: int = 7) -> np.ndarray:
+    """`size` records of random signatures with ids b'000000000000'...; returns them."""
+    rng = np.random.default_rng(seed)
+    records = np.empty(size, dtype=RECORD_DTYPE)
+    records['article'] = [b"%012d" % i for i in range(size)]
+    records['signature'] = rng.integers(0, 2**32, size=(size, NUM_PERM), dtype=np.uint32)
+    records.tofile(path)
+    return records
+
+
+def near_copy_queries(records: np.ndarray, lookups: int, seed: int = 7) -> Tuple[int, List[np.ndarray]]:
+    """
+    A near copy of one stored signature (8/64 values changed, ~0.875
+    similarity) followed by `lookups - 1` random signatures.
+
+    Returns:
+        (position of the copied record, queries)
+    """
+    rng = np.random.default_rng(seed + 1)
+    position = len(records) // 2
+    near_copy = np.array(records['signature'][position])
+    near_copy[:8] += 1
+    random_queries = [rng.integers(0, 2**32, size=NUM_PERM, dtype=np.uint32) for _ in range(lookups - 1)]
+    return position, [near_copy] + random_queries
+
+
+def run_benchmark(articles: int, lookups: int) -> Dict[str, float]:
+    """Index load time and microseconds per lookup."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "news_minhash.bin")
+        records = write_index_file(path, articles)
+        position, queries = near_copy_queries(records, lookups)
+
+        start = time.perf_counter()
+        index = NearDuplicateIndex(path, threshold=0.7)
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [index.find(query) for query in queries]
+        lookup_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        assert results[0] == b"%012d" % position and not any(results[1:])
+        del index
+
+    return {'articles': articles, 'load_seconds': load_seconds, 'lookup_us': lookup_us}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark near-duplicate index lookups')
+    parser.add_argument('--articles', type=int, default=300_000, help='Stored signatures (default: 300000)')
+    parser.add_argument('--lookups', type=int, default=1000, help='Lookups timed (default: 1000)')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.articles, args.lookups)
+    print(f"{result['articles']} articles: index loaded in {result['load_seconds']:.2f}s, "
+          f"lookup {result['lookup_us']:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
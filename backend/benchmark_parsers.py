@@ -0,0 +1,309 @@
+"""
+Benchmark the crawler parsers against recorded HTML fixtures (no network access).
+
+Each benchmark parses one page from fixtures/parsers/ - raw UTF-8 bytes
+in, as the fetch layer hands them over, parsed items out, tree
+construction included - and reports items per
+second, milliseconds per page and peak memory. Results are compared with
+fixtures/parsers/baseline.json: a benchmark that loses more than
+--tolerance of its throughput, gains as much peak memory, or returns fewer
+items fails the run. Baselines are machine-specific; save one before
+changing a parser and compare after.
+
+Every benchmark runs on the BeautifulSoup reference path and on the
+compiled-extractor backends (CRAWLER_PARSER_BACKEND), with the speedup
+over BeautifulSoup alongside. Peak memory counts Python allocations
+(tracemalloc) only, so it leaves out trees lxml / selectolax build in C.
+
+    python benchmark_parsers.py
+    python benchmark_parsers.py --only tvpl --rounds 50 --backend bs4 --backend lxml
+    python benchmark_parsers.py --save-baseline
+    python benchmark_parsers.py --record        # refresh fixtures from the page archive
+"""
+
+import sys
+import json
+import time
+import statistics
+import tracemalloc
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, NamedTuple
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.urls import canonicalize_url
+from app.crawlers.reparse import classify, NEWS_LISTING, NEWS_ARTICLE, LEGAL_SEARCH, LEGAL_DOCUMENT
+from app.crawlers.html_backend import HTMLBackend, get_html_backend, BS4, LXML, SELECTOLAX, SELECTOLAX_AVAILABLE
+from app.core.config import settings
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures' / 'parsers'
+BASELINE_PATH = FIXTURE_DIR / 'baseline.json'
+
+# Allowed slowdown / memory growth before a benchmark counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Listing pages of the legacy NewsCrawler sources (recorded as news_<source>.html)
+LEGACY_URLS = {
+    'vnexpress': settings.VNEXPRESS_URL,
+    'cafef': settings.CAFEF_URL,
+    'vneconomy': settings.VNECONOMY_URL,
+    'baodautu': settings.BAODAUTU_URL,
+    'dantri': settings.DANTRI_URL,
+}
+
+
+class Benchmark(NamedTuple):
+    """One parser run over one fixture; `parse` maps raw HTML and a backend to items."""
+    name: str
+    fixture: str
+    parse: Callable[[bytes, Optional[HTMLBackend]], List[Any]]
+    bs4_only: bool = False  # Parser only takes BeautifulSoup trees
+
+
+@lru_cache(maxsize=None)
+def _crawlers() -> Dict[str, Any]:
+    from app.crawlers.news_crawler import NewsCrawler
+    from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+    from app.crawlers.tvpl_crawler_advanced import TVPLAdvancedCrawler
+
+    return {
+        'news': NewsAggregatorAdvanced(use_playwright=False),
+        'legacy': NewsCrawler(),
+        'tvpl': TVPLAdvancedCrawler(use_playwright=False),
+    }
+
+
+def _document(body: bytes, backend: Optional[HTMLBackend]) -> Any:
+    """Parsed page: a backend document, or BeautifulSoup for the reference path."""
+    return backend.parse(body, 'utf-8') if backend else BeautifulSoup(body, 'lxml', from_encoding='utf-8')
+
+
+def _news_listing(source: str) -> Callable[[bytes, Optional[HTMLBackend]], List[Any]]:
+    def parse(body: bytes, backend: Optional[HTMLBackend]) -> List[Any]:
+        crawler = _crawlers()['news']
+        return crawler._parse_source_articles(_document(body, backend), source, crawler.NEWS_SOURCES[source])
+    return parse
+
+
+def _legacy_listing(source: str) -> Callable[[bytes, Optional[HTMLBackend]], List[Any]]:
+    def parse(body: bytes, backend: Optional[HTMLBackend]) -> List[Any]:
+        crawler = _crawlers()['legacy']
+        return crawler.sources[source]['parser'](_document(body, None), 1000)
+    return parse
+
+
+def _news_article(source: str) -> Callable[[bytes, Optional[HTMLBackend]], List[Any]]:
+    def parse(body: bytes, backend: Optional[HTMLBackend]) -> List[Any]:
+        content = _crawlers()['news']._extract_article_content(_document(body, backend), source)
+        return [content] if content else []
+    return parse
+
+
+def _tvpl_search(body: bytes, backend: Optional[HTMLBackend]) -> List[Any]:
+    return _crawlers()['tvpl'].parse_search_results(_document(body, backend))
+
+
+def _tvpl_document(body: bytes, backend: Optional[HTMLBackend]) -> List[Any]:
+    fields = _crawlers()['tvpl']._extract_document_fields(_document(body, backend), settings.TVPL_BASE_URL)
+    return [fields] if fields.get('content_full') else []
+
+
+def _clean_html(body: bytes, backend: Optional[HTMLBackend]) -> List[Any]:
+    crawler = _crawlers()['news']
+    if backend:
+        return [crawler.sanitize_element(backend.parse(body, 'utf-8'))]
+    return [crawler.clean_html_content(body.decode('utf-8'))]
+
+
+def build_benchmarks() -> List[Benchmark]:
+    """Every benchmark, in report order."""
+    from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+
+    benchmarks = [
+        Benchmark(f'news.{source}', f'news_{source}.html', _news_listing(source))
+        for source in NewsAggregatorAdvanced.NEWS_SOURCES
+    ]
+    benchmarks += [
+        Benchmark(f'legacy.{source}', f'news_{source}.html', _legacy_listing(source), bs4_only=True)
+        for source in LEGACY_URLS
+    ]
+    benchmarks += [
+        Benchmark('article.vnexpress', 'article_vnexpress.html', _news_article('vnexpress')),
+        Benchmark('article.cafef', 'article_cafef.html', _news_article('cafef')),
+        Benchmark('clean_html', 'article_vnexpress.html', _clean_html),
+        Benchmark('tvpl.search', 'tvpl_search.html', _tvpl_search),
+        Benchmark('tvpl.document', 'tvpl_document.html', _tvpl_document),
+    ]
+    return benchmarks
+
+
+def result_key(benchmark: Benchmark, backend: Optional[HTMLBackend]) -> str:
+    """Baseline key: `<benchmark>@<backend>`."""
+    return f"{benchmark.name}@{backend.name if backend else BS4}"
+
+
+def load_fixture(name: str) -> bytes:
+    return (FIXTURE_DIR / name).read_bytes()
+
+
+def run_benchmark(benchmark: Benchmark, rounds: int = 20, backend: Optional[HTMLBackend] = None) -> Dict[str, Any]:
+    """
+    Time one benchmark on a parser backend (None: BeautifulSoup).
+
+    The median of `rounds` timed runs (after one warm-up run) gives the
+    time per page; peak memory comes from a separate traced run so that
+    tracemalloc does not slow down the timings.
+    """
+    body = load_fixture(benchmark.fixture)
+    items = len(benchmark.parse(body, backend))
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        benchmark.parse(body, backend)
+        timings.append(time.perf_counter() - started)
+    seconds = statistics.median(timings)
+
+    tracemalloc.start()
+    try:
+        benchmark.parse(body, backend)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'items': items,
+        'ms_per_page': round(seconds * 1000, 3),
+        'items_per_second': round(items / seconds, 1) if seconds else 0.0,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = DEFAULT_TOLERANCE
+) -> List[str]:
+    """Regressions of `results` against `baseline`, one message each."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['items'] < base['items']:
+            regressions.append(f"{name}: {result['items']} items (baseline {base['items']})")
+        if result['items_per_second'] < base['items_per_second'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {result['items_per_second']:.0f} items/s (baseline {base['items_per_second']:.0f})"
+            )
+        if result['peak_kb'] > base['peak_kb'] * (1 + tolerance):
+            regressions.append(f"{name}: {result['peak_kb']:.0f} KB peak (baseline {base['peak_kb']:.0f})")
+    return regressions
+
+
+def fixture_for(url: str) -> Optional[str]:
+    """Fixture an archived page would replace, if any."""
+    kind, source = classify(url)
+    if kind == NEWS_LISTING:
+        return f'news_{source}.html'
+    if kind == NEWS_ARTICLE:
+        return f'article_{source}.html'
+    if kind == LEGAL_SEARCH:
+        return 'tvpl_search.html'
+    if kind == LEGAL_DOCUMENT:
+        return 'tvpl_document.html'
+    for source, listing_url in LEGACY_URLS.items():
+        if url == canonicalize_url(listing_url):
+            return f'news_{source}.html'
+    return None
+
+
+def record_fixtures(archive_dir: str) -> List[str]:
+    """Replace fixtures with the latest archived page of the same kind; returns the names written."""
+    from app.crawlers.page_archive import PageArchive, read_body
+
+    archive = PageArchive(archive_dir)
+    latest = {}
+    try:
+        for page in archive.pages():
+            name = fixture_for(page.url)
+            if name and (FIXTURE_DIR / name).exists():
+                latest[name] = page  # Pages come oldest first
+        for name, page in latest.items():
+            html = read_body(page).decode(page.encoding or 'utf-8', errors='replace')
+            (FIXTURE_DIR / name).write_text(html, encoding='utf-8')
+    finally:
+        archive.close()
+    return sorted(latest)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark crawler parsers on recorded fixtures')
+    parser.add_argument('--only', help='Only benchmarks whose name starts with this prefix')
+    parser.add_argument('--backend', choices=(BS4, LXML, SELECTOLAX), action='append',
+                        help='Parser backend to run (repeatable; default: bs4, lxml and selectolax if installed)')
+    parser.add_argument('--rounds', type=int, default=20, help='Timed runs per benchmark (default: 20)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed slowdown / memory growth (default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--record', action='store_true', help='Refresh fixtures from the page archive first')
+    parser.add_argument('--archive-dir', default=settings.CRAWLER_ARCHIVE_DIR,
+                        help=f'Archive directory for --record (default: {settings.CRAWLER_ARCHIVE_DIR})')
+    args = parser.parse_args()
+
+    if args.record:
+        written = record_fixtures(args.archive_dir)
+        print(f"Recorded {len(written)} fixtures: {', '.join(written) or '-'}")
+
+    backend_names = args.backend or [BS4, LXML] + ([SELECTOLAX] if SELECTOLAX_AVAILABLE else [])
+    backends = [get_html_backend(name) for name in backend_names]
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results = {}
+
+    print(f"{'benchmark':<28} {'items':>6} {'ms/page':>9} {'items/s':>10} {'peak KB':>9} {'vs bs4':>7} {'vs base':>8}")
+    print("-" * 83)
+    for benchmark in build_benchmarks():
+        if args.only and not benchmark.name.startswith(args.only):
+            continue
+        reference = None
+        for backend in backends:
+            if benchmark.bs4_only and backend:
+                continue
+            key = result_key(benchmark, backend)
+            result = results[key] = run_benchmark(benchmark, rounds=args.rounds, backend=backend)
+            if backend is None:
+                reference = result
+            base = baseline.get(key)
+            speedup = f"{reference['ms_per_page'] / result['ms_per_page']:.1f}x" if reference and backend else '-'
+            change = (
+                f"{result['items_per_second'] / base['items_per_second'] - 1:+.0%}"
+                if base and base['items_per_second'] else '-'
+            )
+            print(
+                f"{key:<28} {result['items']:>6} {result['ms_per_page']:>9.2f} "
+                f"{result['items_per_second']:>10.0f} {result['peak_kb']:>9.0f} {speedup:>7} {change:>8}"
+            )
+
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps({**baseline, **results}, indent=2, sort_keys=True) + '\n')
+        print(f"\n✓ Baseline saved to {BASELINE_PATH}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n✗ Regressions against the baseline:")
+        for message in regressions:
+            print(f"  - {message}")
+        sys.exit(1)
+    print("\n✓ No regressions" if baseline else "\nNo baseline yet - run with --save-baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Shared test helpers.
+
+Imported by pytest for every test module, and importable (`from conftest
+import ...`) by the test scripts run directly.
+"""
+
+import sys
+import json
+import time
+import asyncio
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+import httpx
+import openai
+import anthropic
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_service import LLMService, LLMProvider
+
+# Mock fetches must not end up in the developer's page archive (read by
+# reparse_archive.py and benchmark_parsers.py --record); archive tests
+# pass their own PageArchive.
+settings.CRAWLER_ARCHIVE_ENABLED = False
+
+
+class MockChatProvider:
+    """
+    Mock OpenAI Chat Completions / Anthropic Messages API for httpx.MockTransport.
+
+    Answers every request with `reply` (text, or a function of the prompt)
+    after `latency` seconds, reporting `usage` as (prompt, completion)
+    tokens. Records the request bodies, prompts and peak concurrency.
+    """
+
+    def __init__(
+        self,
+        reply: Union[str, Callable[[str], str]] = "",
+        latency: float = 0,
+        usage: Tuple[int, int] = (10, 10)
+    ):
+        self.reply = reply
+        self.latency = latency
+        self.usage = usage
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    @property
+    def calls(self) -> int:
+        return len(self.requests)
+
+    @property
+    def prompts(self):
+        return [body["messages"][-1]["content"] for body in self.requests]
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        prompt = body["messages"][-1]["content"]
+        text = self.reply(prompt) if callable(self.reply) else self.reply
+        prompt_tokens, completion_tokens = self.usage
+
+        if request.url.path.endswith("/messages"):
+            return httpx.Response(200, json={
+                "id": "msg_1", "type": "message", "role": "assistant", "model": "m",
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn", "stop_sequence": None,
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+            })
+        return httpx.Response(200, json={
+            "id": "c1", "object": "chat.completion", "created": 0, "model": "m",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    def respond_sync(self, request: httpx.Request) -> httpx.Response:
+        time.sleep(self.latency)
+        return self.respond(request)
+
+    async def respond_async(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return self.respond(request)
+
+    def service(
+        self,
+        provider: LLMProvider = LLMProvider.OPENAI,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[LLMResponseCache] = None
+    ) -> LLMService:
+        """LLMService whose sync and async clients talk to this mock (no response cache unless given)."""
+        llm = LLMService(provider=provider, max_concurrency=max_concurrency, cache=cache)
+        llm.cache = cache
+        sync_http = httpx.Client(transport=httpx.MockTransport(self.respond_sync))
+        async_http = httpx.AsyncClient(transport=httpx.MockTransport(self.respond_async))
+        if provider == LLMProvider.OPENAI:
+            llm.client = openai.OpenAI(api_key="test", http_client=sync_http)
+            llm.async_client = openai.AsyncOpenAI(api_key="test", http_client=async_http)
+        else:
+            llm.client = anthropic.Anthropic(api_key="test", http_client=sync_http)
+            llm.async_client = anthropic.AsyncAnthropic(api_key="test", http_client=async_http)
+        return llm
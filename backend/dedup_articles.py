@@ -0,0 +1,129 @@
+"""
+Merge articles stored under variants of the same URL, before the unique
+`source_url` index is built.
+
+Articles crawled before URL canonicalization may be stored once per URL
+spelling (tracking parameters, m. hosts, trailing slashes...). Creating
+the unique index over them fails, so run this once after upgrading:
+each group of articles sharing a canonical URL is reduced to one -
+published first, then rewritten, then the oldest - which takes the
+canonical `source_url` and keeps the other spellings in `duplicate_urls`.
+
+Works on the raw collection: initializing Beanie would try to build the
+index first. Once the collection is clean, the indexes are created.
+
+    python dedup_articles.py --dry-run
+    python dedup_articles.py
+"""
+
+import sys
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, NamedTuple
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.crawlers.urls import canonicalize_url
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+FIELDS = {'source_url': 1, 'duplicate_urls': 1, 'status': 1, 'processed_at': 1, 'created_at': 1}
+
+
+class Merge(NamedTuple):
+    """One canonical URL: the article kept, the ones removed and the URLs it takes over."""
+    keep: Any
+    canonical_url: str
+    remove: List[Any]
+    duplicate_urls: List[str]
+
+
+def _rank(article: Dict[str, Any]) -> tuple:
+    """Sort key: published, then rewritten, then oldest first."""
+    return (
+        article.get('status') != 'published',
+        article.get('processed_at') is None,
+        article.get('created_at') or datetime.max,
+    )
+
+
+def plan_merges(articles: List[Dict[str, Any]]) -> List[Merge]:
+    """
+    Merges needed for stored articles (`_id`, `source_url`, `duplicate_urls`,
+    `status`, `processed_at`, `created_at`), including single articles whose
+    `source_url` is not canonical yet.
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for article in articles:
+        groups.setdefault(canonicalize_url(article['source_url']), []).append(article)
+
+    merges = []
+    for canonical_url, group in groups.items():
+        group.sort(key=_rank)
+        keep, *remove = group
+
+        urls = []
+        for article in group:
+            for url in [article['source_url']] + list(article.get('duplicate_urls') or []):
+                url = canonicalize_url(url)
+                if url != canonical_url and url not in urls:
+                    urls.append(url)
+
+        if remove or keep['source_url'] != canonical_url or urls != list(keep.get('duplicate_urls') or []):
+            merges.append(Merge(keep['_id'], canonical_url, [article['_id'] for article in remove], urls))
+    return merges
+
+
+async def run(dry_run: bool) -> Dict[str, int]:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    collection = client[settings.MONGODB_DB_NAME]['articles']
+    try:
+        articles = await collection.find({'source_url': {'$type': 'string'}}, FIELDS).to_list(length=None)
+        merges = plan_merges(articles)
+        removed = sum(len(merge.remove) for merge in merges)
+        logger.info(f"{len(articles)} articles with a source URL: {len(merges)} to update, {removed} duplicates to remove")
+
+        for merge in merges:
+            if merge.remove:
+                logger.info(f"  {merge.canonical_url}: keeping {merge.keep}, removing {len(merge.remove)}")
+            if dry_run:
+                continue
+            # Remove first: the canonical URL may still be held by a duplicate
+            if merge.remove:
+                await collection.delete_many({'_id': {'$in': merge.remove}})
+            await collection.update_one(
+                {'_id': merge.keep},
+                {'$set': {'source_url': merge.canonical_url, 'duplicate_urls': merge.duplicate_urls}}
+            )
+    finally:
+        client.close()
+
+    if not dry_run:
+        # Builds the unique source_url index along with the others
+        from app.database import connect_to_mongo, close_mongo_connection
+        await connect_to_mongo()
+        await close_mongo_connection()
+
+    return {'articles': len(articles), 'updated': len(merges), 'removed': removed}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Merge articles stored under variants of one URL')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would change')
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.dry_run))
+    logger.info(f"✓ Deduplication {'planned' if args.dry_run else 'finished'}: {result}")
+
+
+if __name__ == "__main__":
+    main()
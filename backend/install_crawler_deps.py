@@ -41,6 +41,7 @@ def main():
         ("playwright", "Playwright"),
         ("beautifulsoup4", "BeautifulSoup4"),
         ("lxml", "LXML Parser"),
+        ("selectolax", "Selectolax Parser"),
     ]
     
     for package, name in packages:
@@ -0,0 +1,118 @@
+"""
+Re-parse archived crawler pages with the current selectors (no network access).
+
+Writes one JSON line per page. With --apply, fields parsed from TVPL
+document pages fill the empty fields of the stored legal documents.
+
+    python reparse_archive.py --kind legal_document --output legal.jsonl
+    python reparse_archive.py --url-prefix https://cafef.vn/ --workers 8
+    python reparse_archive.py --kind legal_document --apply
+"""
+
+import sys
+import json
+import time
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.page_archive import PageArchive
+from app.crawlers.reparse import reparse_pages, classify, KINDS, LEGAL_DOCUMENT
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Legal document fields that may be backfilled from a re-parsed page
+LEGAL_BACKFILL_FIELDS = ('doc_type', 'issuing_body', 'signer', 'effective_date', 'content_full', 'pdf_url', 'tags')
+
+
+async def apply_legal_documents(results: List[Dict[str, Any]]) -> int:
+    """Fill empty fields of stored legal documents; returns the number updated."""
+    from app.database import connect_to_mongo, close_mongo_connection
+    from app.models.legal_doc import LegalDocument
+
+    await connect_to_mongo()
+    updated = 0
+    try:
+        for result in results:
+            doc = await LegalDocument.find_one(LegalDocument.original_link == result['url'])
+            if not doc:
+                continue
+
+            changes = {
+                field: result['fields'][field]
+                for field in LEGAL_BACKFILL_FIELDS
+                if result['fields'].get(field) and not getattr(doc, field)
+            }
+            if changes:
+                for field, value in changes.items():
+                    setattr(doc, field, value)
+                doc.updated_at = datetime.utcnow()
+                await doc.save()  # type: ignore
+                updated += 1
+    finally:
+        await close_mongo_connection()
+    return updated
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Re-parse archived crawler pages')
+    parser.add_argument('--archive-dir', default=settings.CRAWLER_ARCHIVE_DIR,
+                        help=f'Archive directory (default: {settings.CRAWLER_ARCHIVE_DIR})')
+    parser.add_argument('--kind', choices=KINDS, help='Only pages of this kind')
+    parser.add_argument('--url-prefix', help='Only URLs starting with this prefix')
+    parser.add_argument('--since', type=datetime.fromisoformat, help='Only pages fetched since (YYYY-MM-DD)')
+    parser.add_argument('--all-fetches', action='store_true', help='Every archived fetch, not just the latest per URL')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per core)')
+    parser.add_argument('--output', help='JSON lines file (default: stdout)')
+    parser.add_argument('--apply', action='store_true', help='Backfill empty fields of stored legal documents')
+    args = parser.parse_args()
+
+    archive = PageArchive(args.archive_dir)
+    pages = [
+        page for page in archive.pages(
+            url_prefix=args.url_prefix,
+            since=args.since.timestamp() if args.since else None,
+            latest_only=not args.all_fetches
+        )
+        if not args.kind or classify(page.url)[0] == args.kind
+    ]
+    archive.close()
+    logger.info(f"Re-parsing {len(pages)} archived pages...")
+
+    started = time.perf_counter()
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    legal_results = []
+    count = failed = 0
+    try:
+        for result in reparse_pages(pages, workers=args.workers):
+            output.write(json.dumps(result, ensure_ascii=False, default=str) + '\n')
+            count += 1
+            if result['error']:
+                failed += 1
+            elif args.apply and result['kind'] == LEGAL_DOCUMENT:
+                legal_results.append(result)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    seconds = time.perf_counter() - started
+    logger.info(f"✓ Re-parsed {count} pages in {seconds:.1f}s ({count / seconds if seconds else 0:.0f} pages/s)")
+    if failed:
+        logger.warning(f"{failed} pages could not be re-parsed (see their 'error')")
+
+    if args.apply:
+        updated = asyncio.run(apply_legal_documents(legal_results))
+        logger.info(f"✓ Backfilled {updated} legal documents")
+
+
+if __name__ == "__main__":
+    main()
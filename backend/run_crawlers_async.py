@@ -8,14 +8,22 @@ import logging
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Any, List, Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.crawlers.tvpl_crawler_advanced import TVPLAdvancedCrawler
 from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+from app.crawlers.http_cache import get_http_cache
+from app.crawlers.browser_pool import BrowserPool, PLAYWRIGHT_AVAILABLE
+from app.crawlers.frontier import normalize_doc_number
+from app.core.config import settings
 from app.database import connect_to_mongo, close_mongo_connection
 from app.services.content_processor_async import ContentProcessorAsync
+from app.services.pipeline import CrawlPipeline
+from app.models.legal_doc import LegalDocument
+from app.models.article import Article
 
 # Configure logging
 logging.basicConfig(
@@ -33,8 +41,15 @@ logger = logging.getLogger(__name__)
 class CrawlerEngineAsync:
     """Async crawler engine orchestrating both modules with MongoDB."""
     
+    # Crawl log (source, crawl_type) per module
+    MODULE_LOGS = {
+        'legal': ("TVPL_Advanced", "legal_docs"),
+        'news': ("NewsAggregator_Advanced", "news_articles"),
+    }
+    
     def __init__(self, use_playwright: bool = True):
         self.use_playwright = use_playwright
+        self.browser_pool = None
         self.tvpl_crawler = None
         self.news_crawler = None
         self.processor = None
@@ -46,47 +61,80 @@ class CrawlerEngineAsync:
         # Connect to MongoDB
         await connect_to_mongo()
         
-        # Initialize crawlers (sync operations)
+        # Initialize crawlers
         self.tvpl_crawler = TVPLAdvancedCrawler(use_playwright=self.use_playwright)
         self.news_crawler = NewsAggregatorAdvanced(use_playwright=self.use_playwright)
         
+        # One browser for the whole run, shared by both modules (started on first use)
+        if self.use_playwright and PLAYWRIGHT_AVAILABLE:
+            self.browser_pool = BrowserPool(proxy=self.tvpl_crawler._get_random_proxy())
+            self.tvpl_crawler.browser_pool = self.browser_pool
+            self.news_crawler.browser_pool = self.browser_pool
+        
         # Initialize content processor
         self.processor = ContentProcessorAsync()
         
+        await self._seed_frontiers()
+        
         logger.info("✓ Async Crawler Engine initialized")
     
-    async def run_legal_watchdog(self, max_pages: int = 5):
+    async def _seed_frontiers(self):
+        """
+        Backfill empty crawl frontiers from MongoDB.
+        
+        Happens on the first run (or after the cache directory was wiped) so
+        that incremental crawls recognise everything already stored.
+        """
+        if self.tvpl_crawler and self.tvpl_crawler.frontier is not None and not len(self.tvpl_crawler.frontier):
+            doc_numbers = await LegalDocument.distinct("doc_number")
+            for doc_number in doc_numbers:
+                self.tvpl_crawler.frontier.add(normalize_doc_number(doc_number))
+            self.tvpl_crawler.frontier.flush()
+            logger.info(f"✓ Seeded legal frontier with {len(doc_numbers)} stored documents")
+        
+        if self.news_crawler and self.news_crawler.frontier is not None and not len(self.news_crawler.frontier):
+            source_urls = await Article.distinct("source_url", {"source_url": {"$ne": None}})
+            for source_url in source_urls:
+                self.news_crawler.frontier.add(self.news_crawler.canonical_url(source_url))
+            self.news_crawler.frontier.flush()
+            logger.info(f"✓ Seeded news frontier with {len(source_urls)} stored articles")
+    
+    async def run_legal_watchdog(self, max_pages: int = 5, incremental: bool = True):
         """
         Run Module A: TVPL Legal Watchdog
         
         Target: thuvienphapluat.vn
         Queries: Bảo hiểm, Kinh doanh bảo hiểm, Bộ Tài chính, Bảo hiểm xã hội
         Focus: Nghị định, Thông tư, Công văn
+        
+        In incremental mode each query stops paging once it reaches
+        TVPL_INCREMENTAL_STOP_AFTER consecutive documents already stored.
+        Documents are summarized and stored while the crawl continues.
+        
+        Returns the number of documents crawled.
         """
         logger.info("=" * 80)
         logger.info("MODULE A: LEGAL WATCHDOG - Starting...")
         logger.info("=" * 80)
         
         try:
-            if not self.tvpl_crawler:
+            if not (self.tvpl_crawler and self.processor):
                 logger.error("TVPL Crawler not initialized")
-                return []
-            
-            # Crawl documents (sync operation)
-            documents = self.tvpl_crawler.crawl(max_pages=max_pages)
+                return 0
             
-            logger.info(f"✓ Crawled {len(documents)} legal documents")
+            pipeline = CrawlPipeline()
+            self._add_legal_module(pipeline, max_pages, incremental)
+            report = await self._run_modules(pipeline, ['legal'])
             
-            # Process and save to database (async)
-            if self.processor:
-                result = await self.processor.process_legal_documents_from_data(documents)
-                logger.info(f"✓ Processed {result.get('items_processed', 0)} documents to database")
+            crawled = report['legal.crawl']['items_out']
+            logger.info(f"✓ Crawled {crawled} legal documents")
+            logger.info(f"✓ Processed {report['legal.process']['items_out']} documents to database")
             
-            return documents
+            return crawled
             
         except Exception as e:
             logger.error(f"✗ Legal Watchdog failed: {e}")
-            return []
+            return 0
     
     async def run_news_aggregator(self, max_articles_per_source: int = 10):
         """
@@ -94,36 +142,129 @@ class CrawlerEngineAsync:
         
         Targets: CafeF, VnExpress, Company Press Releases
         Keywords: Bảo hiểm, Bồi thường, Lợi nhuận bảo hiểm, Phí bảo hiểm
+        
+        Full article bodies are fetched while listings are still being
+        crawled, and articles are rewritten and stored as they arrive.
+        
+        Returns the number of articles crawled.
         """
         logger.info("=" * 80)
         logger.info("MODULE B: NEWS AGGREGATOR - Starting...")
         logger.info("=" * 80)
         
         try:
-            if not self.news_crawler:
+            if not (self.news_crawler and self.processor):
                 logger.error("News Crawler not initialized")
-                return []
-            
-            # Crawl articles (sync operation)
-            articles = self.news_crawler.crawl(
-                sources=['cafef', 'vnexpress', 'baoviet', 'manulife'],
-                max_articles_per_source=max_articles_per_source
-            )
+                return 0
             
-            logger.info(f"✓ Crawled {len(articles)} relevant news articles")
+            pipeline = CrawlPipeline()
+            self._add_news_module(pipeline, max_articles_per_source, await self._news_since())
+            report = await self._run_modules(pipeline, ['news'])
             
-            # Process and save to database (async)
-            if self.processor:
-                result = await self.processor.process_news_articles_from_data(articles)
-                logger.info(f"✓ Processed {result.get('items_processed', 0)} articles to database")
+            crawled = report['news.crawl']['items_out']
+            logger.info(f"✓ Crawled {crawled} relevant news articles")
+            logger.info(f"✓ Processed {report['news.process']['items_out']} articles to database")
             
-            return articles
+            return crawled
             
         except Exception as e:
             logger.error(f"✗ News Aggregator failed: {e}")
-            return []
+            return 0
+    
+    def _add_legal_module(self, pipeline: CrawlPipeline, max_pages: int, incremental: bool):
+        """legal.crawl -> legal.process"""
+        found = pipeline.add_source("legal.crawl", self.tvpl_crawler.crawl_stream(
+            max_pages=max_pages,
+            stop_after_known=None if incremental else 0
+        ))
+        pipeline.add_stage("legal.process", found, self.processor.process_legal_document)
+    
+    async def _news_since(self) -> Optional[datetime]:
+        """Feed entries published before the last successful news crawl are skipped."""
+        since = await self.processor.last_successful_crawl(*self.MODULE_LOGS['news'])
+        if since:
+            logger.info(f"News feeds: entries since last successful crawl ({since:%Y-%m-%d %H:%M} UTC)")
+        return since
+    
+    def _add_news_module(self, pipeline: CrawlPipeline, max_articles_per_source: int, since: Optional[datetime] = None):
+        """news.crawl -> news.fetch (full bodies) -> news.process"""
+        found = pipeline.add_source("news.crawl", self.news_crawler.crawl_stream(
+            sources=['cafef', 'vnexpress', 'baoviet', 'manulife'],
+            max_articles_per_source=max_articles_per_source,
+            since=since
+        ))
+        # HTTP fetches are bounded per host by the politeness scheduler, not the LLM/DB budget
+        with_content = pipeline.add_stage(
+            "news.fetch",
+            found,
+            self._fetch_article_content,
+            workers=settings.NEWS_CONTENT_WORKERS,
+            emit=True,
+            budgeted=False
+        )
+        pipeline.add_stage("news.process", with_content, self.processor.process_news_article)
+    
+    async def _fetch_article_content(self, article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Attach the full article body; drops articles already stored."""
+        source_url = article['source_url']
+        if await self.processor.is_article_stored(source_url):
+            return None
+        
+        content_html = await self.news_crawler.fetch_article_content_async(source_url, article['source_name'])
+        if content_html:
+            article['content_html'] = content_html
+        return article
+    
+    async def _run_modules(self, pipeline: CrawlPipeline, modules: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run a pipeline, recording one crawl log per module.
+        
+        Ctrl-C cancels every stage and marks the crawl logs as failed.
+        
+        Returns:
+            Per-stage throughput report
+        """
+        crawl_logs = {
+            module: await self.processor.open_crawl_log(*self.MODULE_LOGS[module])
+            for module in modules
+        }
+        crawlers = {'legal': self.tvpl_crawler, 'news': self.news_crawler}
+        
+        error = None
+        try:
+            await pipeline.run()
+        except asyncio.CancelledError:
+            error = "Cancelled"
+            raise
+        except Exception as e:
+            error = str(e)
+            logger.error(f"✗ Pipeline failed: {e}")
+        finally:
+            report = pipeline.report()
+            for module, crawl_log in crawl_logs.items():
+                await self.processor.close_crawl_log(
+                    crawl_log,
+                    items_found=pipeline.stats(f"{module}.crawl").items_out,
+                    items_processed=pipeline.stats(f"{module}.process").items_out,
+                    metadata={
+                        'render': crawlers[module].render_stats.summary(),
+                        'pipeline': {name: stats for name, stats in report.items() if name.startswith(module)},
+                    },
+                    error=error
+                )
+            
+            logger.info("-" * 80)
+            for name, stats in report.items():
+                logger.info(
+                    f"{name:<14} in={stats['items_in']:<5} out={stats['items_out']:<5} "
+                    f"errors={stats['errors']:<3} {stats['items_per_second']:>7.2f} items/s "
+                    f"({stats['seconds']}s, {stats['workers']} workers)"
+                )
+            logger.info("-" * 80)
+        
+        return report
     
-    async def run_full_pipeline(self, legal_pages: int = 5, news_max: int = 10):
+    async def run_full_pipeline(self, legal_pages: int = 5, news_max: int = 10, incremental: bool = True):
         """Run both modules in sequence."""
         logger.info("=" * 80)
         logger.info("INSURANCE NEWS CRAWLER ENGINE - FULL PIPELINE (ASYNC)")
@@ -133,14 +274,14 @@ class CrawlerEngineAsync:
         
         results = {
             'start_time': datetime.now(),
-            'legal_docs': [],
-            'news_articles': [],
+            'legal_docs': 0,
+            'news_articles': 0,
             'errors': []
         }
         
         # Module A: Legal Watchdog
         try:
-            results['legal_docs'] = await self.run_legal_watchdog(max_pages=legal_pages)
+            results['legal_docs'] = await self.run_legal_watchdog(max_pages=legal_pages, incremental=incremental)
         except Exception as e:
             logger.error(f"Module A error: {e}")
             results['errors'].append(('legal_watchdog', str(e)))
@@ -161,19 +302,54 @@ class CrawlerEngineAsync:
         logger.info("CRAWLER PIPELINE COMPLETE")
         logger.info("=" * 80)
         logger.info(f"Duration: {results['duration']:.2f} seconds")
-        logger.info(f"Legal Documents: {len(results['legal_docs'])}")
-        logger.info(f"News Articles: {len(results['news_articles'])}")
+        logger.info(f"Legal Documents: {results['legal_docs']}")
+        logger.info(f"News Articles: {results['news_articles']}")
         logger.info(f"Errors: {len(results['errors'])}")
         logger.info("=" * 80)
         
         return results
     
+    async def run_pipeline(self, legal_pages: int = 5, news_max: int = 10, incremental: bool = True):
+        """
+        Run both modules concurrently as one staged pipeline.
+        
+        legal.crawl -> legal.process and news.crawl -> news.fetch ->
+        news.process run at the same time (the modules hit different
+        hosts). Stages are joined by bounded queues; processing workers of
+        both modules share the PIPELINE_MAX_CONCURRENCY budget.
+        
+        Returns:
+            Per-stage throughput report
+        """
+        logger.info("=" * 80)
+        logger.info("INSURANCE NEWS CRAWLER ENGINE - CONCURRENT PIPELINE")
+        logger.info("=" * 80)
+        
+        if not (self.tvpl_crawler and self.news_crawler and self.processor):
+            logger.error("Engine not initialized")
+            return {}
+        
+        pipeline = CrawlPipeline()
+        self._add_legal_module(pipeline, legal_pages, incremental)
+        self._add_news_module(pipeline, news_max, await self._news_since())
+        
+        return await self._run_modules(pipeline, ['legal', 'news'])
+    
     async def cleanup(self):
         """Cleanup resources."""
         if self.tvpl_crawler:
             self.tvpl_crawler.close()
+            await self.tvpl_crawler.aclose()
         if self.news_crawler:
             self.news_crawler.close()
+            await self.news_crawler.aclose()
+        if self.browser_pool:
+            await self.browser_pool.close()
+        
+        # Report conditional-GET cache effectiveness
+        http_cache = get_http_cache()
+        if http_cache:
+            logger.info(f"HTTP cache: {http_cache.stats()}")
         
         # Close MongoDB connection
         await close_mongo_connection()
@@ -186,14 +362,16 @@ async def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Insurance News Crawler Engine (Async MongoDB)')
-    parser.add_argument('--module', choices=['legal', 'news', 'full'], default='full',
-                       help='Module to run: legal, news, or full pipeline')
+    parser.add_argument('--module', choices=['legal', 'news', 'full', 'pipeline'], default='full',
+                       help='Module to run: legal, news, full (sequential) or pipeline (concurrent)')
     parser.add_argument('--legal-pages', type=int, default=5,
                        help='Max pages to crawl from TVPL (default: 5)')
     parser.add_argument('--news-max', type=int, default=10,
                        help='Max articles per news source (default: 10)')
     parser.add_argument('--no-playwright', action='store_true',
                        help='Disable Playwright (use requests only)')
+    parser.add_argument('--full-legal-crawl', action='store_true',
+                       help='Walk every TVPL result page instead of stopping at stored documents')
     
     args = parser.parse_args()
     
@@ -204,16 +382,27 @@ async def main():
         await engine.initialize()
         
         if args.module == 'legal':
-            await engine.run_legal_watchdog(max_pages=args.legal_pages)
+            await engine.run_legal_watchdog(
+                max_pages=args.legal_pages,
+                incremental=not args.full_legal_crawl
+            )
         elif args.module == 'news':
             await engine.run_news_aggregator(max_articles_per_source=args.news_max)
+        elif args.module == 'pipeline':
+            await engine.run_pipeline(
+                legal_pages=args.legal_pages,
+                news_max=args.news_max,
+                incremental=not args.full_legal_crawl
+            )
         else:
             await engine.run_full_pipeline(
                 legal_pages=args.legal_pages,
-                news_max=args.news_max
+                news_max=args.news_max,
+                incremental=not args.full_legal_crawl
             )
     
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # asyncio.run() turns Ctrl-C into cancellation of this task
         logger.info("\n✗ Interrupted by user")
     except Exception as e:
         logger.error(f"✗ Fatal error: {e}", exc_info=True)
@@ -222,4 +411,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass  # Already logged and cleaned up in main()
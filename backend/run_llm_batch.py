@@ -0,0 +1,63 @@
+"""
+Rewrite pending draft articles and summarize pending legal documents with
+the provider batch APIs (OpenAI Batch API / Anthropic Message Batches).
+
+Meant for backfills and for crawls run with LLM_BATCH_MODE=true, which
+store items unprocessed. Jobs usually finish within minutes to hours
+(at most 24h) at about half the interactive price.
+
+    python run_llm_batch.py
+    python run_llm_batch.py --provider anthropic --limit 2000 --since 2024-11-01
+    python run_llm_batch.py --poll 5    # e.g. against app/services/llm_stub.py
+"""
+
+import sys
+import json
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.database import connect_to_mongo, close_mongo_connection
+from app.services.llm_service import LLMProvider
+from app.services.content_processor_async import ContentProcessorAsync
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def run(provider: LLMProvider, limit: int, since: datetime):
+    await connect_to_mongo()
+    processor = ContentProcessorAsync(llm_provider=provider, batch_mode=True)
+    try:
+        return await processor.process_pending_batches(limit=limit, since=since)
+    finally:
+        await processor.llm_service.batches.aclose()
+        await close_mongo_connection()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Process pending articles and legal documents with LLM batch jobs')
+    parser.add_argument('--provider', choices=[p.value for p in LLMProvider], default=LLMProvider.OPENAI.value,
+                        help='LLM provider (default: openai)')
+    parser.add_argument('--limit', type=int, help='At most N articles and N legal documents')
+    parser.add_argument('--since', type=datetime.fromisoformat, help='Only items crawled since (YYYY-MM-DD)')
+    parser.add_argument('--poll', type=float,
+                        help=f'Seconds between status checks (default: {settings.LLM_BATCH_POLL_SECONDS})')
+    args = parser.parse_args()
+
+    if args.poll:
+        settings.LLM_BATCH_POLL_SECONDS = args.poll
+
+    result = asyncio.run(run(LLMProvider(args.provider), args.limit, args.since))
+    logger.info(f"✓ Batch processing finished: {json.dumps(result, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Tests for cross-run deduplication (persistent crawl frontier).
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.frontier import FingerprintStore, FINGERPRINT_DTYPE, normalize_doc_number
+
+
+def test_frontier_persists_across_runs():
+    """Fingerprints flushed in one run are visible to the next."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legal_docs.u64")
+
+        store = FingerprintStore(path)
+        store.add(normalize_doc_number("52/2024/nđ-cp"))
+        store.add("https://cafef.vn/bao-hiem-1.chn")
+        assert "https://cafef.vn/bao-hiem-1.chn" in store
+        store.flush()
+
+        reopened = FingerprintStore(path)
+        assert len(reopened) == 2
+        assert normalize_doc_number(" 52/2024/NĐ-CP") in reopened
+        assert reopened.filter_new(["https://cafef.vn/bao-hiem-1.chn", "https://cafef.vn/moi.chn"]) == [
+            "https://cafef.vn/moi.chn"
+        ]
+
+
+def test_frontier_opens_millions_of_entries_quickly():
+    """A store with 2M fingerprints opens in milliseconds and answers lookups."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "news_urls.u64")
+        fps = np.unique(np.random.default_rng(7).integers(0, 2**63, size=2_000_000, dtype=np.uint64))
+        fps.astype(FINGERPRINT_DTYPE).tofile(path)
+
+        start = time.perf_counter()
+        store = FingerprintStore(path)
+        opened_in = time.perf_counter() - start
+
+        assert len(store) == len(fps)
+        assert store.contains_fingerprint(int(fps[12345]))
+        assert opened_in < 0.05
+        del store
+
+
+if __name__ == "__main__":
+    test_frontier_persists_across_runs()
+    test_frontier_opens_millions_of_entries_quickly()
+    print("✅ Crawl dedup tests passed")
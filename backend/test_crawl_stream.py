@@ -0,0 +1,144 @@
+"""
+Tests for the streaming crawl API (async generators feeding the processor).
+Runs offline against httpx.MockTransport - no network access needed.
+"""
+
+import sys
+import asyncio
+import tempfile
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.politeness import PolitenessScheduler
+from app.crawlers.http_cache import HTTPCache
+from app.crawlers.frontier import FingerprintStore
+from app.crawlers.page_archive import PageArchive
+from app.crawlers.renderer import RendererSelector
+from app.crawlers.tvpl_crawler_advanced import TVPLAdvancedCrawler
+
+
+def make_tvpl_crawler(tmp: str) -> TVPLAdvancedCrawler:
+    """HTTP-only TVPL crawler with no politeness delay and throwaway caches."""
+    return TVPLAdvancedCrawler(
+        use_playwright=False,
+        scheduler=PolitenessScheduler(default_delay=0, host_delays={}, respect_robots=False),
+        http_cache=HTTPCache(path=f"{tmp}/cache.sqlite3"),
+        frontier=FingerprintStore(f"{tmp}/legal_docs.u64"),
+        renderers=RendererSelector(path=f"{tmp}/renderers.json"),
+        archive=PageArchive(f"{tmp}/archive")
+    )
+
+
+def listing_page(page: int) -> str:
+    rows = "".join(
+        f'<div class="item-row"><a class="title" href="/van-ban/{page}-{i}">Thông tư {page}-{i}</a>'
+        f'<span class="so-hieu">{page}{i}/2024/TT-BTC</span>'
+        f'<span class="loai-van-ban">Thông tư</span></div>'
+        for i in range(3)
+    )
+    return f"<html><body>{rows}</body></html>"
+
+
+def test_tvpl_stream_yields_before_crawl_finishes():
+    """The first document is available while later result pages are still unfetched."""
+    requested_pages = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/van-ban/"):
+            return httpx.Response(200, html='<div class="noi-dung"><p>Điều 1. Phạm vi điều chỉnh</p></div>')
+        page = int(parse_qs(request.url.query.decode())["page"][0])
+        requested_pages.append(page)
+        await asyncio.sleep(0.05)  # Search pages are slow
+        return httpx.Response(200, html=listing_page(page))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = make_tvpl_crawler(tmp)
+
+        async def run():
+            crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            stream = crawler.crawl_stream(max_pages=5, queries=["Bảo hiểm"], stop_after_known=0)
+            first = await stream.__anext__()
+            pages_at_first_item = list(requested_pages)
+            rest = [doc async for doc in stream]
+            await crawler.aclose()
+            return first, pages_at_first_item, rest
+
+        first, pages_at_first_item, rest = asyncio.run(run())
+        crawler.http_cache.close()
+        crawler.archive.close()
+
+    assert first["content_full"]
+    assert len(pages_at_first_item) < 3
+    assert len(rest) == 14
+    assert requested_pages == [1, 2, 3, 4, 5]
+
+
+def test_tvpl_incremental_stop_skips_over_non_priority_results():
+    """Unstored Thông báo results between stored Thông tư don't restart the known streak."""
+    requested_pages = []
+
+    def row(doc_number: str, doc_type: str) -> str:
+        return (f'<div class="item-row"><a class="title" href="/van-ban/{doc_number}">{doc_type} {doc_number}</a>'
+                f'<span class="so-hieu">{doc_number}</span><span class="loai-van-ban">{doc_type}</span></div>')
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/van-ban/"):
+            return httpx.Response(200, html='<div class="noi-dung"><p>Điều 1. Phạm vi điều chỉnh</p></div>')
+        page = int(parse_qs(request.url.query.decode())["page"][0])
+        requested_pages.append(page)
+        rows = "".join(
+            row(f"{page}{i}/2024/TT-BTC", "Thông tư") + row(f"{page}{i}/TB-BTC", "Thông báo")
+            for i in range(3)
+        )
+        return httpx.Response(200, html=f"<html><body>{rows}</body></html>")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = make_tvpl_crawler(tmp)
+        for page in range(1, 6):
+            for i in range(3):
+                crawler.frontier.add(crawler.frontier_key(f"{page}{i}/2024/TT-BTC"))
+
+        async def run():
+            crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            docs = [doc async for doc in crawler.crawl_stream(max_pages=5, queries=["Bảo hiểm"], stop_after_known=5)]
+            await crawler.aclose()
+            return docs
+
+        docs = asyncio.run(run())
+        crawler.http_cache.close()
+        crawler.archive.close()
+
+    assert requested_pages == [1, 2]
+    assert all(doc["doc_type"] == "Thông báo" for doc in docs)
+
+
+def test_tvpl_claimed_results_do_not_extend_the_known_streak():
+    """Two queries over the same unstored page: the second skips it without stopping early."""
+    page = [{"doc_number": f"{i}/2024/TT-BTC", "doc_type": "Thông tư"} for i in range(10)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = make_tvpl_crawler(tmp)
+        seen_doc_numbers = set()
+        first, first_streak = crawler._select_new_documents(page, seen_doc_numbers)
+        second, second_streak = crawler._select_new_documents(page, seen_doc_numbers, 3)
+
+        crawler.frontier.add(crawler.frontier_key(page[0]["doc_number"]))
+        stored, stored_streak = crawler._select_new_documents(page[:1], set(), 3)
+        crawler.http_cache.close()
+        crawler.archive.close()
+
+    assert len(first) == 10 and first_streak == 0
+    assert second == [] and second_streak == 3
+    assert stored == [] and stored_streak == 4
+
+
+if __name__ == "__main__":
+    test_tvpl_stream_yields_before_crawl_finishes()
+    test_tvpl_incremental_stop_skips_over_non_priority_results()
+    test_tvpl_claimed_results_do_not_extend_the_known_streak()
+    print("✅ Crawl stream tests passed")
@@ -0,0 +1,72 @@
+"""
+Tests for body encoding resolution and raw-bytes parsing.
+Runs offline against httpx.MockTransport - no network access needed.
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.encoding import EncodingSniffer, declared_encoding, header_encoding, sniff_encoding
+from app.crawlers.politeness import PolitenessScheduler
+from app.crawlers.tvpl_crawler_advanced import TVPLAdvancedCrawler
+
+PAGE = '<html><head>{meta}</head><body><h1>Thông tư hướng dẫn</h1><div class="so-hieu">67/2023/TT-BTC</div></body></html>'
+
+
+def test_declared_encodings():
+    assert header_encoding("text/html; charset=UTF-8") == "utf-8"
+    assert header_encoding("text/html") is None
+    assert declared_encoding(b'<html><head><meta charset="windows-1258">') == "cp1258"
+    assert declared_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">') == "cp1252"
+    assert declared_encoding(b'<?xml version="1.0" encoding="UTF-8"?><rss/>') == "utf-8"
+    assert declared_encoding(b'<meta charset="no-such-charset">') is None
+    assert sniff_encoding("﻿<p>Bảo hiểm</p>".encode("utf-8")) == "utf-8"
+
+
+def test_host_encoding_is_reused_before_full_detection():
+    sniffer = EncodingSniffer()
+    assert sniffer.resolve("https://a.vn/1", {}, PAGE.format(meta='<meta charset="cp1258">').encode("ascii", "ignore")) == "cp1258"
+    assert sniffer.resolve("https://a.vn/2", {}, b"<p>no declaration</p>") == "cp1258"
+    assert sniffer.resolve("https://b.vn/1", {"Content-Type": "text/html"}, PAGE.format(meta="").encode("utf-8")) == "utf-8"
+    assert sniffer.stats() == {"declared": 1, "from_host": 1, "detected": 1}
+
+
+def test_fetched_bytes_go_straight_to_the_parser():
+    """Undeclared UTF-8 on a header without charset is not decoded as latin-1."""
+    body = PAGE.format(meta="").encode("utf-8")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"Content-Type": "text/html"})
+
+    scheduler = PolitenessScheduler(default_delay=0, host_delays={}, respect_robots=False)
+    crawler = TVPLAdvancedCrawler(use_playwright=False, scheduler=scheduler, http_cache=None)
+    crawler.encodings = EncodingSniffer()
+
+    async def run():
+        crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            response = await crawler.fetch_response_async("https://thuvienphapluat.vn/van-ban/x.aspx")
+            document = await crawler.fetch_document_async("https://thuvienphapluat.vn/van-ban/y.aspx")
+            return response, document
+        finally:
+            await crawler.aclose()
+
+    response, document = asyncio.run(run())
+    assert response.body is body or response.body == body
+    assert response.encoding == "utf-8"
+    fields = crawler._extract_document_fields(document, "https://thuvienphapluat.vn/van-ban/y.aspx")
+    assert fields["title"] == "Thông tư hướng dẫn"
+    assert crawler.encodings.stats() == {"declared": 0, "from_host": 1, "detected": 1}
+
+
+if __name__ == "__main__":
+    test_declared_encodings()
+    test_host_encoding_is_reused_before_full_detection()
+    test_fetched_bytes_go_straight_to_the_parser()
+    print("✅ Encoding tests passed")
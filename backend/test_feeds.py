@@ -0,0 +1,166 @@
+"""
+Tests for RSS / news-sitemap discovery.
+Runs offline against httpx.MockTransport - no network access needed.
+"""
+
+import sys
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.feeds import parse_feed, entries_since, FEED
+from app.crawlers.politeness import PolitenessScheduler
+from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>VnExpress - Kinh doanh</title>
+<item>
+  <title>Phí bảo hiểm nhân thọ tăng mạnh</title>
+  <link>https://vnexpress.net/phi-bao-hiem-nhan-tho-tang-4791234.html?utm_source=rss</link>
+  <description><![CDATA[<a href="x"><img src="https://i.vnecdn.net/a.jpg"></a></br>Doanh thu phí bảo hiểm quý III tăng 12%.]]></description>
+  <pubDate>Thu, 10 Oct 2024 08:00:00 +0700</pubDate>
+</item>
+<item>
+  <title>Giá vàng giảm</title>
+  <link>https://vnexpress.net/gia-vang-giam-4790000.html</link>
+  <description>Giá vàng hôm nay.</description>
+  <pubDate>Mon, 07 Oct 2024 08:00:00 +0700</pubDate>
+</item>
+</channel></rss>""".encode("utf-8")
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url>
+    <loc>https://dantri.com.vn/kinh-doanh/bao-hiem-xe-20241010.htm</loc>
+    <lastmod>2024-10-10T09:00:00+07:00</lastmod>
+    <news:news><news:title>B\xe1\xba\xa3o hi\xe1\xbb\x83m xe</news:title></news:news>
+  </url>
+  <url><loc>https://dantri.com.vn/kinh-doanh/cu-20240901.htm</loc><lastmod>2024-09-01</lastmod></url>
+</urlset>"""
+
+INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://dantri.com.vn/sitemaps/news-1.xml</loc></sitemap>
+</sitemapindex>"""
+
+
+def make_crawler() -> NewsAggregatorAdvanced:
+    scheduler = PolitenessScheduler(default_delay=0, host_delays={}, respect_robots=False)
+    return NewsAggregatorAdvanced(use_playwright=False, scheduler=scheduler, http_cache=None)
+
+
+def test_parse_rss_and_sitemap():
+    rss = parse_feed(RSS)
+    assert [e.title for e in rss.entries] == ["Phí bảo hiểm nhân thọ tăng mạnh", "Giá vàng giảm"]
+    assert rss.entries[0].image == "https://i.vnecdn.net/a.jpg"
+    assert rss.entries[0].summary == "Doanh thu phí bảo hiểm quý III tăng 12%."
+    assert rss.entries[0].published == datetime(2024, 10, 10, 1, 0)
+
+    sitemap = parse_feed(SITEMAP)
+    assert sitemap.entries[0].title == "Bảo hiểm xe"
+    assert sitemap.entries[0].published == datetime(2024, 10, 10, 2, 0)
+    assert parse_feed(INDEX).sitemaps == ["https://dantri.com.vn/sitemaps/news-1.xml"]
+    assert parse_feed(b"<html><body>Not found</body></html>") is None
+
+
+def test_malformed_feeds_are_read_leniently():
+    """HTML entities, a BOM or an unescaped & break ElementTree, not feedparser."""
+    body = b"\xef\xbb\xbf" + RSS.replace("Phí bảo hiểm nhân thọ".encode("utf-8"), b"Ph&iacute; b\xe1\xba\xa3o hi\xe1\xbb\x83m &nbsp;& nh\xc3\xa2n th\xe1\xbb\x8d")
+    feed = parse_feed(body)
+    assert [entry.link for entry in feed.entries] == [
+        "https://vnexpress.net/phi-bao-hiem-nhan-tho-tang-4791234.html?utm_source=rss",
+        "https://vnexpress.net/gia-vang-giam-4790000.html",
+    ]
+    assert feed.entries[0].title.startswith("Phí bảo hiểm") and feed.entries[0].published == datetime(2024, 10, 10, 1, 0)
+    assert parse_feed(b"<rss>") is None
+
+
+def test_entries_since_drops_old_entries():
+    entries = parse_feed(SITEMAP).entries
+    assert [e.link for e in entries_since(entries, datetime(2024, 10, 1))] == [
+        "https://dantri.com.vn/kinh-doanh/bao-hiem-xe-20241010.htm"
+    ]
+
+
+def test_sitemap_index_is_followed():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=INDEX if request.url.path == "/sitemaps/news.xml" else SITEMAP)
+
+    crawler = make_crawler()
+
+    async def run():
+        crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await crawler.discover_feeds_async(["https://dantri.com.vn/sitemaps/news.xml"])
+        finally:
+            await crawler.aclose()
+
+    entries = asyncio.run(run())
+    assert len(entries) == 2
+
+
+def test_crawl_reads_feed_instead_of_listing_pages():
+    """A source with a readable feed makes one XML request and no listing requests."""
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path.endswith(".rss"):
+            return httpx.Response(200, content=RSS)
+        return httpx.Response(404)
+
+    crawler = make_crawler()
+    crawler.frontier = None
+
+    async def run():
+        crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await crawler.crawl_async(sources=["vnexpress"], since=datetime(2024, 10, 8))
+        finally:
+            await crawler.aclose()
+
+    articles = asyncio.run(run())
+    assert requested == ["/rss/kinh-doanh.rss"]
+    assert [a["source_url"] for a in articles] == ["https://vnexpress.net/phi-bao-hiem-nhan-tho-tang-4791234.html"]
+    assert articles[0]["featured_image_url"] == "https://i.vnecdn.net/a.jpg"
+    assert crawler.render_stats.renderers == {FEED: 1}
+
+
+def test_crawl_falls_back_to_listing_pages():
+    """Sources whose feed cannot be read are scraped from their listing pages."""
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        return httpx.Response(404)
+
+    crawler = make_crawler()
+    crawler.frontier = None
+    crawler.max_retries = 0
+
+    async def run():
+        crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await crawler.crawl_async(sources=["vnexpress"])
+        finally:
+            await crawler.aclose()
+
+    asyncio.run(run())
+    assert "/rss/kinh-doanh.rss" in requested
+    assert "/kinh-doanh/bao-hiem" in requested
+
+
+if __name__ == "__main__":
+    test_parse_rss_and_sitemap()
+    test_malformed_feeds_are_read_leniently()
+    test_entries_since_drops_old_entries()
+    test_sitemap_index_is_followed()
+    test_crawl_reads_feed_instead_of_listing_pages()
+    test_crawl_falls_back_to_listing_pages()
+    print("✅ Feed discovery tests passed")
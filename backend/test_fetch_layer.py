@@ -0,0 +1,233 @@
+"""
+Tests for the crawler fetch layer (politeness scheduling, HTTP cache,
+browser render profiles, adaptive renderer selection).
+Runs offline against httpx.MockTransport - no network access needed.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.politeness import TokenBucket, PolitenessScheduler
+from app.crawlers.http_cache import HTTPCache
+from app.crawlers.browser_pool import RenderProfile, RenderStats, PageMetrics, site_domain
+from app.crawlers.renderer import RendererSelector, HTTP, BROWSER
+from bs4 import BeautifulSoup
+from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+
+
+def make_crawler(http_cache: HTTPCache) -> NewsAggregatorAdvanced:
+    """HTTP-only crawler with no politeness delay, for mock transports."""
+    scheduler = PolitenessScheduler(default_delay=0, host_delays={}, respect_robots=False)
+    return NewsAggregatorAdvanced(use_playwright=False, scheduler=scheduler, http_cache=http_cache)
+
+
+def test_token_bucket_spaces_reservations():
+    """Reservations beyond the burst queue up at 1/rate intervals."""
+    bucket = TokenBucket(rate=10.0, capacity=1)
+
+    waits = [bucket.reserve() for _ in range(3)]
+
+    assert waits[0] == 0.0
+    assert abs(waits[1] - 0.1) < 0.01
+    assert abs(waits[2] - 0.2) < 0.01
+
+
+def test_scheduler_interleaves_hosts_and_reads_crawl_delay():
+    """Different hosts do not wait on each other; robots.txt Crawl-delay applies per host."""
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/robots.txt":
+            body = "User-agent: *\nCrawl-delay: 1\n" if request.url.host == "slow.example" else ""
+            return httpx.Response(200, text=body)
+        requested.append((request.url.host, time.monotonic()))
+        return httpx.Response(200, text="ok")
+
+    scheduler = PolitenessScheduler(default_delay=0.05, host_delays={}, respect_robots=True)
+
+    async def fetch(client, url):
+        async with scheduler.slot(url, client):
+            await client.get(url)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await asyncio.gather(*(
+                fetch(client, f"https://{host}/page-{i}")
+                for i in range(2)
+                for host in ("slow.example", "fast.example")
+            ))
+
+    asyncio.run(run())
+
+    start = min(t for _, t in requested)
+    slow = [t - start for host, t in requested if host == "slow.example"]
+    fast = [t - start for host, t in requested if host == "fast.example"]
+
+    assert scheduler.delay_for("slow.example") == 1.0
+    assert max(fast) < 0.5
+    assert max(slow) >= 0.9
+
+
+def test_http_cache_revalidates_with_etag():
+    """Second fetch sends If-None-Match and reuses the cached body on 304; a changed page is a miss."""
+    seen_headers = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("if-none-match"))
+        if len(seen_headers) == 3:
+            return httpx.Response(200, html="<h1>Thông tư 67 (sửa đổi)</h1>", headers={"ETag": '"v2"'})
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, html="<h1>Thông tư 67</h1>", headers={"ETag": '"v1"'})
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HTTPCache(path=f"{cache_dir}/cache.sqlite3")
+        crawler = make_crawler(cache)
+
+        async def run():
+            crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            first = await crawler.fetch_page_async("https://thuvienphapluat.vn/van-ban/1")
+            second = await crawler.fetch_page_async("https://thuvienphapluat.vn/van-ban/1")
+            fresh_stats = cache.stats()
+            third = await crawler.fetch_page_async("https://thuvienphapluat.vn/van-ban/1")
+            await crawler.aclose()
+            return first, second, third, fresh_stats
+
+        first, second, third, fresh_stats = asyncio.run(run())
+        stats = cache.stats()
+        cache.close()
+
+    assert seen_headers == [None, '"v1"', '"v1"']
+    assert first.h1.get_text() == second.h1.get_text() == "Thông tư 67"
+    assert third.h1.get_text() == "Thông tư 67 (sửa đổi)"
+    # The first fetch had nothing to revalidate: not a miss
+    assert fresh_stats["hits"] == 1 and fresh_stats["misses"] == 0
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_article_content_reuses_cached_body():
+    """Full article bodies already in the HTTP cache are not fetched again."""
+    requests_made = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests_made.append(str(request.url))
+        return httpx.Response(
+            200,
+            html='<div class="fck_detail"><p>Phí bảo hiểm tăng</p><script>track()</script></div>',
+            headers={"ETag": '"a1"'}
+        )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HTTPCache(path=f"{cache_dir}/cache.sqlite3")
+        crawler = make_crawler(cache)
+        url = "https://vnexpress.net/phi-bao-hiem-tang-1.html"
+
+        async def run():
+            crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            first = await crawler.fetch_article_content_async(url, "vnexpress")
+            second = await crawler.fetch_article_content_async(url, "vnexpress")
+            await crawler.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        cache.close()
+
+    assert requests_made == [url]
+    assert first == second
+    assert "Phí bảo hiểm tăng" in first and "track()" not in first
+
+
+def test_http_cache_evicts_least_recently_used():
+    """Entries are evicted oldest-access first once the size bound is exceeded."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = HTTPCache(path=f"{cache_dir}/cache.sqlite3", max_bytes=2500)
+        headers = {"etag": '"x"'}
+
+        # Random bytes do not compress, so each entry is ~1 KB on disk
+        for name in ("a", "b"):
+            cache.store(f"https://example.vn/{name}", headers, os.urandom(1000))
+        cache.hit("https://example.vn/a")
+        cache.store("https://example.vn/c", headers, os.urandom(1000))
+
+        remaining = {url for url in ("a", "b", "c") if cache.get(f"https://example.vn/{url}")}
+        cache.close()
+
+    assert remaining == {"a", "c"}
+
+
+def test_render_profile_blocks_heavy_and_third_party_requests():
+    """Images/fonts and other sites' scripts are aborted; first-party HTML/JS/XHR pass."""
+    profile = RenderProfile(ready_selector='.item-news', allowed_domains=('vnecdn.net',))
+    first_party = site_domain("https://vnexpress.net/kinh-doanh/bao-hiem")
+
+    assert site_domain("https://www.baoviet.com.vn/vi/tin-tuc") == "baoviet.com.vn"
+    assert profile.allows("https://vnexpress.net/kinh-doanh", "document", first_party)
+    assert profile.allows("https://s1.vnecdn.net/main.js", "script", first_party)
+    assert not profile.allows("https://vnexpress.net/logo.png", "image", first_party)
+    assert not profile.allows("https://fonts.gstatic.com/x.woff2", "font", first_party)
+    assert not profile.allows("https://www.googletagmanager.com/gtm.js", "script", first_party)
+
+    stats = RenderStats()
+    stats.record(PageMetrics("https://vnexpress.net/a", 0.5, 300_000, 12, 40, True))
+    stats.record(PageMetrics("https://vnexpress.net/b", 1.5, 100_000, 8, 20, False))
+    summary = stats.summary()
+
+    assert summary["seconds_per_page"] == 1.0
+    assert summary["bytes_per_page"] == 200_000
+    assert summary["requests_blocked"] == 60 and summary["not_ready"] == 1
+
+
+def test_renderer_selector_escalates_and_remembers():
+    """HTTP is tried first; a source whose selectors need JS is rendered directly next run."""
+    loads = []
+
+    def loader(name, html):
+        async def load():
+            loads.append(name)
+            return BeautifulSoup(html, "lxml")
+        return load
+
+    static_http = loader("http", '<div class="item-news">A</div>')
+    js_http = loader("http", '<div id="app"></div>')
+    browser = loader("browser", '<div class="item-news">A</div>')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = f"{cache_dir}/renderers.json"
+        selector = RendererSelector(path=path)
+
+        _, static_renderer = asyncio.run(selector.load("vnexpress", ".item-news", static_http, browser))
+        _, js_renderer = asyncio.run(selector.load("manulife", ".item-news", js_http, browser))
+        selector.save()
+        assert (static_renderer, js_renderer) == (HTTP, BROWSER)
+        assert loads == ["http", "http", "browser"]
+
+        loads.clear()
+        next_run = RendererSelector(path=path)
+        soup, renderer = asyncio.run(next_run.load("manulife", ".item-news", js_http, browser))
+        assert renderer == BROWSER and soup.select_one(".item-news")
+        assert loads == ["browser"]
+
+        # Browser-only sources are re-probed over HTTP once the recheck window passes
+        expired = RendererSelector(path=path, recheck_hours=0)
+        assert expired.renderer_for("manulife") is None
+
+
+if __name__ == "__main__":
+    test_token_bucket_spaces_reservations()
+    test_scheduler_interleaves_hosts_and_reads_crawl_delay()
+    test_http_cache_revalidates_with_etag()
+    test_article_content_reuses_cached_body()
+    test_http_cache_evicts_least_recently_used()
+    test_render_profile_blocks_heavy_and_third_party_requests()
+    test_renderer_selector_escalates_and_remembers()
+    print("✅ Fetch layer tests passed")
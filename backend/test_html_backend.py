@@ -0,0 +1,135 @@
+"""
+Tests for the pluggable HTML parser backends and compiled extractors.
+Checks that every backend reads the same fields as the BeautifulSoup path.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.html_backend import (
+    get_html_backend, compile_selector, field_extractor, LXML, SELECTOLAX, SELECTOLAX_AVAILABLE
+)
+from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+from app.crawlers.tvpl_crawler_advanced import TVPLAdvancedCrawler
+
+FIXTURES = Path(__file__).parent / "fixtures" / "parsers"
+BACKENDS = [LXML] + ([SELECTOLAX] if SELECTOLAX_AVAILABLE else [])
+
+PAGE = """<html><body>
+<div id="main" class="list"><div class="item"><h3><a href="/a" title="A">Bảo <b>hiểm</b> A</a></h3>
+<p class="sapo"> Tóm tắt </p><img data-src="/a.jpg"></div>
+<div class="item hot"><h2 class="title"><a href="/b">B</a></h2><a class="pdf" href="/b.PDF">x</a></div></div>
+<section><div class="item"><span>outside</span></div></section>
+</body></html>"""
+
+SELECTORS = [
+    ".item", "#main .item", ".list > .item", "div.item.hot", "h3 a, h2 a", ".title a",
+    "a[href]", 'a[href*=".PDF"]', "a[href^='/b']", "a[href$=jpg]", "img[data-src]", "section span", "* b",
+]
+
+
+def crawlers():
+    return NewsAggregatorAdvanced(use_playwright=False), TVPLAdvancedCrawler(use_playwright=False)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_compiled_selectors_match_like_soupsieve(name):
+    backend = get_html_backend(name)
+    soup = BeautifulSoup(PAGE, "lxml")
+    document = backend.parse(PAGE)
+
+    for css in SELECTORS:
+        expected = [el.get_text(strip=True) for el in soup.select(css)]
+        selector = compile_selector(css)
+        got = [backend.text(el) for el, tag, attrs in backend.walk(document) if selector.matches(el, tag, attrs, backend)]
+        assert got == expected, css
+
+    with pytest.raises(ValueError):
+        compile_selector("li:nth-child(2)")
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_child_combinator_skips_deeper_descendants(name):
+    """`div.x > p` must not match a grandchild, even one that comes before the direct child."""
+    page = """<html><body><div class="x"><section><p>grandchild</p></section><p>child</p>
+    <div><p>nested</p></div></div><div class="y"><p>other</p></div></body></html>"""
+    backend = get_html_backend(name)
+    soup = BeautifulSoup(page, "lxml")
+    document = backend.parse(page)
+
+    for css in ("div.x > p", "body > div.x > p", "div.x p", "body > div > p"):
+        selector = compile_selector(css)
+        got = [backend.text(el) for el, tag, attrs in backend.walk(document) if selector.matches(el, tag, attrs, backend)]
+        assert got == [el.get_text(strip=True) for el in soup.select(css)], css
+
+    first = field_extractor((("p", "div.x > p"),)).extract(document, backend)["p"]
+    assert backend.text(first) == "child"
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_one_pass_extraction_returns_first_and_every_match(name):
+    backend = get_html_backend(name)
+    found = field_extractor((("title", "h2 a, h3 a"), ("missing", ".nope")), (("items", ".item"),)).extract(
+        backend.parse(PAGE), backend
+    )
+    assert backend.text(found["title"]) == "BảohiểmA"  # Like get_text(strip=True)
+    assert "missing" not in found
+    assert len(found["items"]) == 3
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_sanitize_in_place(name):
+    backend = get_html_backend(name)
+    document = backend.parse(
+        '<div class="body"><p>Giữ</p><script>x()</script><div class="ads"><p>Quảng cáo</p></div>'
+        '<style>p{}</style>lại</div>'
+    )
+    content = field_extractor((("content", ".body"),)).extract(document, backend)["content"]
+    html = backend.sanitize(content)
+    assert html.startswith('<div class="body">')
+    assert "script" not in html and "Quảng cáo" not in html and "style" not in html
+    assert backend.text(content) == "Giữlại"
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_crawler_parsers_agree_with_beautifulsoup(name):
+    backend = get_html_backend(name)
+    news, tvpl = crawlers()
+
+    def same(html, parse, drop=("crawled_at",)):
+        def strip(records):
+            return [{k: v for k, v in r.items() if k not in drop} for r in records]
+        assert strip(parse(backend.parse(html))) == strip(parse(BeautifulSoup(html, "lxml")))
+
+    for source, config in news.NEWS_SOURCES.items():
+        html = (FIXTURES / f"news_{source}.html").read_text(encoding="utf-8")
+        same(html, lambda doc: news._parse_source_articles(doc, source, config))
+
+    same((FIXTURES / "tvpl_search.html").read_text(encoding="utf-8"), tvpl.parse_search_results)
+    same(
+        (FIXTURES / "tvpl_document.html").read_text(encoding="utf-8"),
+        lambda doc: [tvpl._extract_document_fields(doc, "https://thuvienphapluat.vn/van-ban/x.aspx")],
+        drop=("content_full",)
+    )
+
+    article = (FIXTURES / "article_vnexpress.html").read_text(encoding="utf-8")
+    fast = news._extract_article_content(backend.parse(article), "vnexpress")
+    reference = news._extract_article_content(BeautifulSoup(article, "lxml"), "vnexpress")
+    assert BeautifulSoup(fast, "lxml").get_text() == BeautifulSoup(reference, "lxml").get_text()
+    assert "<script" not in fast and 'class="ads"' not in fast
+
+
+if __name__ == "__main__":
+    for backend_name in BACKENDS:
+        test_compiled_selectors_match_like_soupsieve(backend_name)
+        test_child_combinator_skips_deeper_descendants(backend_name)
+        test_one_pass_extraction_returns_first_and_every_match(backend_name)
+        test_sanitize_in_place(backend_name)
+        test_crawler_parsers_agree_with_beautifulsoup(backend_name)
+    print("✅ HTML backend tests passed")
@@ -0,0 +1,107 @@
+"""
+Tests for async LLM calls and the processor's bounded worker pool.
+Runs offline against httpx.MockTransport - no API keys needed.
+"""
+
+import sys
+import json
+import time
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from conftest import MockChatProvider
+from app.services.llm_service import LLMProvider
+from app.services.content_processor_async import ContentProcessorAsync
+
+LATENCY = 0.05
+
+REWRITE = {
+    "rewritten_title": "Phí bảo hiểm nhân thọ tăng mạnh",
+    "lead_paragraph": "Doanh thu phí tăng 12%.",
+    "analysis_section": "<p>Phân tích</p>",
+    "impact_section": "<p>Tác động</p>",
+    "conclusion": "Kết luận",
+    "meta_description": "Doanh thu phí bảo hiểm nhân thọ tăng 12%",
+    "tags": ["bảo hiểm"],
+}
+BRIEF = {"policy_brief_title": "[Mới] Thông tư 67/2023/TT-BTC", "executive_summary": "Hướng dẫn Luật KDBH"}
+
+
+def test_async_calls_run_concurrently_within_limit():
+    """20 rewrites with 4 slots take ~5 round-trips, never more than 4 in flight."""
+    api = MockChatProvider(json.dumps(REWRITE, ensure_ascii=False), latency=LATENCY)
+    llm = api.service(max_concurrency=4)
+
+    async def run():
+        return await asyncio.gather(*(
+            llm.rewrite_article_async(f"<p>Bài {i}</p>", f"Bài {i}", "CafeF") for i in range(20)
+        ))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert api.calls == 20 and api.peak == 4
+    assert elapsed < 20 * LATENCY / 2
+    assert results[0]["title"] == REWRITE["rewritten_title"]
+    assert "Doanh thu phí tăng 12%." in results[0]["content_html"]
+
+
+def test_anthropic_async_summary():
+    api = MockChatProvider(json.dumps(BRIEF, ensure_ascii=False), latency=LATENCY)
+    llm = api.service(LLMProvider.ANTHROPIC)
+
+    brief = asyncio.run(llm.summarize_legal_doc_async("Thông tư 67", "Nội dung", "67/2023/TT-BTC"))
+    assert brief["policy_brief_title"] == BRIEF["policy_brief_title"]
+    assert brief["executive_summary"] == BRIEF["executive_summary"]
+
+
+def test_processor_runs_items_through_bounded_pipeline():
+    """50 items on 10 workers finish in ~5 item latencies, with failures isolated."""
+    processor = ContentProcessorAsync(workers=10)
+    closed = {}
+    in_flight = 0
+    peak = 0
+
+    async def open_crawl_log(source, crawl_type):
+        return None
+
+    async def close_crawl_log(crawl_log, items_found, items_processed, metadata=None, error=None):
+        closed.update(found=items_found, processed=items_processed, error=error, metadata=metadata)
+
+    async def process_item(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(LATENCY)
+            if item["n"] == 7:
+                raise ValueError("LLM returned garbage")
+            return item["n"] % 5 != 0
+        finally:
+            in_flight -= 1
+
+    processor.open_crawl_log = open_crawl_log
+    processor.close_crawl_log = close_crawl_log
+    processor.process_news_article = process_item
+
+    started = time.perf_counter()
+    result = asyncio.run(processor.process_news_articles_from_data([{"n": n} for n in range(50)], {"render": {}}))
+    elapsed = time.perf_counter() - started
+
+    assert result == {"status": "success", "items_found": 50, "items_processed": 39}
+    assert closed["found"] == 50 and closed["processed"] == 39 and closed["error"] is None
+    assert closed["metadata"]["render"] == {}
+    assert closed["metadata"]["pipeline"]["news.process"]["errors"] == 1
+    assert peak == 10
+    assert elapsed < 50 * LATENCY / 4
+
+
+if __name__ == "__main__":
+    test_async_calls_run_concurrently_within_limit()
+    test_anthropic_async_summary()
+    test_processor_runs_items_through_bounded_pipeline()
+    print("✅ Async LLM tests passed")
@@ -0,0 +1,160 @@
+"""
+Tests for the provider batch mode, against the local API stub (llm_stub.py).
+Runs offline on httpx.ASGITransport - no API keys or network needed.
+"""
+
+import sys
+import asyncio
+import tempfile
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.llm_stub import create_stub_app, default_responder
+from app.services.llm_batch import OpenAIBatches, AnthropicBatches
+from app.services.llm_cache import LLMResponseCache
+from app.services.llm_service import LLMService, LLMProvider
+from app.services.content_processor_async import ContentProcessorAsync
+
+BODY = "<p>Doanh thu phí bảo hiểm nhân thọ quý III tăng 12% so với cùng kỳ năm trước.</p>" * 3
+
+
+class Responder:
+    """Stub responder counting completions; prompts containing `fail_on` error out."""
+
+    def __init__(self, fail_on: str = None):
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def __call__(self, system_message: str, prompt: str) -> str:
+        self.calls += 1
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("model overloaded")
+        return default_responder(system_message, prompt)
+
+
+def stub_service(provider: LLMProvider, responder: Responder, cache: LLMResponseCache, polls: int = 2) -> LLMService:
+    transport = httpx.ASGITransport(app=create_stub_app(responder, polls=polls))
+    llm = LLMService(provider=provider, cache=cache)
+    if provider == LLMProvider.OPENAI:
+        llm.batches = OpenAIBatches("test", "http://llm-stub/v1", transport=transport)
+        llm.async_client = openai.AsyncOpenAI(
+            api_key="test", base_url="http://llm-stub/v1", http_client=httpx.AsyncClient(transport=transport)
+        )
+    else:
+        llm.batches = AnthropicBatches("test", "http://llm-stub", transport=transport)
+    return llm
+
+
+@pytest.mark.parametrize("provider", [LLMProvider.OPENAI, LLMProvider.ANTHROPIC])
+def test_batch_results_match_interactive_and_fill_cache(provider):
+    responder = Responder()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm.sqlite3"))
+        llm = stub_service(provider, responder, cache)
+        requests = {
+            f"article-{i}": llm.rewrite_request(BODY + str(i), f"Bài {i}", "CafeF") for i in range(5)
+        }
+        requests["legal-1"] = llm.legal_summary_request("Thông tư 67", BODY, "67/2023/TT-BTC", "Thông tư", "2023-11-02")
+
+        results = asyncio.run(llm.run_batch(requests, poll_interval=0))
+        assert sorted(results) == sorted(requests) and responder.calls == 6
+        assert all(result.text and result.tokens > 0 and result.error is None for result in results.values())
+
+        rewrite = llm.parse_rewrite(results["article-3"].text, "Bài 3")
+        assert rewrite["title"].startswith("Bản tin bảo hiểm")
+        assert llm.parse_legal_summary(results["legal-1"].text, "67/2023/TT-BTC")["executive_summary"]
+
+        # Completed requests are cached: a re-run submits nothing
+        again = asyncio.run(llm.run_batch(requests, poll_interval=0))
+        assert responder.calls == 6
+        assert {k: r.text for k, r in again.items()} == {k: r.text for k, r in results.items()}
+
+        if provider == LLMProvider.OPENAI:
+            # ... and so does the interactive path for the same input
+            text = asyncio.run(llm.rewrite_article_async(BODY + "3", "Bài 3", "CafeF"))
+            assert text == rewrite and responder.calls == 6
+        cache.close()
+
+
+def test_failed_requests_and_timeouts():
+    responder = Responder(fail_on="Bài 2")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm.sqlite3"))
+        llm = stub_service(LLMProvider.ANTHROPIC, responder, cache, polls=0)
+        requests = {f"article-{i}": llm.rewrite_request(BODY, f"Bài {i}", "CafeF") for i in range(3)}
+
+        results = asyncio.run(llm.run_batch(requests, poll_interval=0))
+        assert results["article-2"].text is None and "model overloaded" in results["article-2"].error
+        assert results["article-1"].text is not None
+        assert cache.counters()["misses"] == 3 and cache.stats()["entries"] == 2
+
+        slow = stub_service(LLMProvider.OPENAI, Responder(), cache, polls=100)
+
+        async def run():
+            job = await slow.batches.submit([("article-9", slow._request_body(**requests["article-1"]))])
+            with pytest.raises(TimeoutError):
+                await slow.batches.wait(job, poll_interval=0, timeout=0)
+            return await slow.batches.get(job.id)
+
+        assert asyncio.run(run()).status == "cancelled"
+        cache.close()
+
+
+def test_processor_applies_batch_results():
+    """Rewrites and summaries are saved on the drafts; failed items stay pending."""
+    saved = []
+
+    class Draft(SimpleNamespace):
+        async def save(self):
+            saved.append(self.id)
+
+    articles = [
+        Draft(id=f"a{i}", title=f"Bài {i}", slug=f"bai-{i}", content_html=BODY + str(i), summary="",
+              source_name="CafeF", meta_title=None, meta_description=None, processed_at=None,
+              updated_at=None, status="draft", published_at=None)
+        for i in range(3)
+    ]
+    articles.append(Draft(id="short", title="Tin ngắn", content_html="<p>ngắn</p>"))
+    documents = [
+        Draft(id="d1", title="Thông tư 67", doc_number="67/2023/TT-BTC", doc_type="Thông tư", content_full=BODY,
+              content_summary=None, issue_date=date(2023, 11, 2), effective_date=None, issuing_body="Bộ Tài chính",
+              updated_at=None)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm.sqlite3"))
+        processor = ContentProcessorAsync(batch_mode=True)
+        processor.llm_service = stub_service(LLMProvider.OPENAI, Responder(fail_on="Bài 1"), cache, polls=1)
+
+        poll_seconds = settings.LLM_BATCH_POLL_SECONDS
+        settings.LLM_BATCH_POLL_SECONDS = 0
+        try:
+            result = asyncio.run(processor.process_batches(articles, documents))
+        finally:
+            settings.LLM_BATCH_POLL_SECONDS = poll_seconds
+        cache.close()
+
+    assert result == {"status": "success", "items_found": 4, "items_processed": 3,
+                      "articles": 2, "legal_docs": 1, "failed": 1}
+    assert sorted(saved) == ["a0", "a2", "d1"]
+    assert articles[0].title.startswith("Bản tin bảo hiểm") and articles[0].slug.startswith("ban-tin-bao-hiem")
+    assert articles[0].processed_at is not None and articles[0].meta_description == articles[0].summary
+    assert articles[1].processed_at is None and articles[1].title == "Bài 1"
+    assert documents[0].content_summary.startswith("Tóm tắt văn bản")
+
+
+if __name__ == "__main__":
+    for provider in LLMProvider:
+        test_batch_results_match_interactive_and_fill_cache(provider)
+    test_failed_requests_and_timeouts()
+    test_processor_applies_batch_results()
+    print("✅ LLM batch tests passed")
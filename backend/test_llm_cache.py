@@ -0,0 +1,152 @@
+"""
+Tests for the persistent LLM response cache.
+Runs offline against httpx.MockTransport - no API keys needed.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import unicodedata
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from conftest import MockChatProvider
+from app.services import content_processor_async
+from app.services.llm_cache import LLMResponseCache, cache_key
+from app.services.prompt_templates import InsuranceJournalistPrompts
+from app.services.content_processor_async import ContentProcessorAsync
+
+BRIEF = {"policy_brief_title": "[Mới] Thông tư 67/2023/TT-BTC", "executive_summary": "Hướng dẫn Luật KDBH"}
+CONTENT = "Điều 1. Phạm vi điều chỉnh\n\nThông tư này hướng dẫn   Luật Kinh doanh bảo hiểm."
+
+
+def test_key_covers_request_and_ignores_whitespace():
+    base = ("openai", "gpt-4o", 0.3, 4000, "1", "Bạn là nhà báo", CONTENT)
+    assert cache_key(*base) == cache_key(*base[:6], "  " + CONTENT.replace("   ", " ").replace("\n\n", "\n") + "\n")
+    # Decomposed (NFD) Vietnamese text from another page encoding maps to the same key
+    assert cache_key(*base) == cache_key(*base[:6], unicodedata.normalize("NFD", CONTENT))
+
+    for i, changed in [(1, "gpt-4o-mini"), (2, 0.7), (3, 2000), (4, "2"), (5, "Bạn là luật sư")]:
+        variant = list(base)
+        variant[i] = changed
+        assert cache_key(*variant) != cache_key(*base)
+
+
+def test_repeated_requests_are_served_from_cache():
+    """A re-run sends nothing to the provider; a new template version does."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm.sqlite3"))
+        api = MockChatProvider(json.dumps(BRIEF, ensure_ascii=False), usage=(900, 300))
+        llm = api.service(cache=cache)
+
+        first = llm.summarize_legal_doc("Thông tư 67", CONTENT, "67/2023/TT-BTC", issue_date="2023-11-02")
+        again = asyncio.run(llm.summarize_legal_doc_async(
+            "Thông tư 67", CONTENT + "\n", "67/2023/TT-BTC", issue_date="2023-11-02"
+        ))
+        assert api.calls == 1
+        assert again == first and first["executive_summary"] == BRIEF["executive_summary"]
+        assert cache.counters() == {"hits": 1, "misses": 1, "tokens_saved": 1200}
+
+        version = InsuranceJournalistPrompts.VERSION
+        InsuranceJournalistPrompts.VERSION = version + "-next"
+        try:
+            llm.summarize_legal_doc("Thông tư 67", CONTENT, "67/2023/TT-BTC", issue_date="2023-11-02")
+        finally:
+            InsuranceJournalistPrompts.VERSION = version
+        assert api.calls == 2
+        cache.close()
+
+
+def test_async_requests_use_the_cache_off_the_event_loop():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm.sqlite3"))
+        llm = MockChatProvider(json.dumps(BRIEF, ensure_ascii=False)).service(cache=cache)
+        threads = []
+        for name in ("get", "store"):
+            method = getattr(cache, name)
+            setattr(cache, name, lambda *args, method=method: threads.append(threading.get_ident()) or method(*args))
+
+        async def run():
+            await llm.generate_completion_async("Tóm tắt", prompt_version="v1")
+            await llm.generate_completion_async("Tóm tắt", prompt_version="v1")
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+        cache.close()
+
+    assert len(threads) == 3 and loop_thread not in threads
+    assert cache.counters()["hits"] == 1
+
+
+def test_eviction_by_age_and_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm.sqlite3"), max_bytes=2000, max_age_days=1)
+        cache.store("old", "cũ", tokens=10)
+        cache._conn.execute("UPDATE completions SET created_at = ? WHERE key = 'old'", (time.time() - 2 * 86400,))
+        assert cache.get("old") is None
+
+        for i in range(10):
+            cache.store(f"k{i}", os.urandom(300).hex(), tokens=100)
+        stats = cache.stats()
+        assert stats["size_bytes"] <= 2000 and stats["entries"] < 10
+        assert cache.get("k9") is not None and cache.get("k0") is None
+        assert stats["evictions"] >= 1 + (10 - stats["entries"])
+        cache.close()
+
+
+def test_crawl_log_records_run_cache_counters():
+    class FakeCrawlLog(SimpleNamespace):
+        created = 0
+
+        def __init__(self, source, crawl_type, status):
+            FakeCrawlLog.created += 1
+            super().__init__(id=FakeCrawlLog.created, source=source, crawl_type=crawl_type, status=status, metadata={})
+
+        async def insert(self):
+            pass
+
+        async def save(self):
+            pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMResponseCache(str(Path(tmp) / "llm.sqlite3"))
+        api = MockChatProvider(json.dumps(BRIEF, ensure_ascii=False), usage=(900, 300))
+        processor = ContentProcessorAsync()
+        processor.llm_service = api.service(cache=cache)
+        processor.legal_frontier = None
+        cache.get("warm-up")  # Earlier activity in the process is not attributed to the run
+
+        async def run():
+            crawl_log = await processor.open_crawl_log("TVPL_Advanced", "legal_docs")
+            for _ in range(3):
+                await processor.llm_service.summarize_legal_doc_async("Thông tư 67", CONTENT, "67/2023/TT-BTC")
+            await processor.close_crawl_log(crawl_log, items_found=3, items_processed=3)
+            return crawl_log
+
+        real_crawl_log = content_processor_async.CrawlLog
+        content_processor_async.CrawlLog = FakeCrawlLog
+        try:
+            crawl_log = asyncio.run(run())
+        finally:
+            content_processor_async.CrawlLog = real_crawl_log
+
+        assert crawl_log.status == "completed"
+        assert crawl_log.metadata["llm_cache"] == {"hits": 2, "misses": 1, "tokens_saved": 2400}
+        assert api.calls == 1
+        cache.close()
+
+
+if __name__ == "__main__":
+    test_key_covers_request_and_ignores_whitespace()
+    test_repeated_requests_are_served_from_cache()
+    test_async_requests_use_the_cache_off_the_event_loop()
+    test_eviction_by_age_and_size()
+    test_crawl_log_records_run_cache_counters()
+    print("✅ LLM cache tests passed")
@@ -0,0 +1,104 @@
+"""
+Tests for cross-source near-duplicate detection (MinHash-LSH index)
+(timings: benchmark_near_duplicates.py).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from beanie import PydanticObjectId
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmark_near_duplicates import write_index_file, near_copy_queries
+from app.crawlers.near_duplicates import NearDuplicateIndex, article_signature, similarity
+
+STORY = (
+    "<p>Bộ Tài chính vừa ban hành thông tư hướng dẫn Luật Kinh doanh bảo hiểm, trong đó quy định "
+    "doanh nghiệp bảo hiểm nhân thọ phải ghi âm, ghi hình quá trình tư vấn khi bán sản phẩm bảo hiểm "
+    "liên kết đầu tư. Quy định có hiệu lực từ ngày 1/7 và áp dụng cho cả kênh ngân hàng.</p>"
+    "<p>Theo cơ quan quản lý, thay đổi nhằm tăng tính minh bạch và bảo vệ quyền lợi người mua bảo hiểm "
+    "sau hàng loạt khiếu nại về việc tư vấn sai lệch trong năm qua.</p>"
+)
+REPUBLISHED = STORY.replace("vừa ban hành", "đã ban hành") + "<p>Nguồn: VnExpress</p>"
+OTHER_STORY = (
+    "<p>Doanh thu phí bảo hiểm phi nhân thọ quý III tăng 12% so với cùng kỳ, dẫn đầu là bảo hiểm sức khỏe "
+    "và bảo hiểm xe cơ giới. Nhiều doanh nghiệp đẩy mạnh bán hàng qua nền tảng số và hợp tác với các "
+    "công ty công nghệ để mở rộng tệp khách hàng trẻ tại các đô thị lớn.</p>"
+)
+
+
+def test_republished_story_is_linked_across_runs():
+    """A re-published copy matches the stored article after a restart; other stories do not."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "news_minhash.bin")
+        original = article_signature("Bắt buộc ghi âm khi tư vấn bảo hiểm", STORY)
+
+        index = NearDuplicateIndex(path, threshold=0.7)
+        index.add(original, b"article-0001")
+        # Visible before flushing (same run)
+        assert index.find(article_signature("Bắt buộc ghi âm khi tư vấn bảo hiểm", REPUBLISHED)) == b"article-0001"
+        index.flush()
+
+        reopened = NearDuplicateIndex(path, threshold=0.7)
+        assert len(reopened) == 1
+        copy = article_signature("Bat buoc ghi am khi tu van bao hiem", REPUBLISHED)
+        assert reopened.find(copy) == b"article-0001"
+        assert reopened.find(article_signature("Phí bảo hiểm quý III", OTHER_STORY)) is None
+        del reopened, index
+
+
+def test_ids_ending_in_nul_bytes_survive_the_file():
+    """ObjectIds ending in \\x00 (1 in 256) read back as all 12 bytes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "news_minhash.bin")
+        article_id = PydanticObjectId(bytes.fromhex("65f1a2b3c4d5e6f7a8b90000"))
+        signature = article_signature("Bắt buộc ghi âm khi tư vấn bảo hiểm", STORY)
+
+        index = NearDuplicateIndex(path, threshold=0.7)
+        index.add(signature, article_id.binary)
+        index.flush()
+
+        found = NearDuplicateIndex(path, threshold=0.7).find(article_signature(None, REPUBLISHED))
+        assert found == article_id.binary and PydanticObjectId(found) == article_id
+        del index
+
+
+def test_short_text_has_no_signature():
+    assert article_signature("Bảo hiểm", "<p>Tin ngắn</p>") is None
+
+
+def test_discard_drops_unstored_article():
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(os.path.join(tmp, "news_minhash.bin"), threshold=0.7)
+        signature = article_signature(None, STORY)
+        index.add(signature, b"article-0002")
+        index.discard(b"article-0002")
+        assert index.find(signature) is None
+
+
+def test_near_copy_is_found_among_many_articles():
+    """Among 20k stored signatures only the near copy's original matches."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "news_minhash.bin")
+        records = write_index_file(path, 20_000)
+        position, queries = near_copy_queries(records, 200)
+        assert similarity(records['signature'][position], queries[0]) >= 0.7
+
+        index = NearDuplicateIndex(path, threshold=0.7)
+        assert len(index) == 20_000
+        assert index.find(queries[0]) == b"%012d" % position
+        assert not any(index.find(query) for query in queries[1:])
+        del index
+
+
+if __name__ == "__main__":
+    test_republished_story_is_linked_across_runs()
+    test_ids_ending_in_nul_bytes_survive_the_file()
+    test_short_text_has_no_signature()
+    test_discard_drops_unstored_article()
+    test_near_copy_is_found_among_many_articles()
+    print("✅ Near-duplicate tests passed")
@@ -0,0 +1,146 @@
+"""
+Tests for the raw-page archive and offline re-parsing.
+Runs offline against httpx.MockTransport - no network access needed.
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.page_archive import PageArchive, read_body
+from app.crawlers.politeness import PolitenessScheduler
+from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+from app.crawlers import reparse
+from app.crawlers.reparse import reparse_pages, classify, NEWS_ARTICLE, NEWS_LISTING, LEGAL_DOCUMENT
+from app.core.config import settings
+
+ARTICLE_HTML = '<html><body><div class="fck_detail"><p>Phí bảo hiểm tăng</p></div></body></html>'
+DOC_HTML = (
+    '<html><body><h1>Thông tư 67/2023/TT-BTC</h1><div class="so-hieu">67/2023/TT-BTC</div>'
+    '<div class="nguoi-ky">Nguyễn Văn A</div><div class="noi-dung"><p>Hướng dẫn Luật Kinh doanh bảo hiểm</p></div>'
+    '</body></html>'
+)
+
+
+def test_archive_deduplicates_bodies_and_rolls_segments():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp, segment_bytes=64)
+        first = archive.store("https://cafef.vn/a.chn", {"ETag": '"1"'}, b"same body " * 20)
+        second = archive.store("https://cafef.vn/a.chn", {"ETag": '"1"'}, b"same body " * 20)
+        archive.store("https://cafef.vn/b.chn", {}, os.urandom(200))
+
+        assert first == second
+        stats = archive.stats()
+        assert stats["fetches"] == 3 and stats["bodies"] == 2
+
+        latest = list(archive.pages())
+        assert [page.url for page in latest] == ["https://cafef.vn/a.chn", "https://cafef.vn/b.chn"]
+        assert len(list(archive.pages(latest_only=False))) == 3
+        assert read_body(latest[0]) == b"same body " * 20
+        assert latest[0].headers == {"etag": '"1"'}
+        assert latest[0].segment != latest[1].segment
+        archive.close()
+
+
+def test_archive_drops_old_records_and_segments_over_size():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp, segment_bytes=250, max_bytes=600, max_age_days=1)
+        for i in range(8):
+            archive.store(f"https://cafef.vn/{i}.chn", {}, os.urandom(200))
+        segments = sorted(name for name in os.listdir(tmp) if name.startswith("segment-"))
+        assert len(segments) == 3 and segments[-1] == "segment-00007.z"
+        assert [page.url for page in archive.pages()] == [f"https://cafef.vn/{i}.chn" for i in (5, 6, 7)]
+
+        # Records past the age limit go, and their segments with them
+        archive._conn.execute("UPDATE fetches SET fetched_at = fetched_at - 2 * 86400 WHERE url LIKE '%5.chn'")
+        archive._conn.commit()
+        archive.store("https://cafef.vn/8.chn", {}, os.urandom(200))
+        assert "segment-00005.z" not in os.listdir(tmp)
+        assert [page.url for page in archive.pages()] == [f"https://cafef.vn/{i}.chn" for i in (6, 7, 8)]
+        assert archive.stats()["evictions"] == 6
+        archive.close()
+
+        # A reopened archive continues after the newest segment
+        reopened = PageArchive(tmp, segment_bytes=250, max_bytes=600, max_age_days=1)
+        reopened.store("https://cafef.vn/9.chn", {}, os.urandom(200))
+        assert "segment-00009.z" in os.listdir(tmp)
+        reopened.close()
+
+
+def test_fetched_pages_are_archived():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, html=ARTICLE_HTML)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        scheduler = PolitenessScheduler(default_delay=0, host_delays={}, respect_robots=False)
+        crawler = NewsAggregatorAdvanced(use_playwright=False, scheduler=scheduler, archive=archive)
+
+        async def run():
+            crawler._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                await crawler.fetch_page_async("https://m.vnexpress.net/phi-bao-hiem-4791234.html?utm_source=x")
+            finally:
+                await crawler.aclose()
+
+        asyncio.run(run())
+        pages = list(archive.pages())
+        assert [page.url for page in pages] == ["https://vnexpress.net/phi-bao-hiem-4791234.html"]
+        assert read_body(pages[0]).decode("utf-8") == ARTICLE_HTML
+        archive.close()
+
+
+def test_reparse_runs_current_parsers_in_parallel():
+    assert classify("https://vnexpress.net/kinh-doanh/bao-hiem")[0] == NEWS_LISTING
+    assert classify("https://vnexpress.net/phi-bao-hiem-4791234.html") == (NEWS_ARTICLE, "vnexpress")
+    assert classify("https://example.com/") == (None, None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.store("https://vnexpress.net/phi-bao-hiem-4791234.html", {}, ARTICLE_HTML.encode("utf-8"), "utf-8")
+        archive.store("https://thuvienphapluat.vn/van-ban/thong-tu-67-2023.aspx", {}, DOC_HTML.encode("utf-8"), "utf-8")
+        archive.store("https://example.com/", {}, b"<html></html>")
+
+        # A corrupt record is reported in its result without stopping the others
+        pages = list(archive.pages())
+        pages.insert(1, pages[0]._replace(offset=1))
+        results = list(reparse_pages(pages, workers=2))
+        archive.close()
+
+    assert [r["kind"] for r in results] == [NEWS_ARTICLE, NEWS_ARTICLE, LEGAL_DOCUMENT]
+    assert "Phí bảo hiểm tăng" in results[0]["fields"]["content_html"] and results[0]["error"] is None
+    assert results[1]["fields"] is None and results[1]["error"].startswith("error:")
+    assert results[2]["fields"]["doc_number"] == "67/2023/TT-BTC"
+    assert results[2]["fields"]["signer"] == "Nguyễn Văn A"
+
+
+def test_reparse_workers_open_no_crawler_stores():
+    """Worker crawlers only parse: no HTTP cache, frontier or archive (whose eviction would race)."""
+    enabled = {name: getattr(settings, name) for name in reparse.PARSER_DISABLED_STORES}
+    for name in enabled:
+        setattr(settings, name, True)
+    try:
+        reparse._init_worker()
+        assert all(getattr(settings, name) for name in enabled)
+    finally:
+        for name, value in enabled.items():
+            setattr(settings, name, value)
+
+    for crawler in (reparse._news_crawler, reparse._tvpl_crawler):
+        assert crawler.http_cache is None and crawler.frontier is None and crawler.archive is None
+
+
+if __name__ == "__main__":
+    test_archive_deduplicates_bodies_and_rolls_segments()
+    test_archive_drops_old_records_and_segments_over_size()
+    test_fetched_pages_are_archived()
+    test_reparse_runs_current_parsers_in_parallel()
+    test_reparse_workers_open_no_crawler_stores()
+    print("✅ Page archive tests passed")
@@ -0,0 +1,81 @@
+"""
+Tests for the offline parser benchmarks (benchmark_parsers.py).
+Every parser runs on its recorded fixture - no network access needed.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import benchmark_parsers
+from benchmark_parsers import build_benchmarks, load_fixture, run_benchmark, compare, record_fixtures, fixture_for
+from app.crawlers.html_backend import get_html_backend, LXML
+from app.crawlers.page_archive import PageArchive
+from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+
+
+def test_every_source_has_a_fixture_that_parses():
+    benchmarks = {b.name: b for b in build_benchmarks()}
+    for source in NewsAggregatorAdvanced.NEWS_SOURCES:
+        assert f"news.{source}" in benchmarks
+    assert {"tvpl.search", "tvpl.document", "clean_html"} <= set(benchmarks)
+
+    for benchmark in benchmarks.values():
+        items = benchmark.parse(load_fixture(benchmark.fixture), None)
+        assert items, f"{benchmark.name} parsed no items from {benchmark.fixture}"
+
+
+def test_run_benchmark_reports_throughput_and_memory():
+    benchmark = next(b for b in build_benchmarks() if b.name == "tvpl.search")
+    result = run_benchmark(benchmark, rounds=2, backend=get_html_backend(LXML))
+    assert result["items"] == 20
+    assert result["ms_per_page"] > 0 and result["items_per_second"] > 0 and result["peak_kb"] > 0
+
+
+def test_compare_flags_regressions():
+    baseline = {"news.cafef@bs4": {"items": 40, "ms_per_page": 10.0, "items_per_second": 4000.0, "peak_kb": 500.0}}
+    assert compare({"news.cafef@bs4": {"items": 40, "ms_per_page": 11.0, "items_per_second": 3600.0, "peak_kb": 520.0}}, baseline) == []
+
+    regressions = compare(
+        {"news.cafef@bs4": {"items": 39, "ms_per_page": 20.0, "items_per_second": 1950.0, "peak_kb": 900.0}},
+        baseline
+    )
+    assert len(regressions) == 3
+
+
+def test_record_replaces_fixtures_from_archive():
+    assert fixture_for("https://vnexpress.net/kinh-doanh/bao-hiem") == "news_vnexpress.html"
+    assert fixture_for("https://example.com/") is None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixtures = Path(tmp) / "fixtures"
+        fixtures.mkdir()
+        (fixtures / "news_cafef.html").write_text("old", encoding="utf-8")
+
+        archive = PageArchive(str(Path(tmp) / "archive"))
+        archive.store("https://cafef.vn/bao-hiem.chn", {}, "<html>cũ</html>".encode("utf-8"), "utf-8")
+        archive.store("https://cafef.vn/bao-hiem.chn", {}, "<html>mới</html>".encode("utf-8"), "utf-8")
+        archive.store("https://vnexpress.net/kinh-doanh/bao-hiem", {}, b"<html></html>", "utf-8")
+        archive.close()
+
+        original = benchmark_parsers.FIXTURE_DIR
+        benchmark_parsers.FIXTURE_DIR = fixtures
+        try:
+            written = record_fixtures(str(Path(tmp) / "archive"))
+        finally:
+            benchmark_parsers.FIXTURE_DIR = original
+
+        # Only fixtures that already exist are replaced
+        assert written == ["news_cafef.html"]
+        assert (fixtures / "news_cafef.html").read_text(encoding="utf-8") == "<html>mới</html>"
+
+
+if __name__ == "__main__":
+    test_every_source_has_a_fixture_that_parses()
+    test_run_benchmark_reports_throughput_and_memory()
+    test_compare_flags_regressions()
+    test_record_replaces_fixtures_from_archive()
+    print("✅ Parser benchmark tests passed")
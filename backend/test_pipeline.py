@@ -0,0 +1,93 @@
+"""
+Tests for the concurrent crawl pipeline (bounded queues, global budget, cancellation).
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.pipeline import CrawlPipeline
+
+
+def test_pipeline_runs_modules_concurrently_within_budget():
+    """Two modules share the concurrency budget and every item reaches the last stage."""
+    in_flight = 0
+    peak = 0
+    stored = []
+
+    async def crawl(prefix: str, count: int):
+        for i in range(count):
+            await asyncio.sleep(0.001)
+            yield f"{prefix}-{i}"
+
+    async def enrich(item: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return item.upper()
+
+    async def store(item: str) -> bool:
+        stored.append(item)
+        return not item.endswith("-3")  # One item "already exists"
+
+    async def run():
+        pipeline = CrawlPipeline(max_concurrency=3, queue_size=2)
+        for module in ("legal", "news"):
+            found = pipeline.add_source(f"{module}.crawl", crawl(module, 10))
+            enriched = pipeline.add_stage(f"{module}.enrich", found, enrich, workers=4, emit=True)
+            pipeline.add_stage(f"{module}.store", enriched, store, workers=2)
+        return await pipeline.run()
+
+    report = asyncio.run(run())
+
+    assert len(stored) == 20
+    assert peak <= 3
+    assert report["legal.crawl"]["items_out"] == 10
+    assert report["news.enrich"]["items_out"] == 10
+    assert report["news.store"]["items_in"] == 10 and report["news.store"]["items_out"] == 9
+    assert report["legal.store"]["items_per_second"] > 0
+
+
+def test_pipeline_cancellation_closes_sources():
+    """Cancelling the run stops every stage and runs the crawlers' cleanup."""
+    closed = []
+
+    async def endless():
+        try:
+            while True:
+                await asyncio.sleep(0.001)
+                yield "item"
+        finally:
+            closed.append(True)
+
+    async def slow(item: str) -> str:
+        await asyncio.sleep(1)
+        return item
+
+    async def run():
+        pipeline = CrawlPipeline(max_concurrency=2, queue_size=2)
+        pipeline.add_stage("slow", pipeline.add_source("endless", endless()), slow, workers=2)
+        task = asyncio.create_task(pipeline.run())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return pipeline.report()
+
+    report = asyncio.run(run())
+
+    assert closed == [True]
+    assert report["endless"]["items_in"] <= 5  # Backpressure held the source back
+
+
+if __name__ == "__main__":
+    test_pipeline_runs_modules_concurrently_within_budget()
+    test_pipeline_cancellation_closes_sources()
+    print("✅ Pipeline tests passed")
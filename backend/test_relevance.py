@@ -0,0 +1,51 @@
+"""
+Tests for the keyword relevance matcher (timings: benchmark_relevance.py).
+"""
+
+import sys
+import unicodedata
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmark_relevance import make_corpus, loop_is_relevant
+from app.crawlers.relevance import KeywordMatcher, fold_diacritics, get_relevance_matcher
+
+
+def test_matcher_folds_diacritics_and_normal_forms():
+    """Unaccented and NFD text match the same keywords as NFC text."""
+    matcher = get_relevance_matcher()
+
+    assert fold_diacritics("Đền bù Bảo Hiểm") == "den bu bao hiem"
+    assert matcher.find("Giá BAO HIEM xe máy") == ["bảo hiểm"]
+    assert matcher.find(unicodedata.normalize("NFD", "Bồi thường bảo hiểm")) == ["bồi thường", "bảo hiểm"]
+    # Whole words only, and the longest keyword wins over its suffix
+    assert matcher.find("baohiem bảo hiểmxe") == []
+    assert matcher.find("Phí bảo hiểm tăng") == ["phí bảo hiểm"]
+
+
+def test_matcher_scores_weighted_terms():
+    """Title matches count TITLE_WEIGHT times; the score orders items for ranking."""
+    matcher = KeywordMatcher({"bảo hiểm": 1.0, "phí bảo hiểm": 2.0}, title_weight=2.0)
+
+    relevance = matcher.score("Phí bảo hiểm tăng", "Các công ty bao hiem điều chỉnh phí bảo hiểm")
+    assert relevance.terms == ["phí bảo hiểm", "bảo hiểm"]
+    assert relevance.score == 2.0 * 2.0 + 1.0 + 2.0
+
+    assert matcher.score("Giá vàng hôm nay", "Bão số 3 đổ bộ").score == 0.0
+
+
+def test_matcher_accepts_everything_the_loop_did():
+    """No article the old filter kept is dropped by the matcher."""
+    matcher = get_relevance_matcher()
+    for title, summary in make_corpus(500):
+        if loop_is_relevant(title, summary):
+            assert matcher.score(title, summary).score >= 1.0
+
+
+if __name__ == "__main__":
+    test_matcher_folds_diacritics_and_normal_forms()
+    test_matcher_scores_weighted_terms()
+    test_matcher_accepts_everything_the_loop_did()
+    print("✅ Relevance matcher tests passed")
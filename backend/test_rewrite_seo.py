@@ -0,0 +1,147 @@
+"""
+Tests for the combined rewrite + SEO metadata call.
+Runs offline against httpx.MockTransport - no API keys needed.
+"""
+
+import sys
+import json
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from beanie import PydanticObjectId
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from conftest import MockChatProvider
+from app.services import content_processor_async
+from app.services.llm_cache import LLMResponseCache
+from app.services.content_processor_async import ContentProcessorAsync
+
+BODY = "<p>Doanh thu phí bảo hiểm nhân thọ quý III tăng 12% so với cùng kỳ năm trước.</p>" * 3
+REWRITE = {
+    "rewritten_title": "Phí bảo hiểm nhân thọ tăng 12% trong quý III",
+    "lead_paragraph": "Doanh thu phí bảo hiểm nhân thọ quý III tăng 12%.",
+    "analysis_section": "<p>Phân tích</p>",
+    "impact_section": "<p>Tác động</p>",
+    "disclaimer": None,
+    "conclusion": "Kết luận",
+    "meta_title": "Phí bảo hiểm nhân thọ quý III tăng 12%",
+    "meta_description": "Doanh thu phí bảo hiểm nhân thọ quý III tăng 12% so với cùng kỳ.",
+    "keywords": ["bảo hiểm nhân thọ", "doanh thu phí"],
+    "og_title": "Bảo hiểm nhân thọ tăng trưởng trở lại",
+    "og_description": "Quý III ghi nhận mức tăng 12%.",
+    "tags": ["bảo hiểm", "thị trường"],
+    "estimated_reading_time": 4,
+}
+
+
+def test_rewrite_returns_validated_seo_fields():
+    api = MockChatProvider("```json\n" + json.dumps(REWRITE, ensure_ascii=False) + "\n```", usage=(2000, 800))
+    llm = api.service()
+
+    result = asyncio.run(llm.rewrite_article_async(BODY, "Bài gốc", "CafeF"))
+    assert len(api.requests) == 1 and api.requests[0]["response_format"] == {"type": "json_object"}
+    assert result["title"] == REWRITE["rewritten_title"]
+    for field in ("meta_title", "meta_description", "keywords", "og_title", "og_description"):
+        assert result[field] == REWRITE[field]
+    assert llm.usage["calls"] == 1 and llm.usage["tokens"] == 2800
+    assert llm.usage["seo_calls_saved"] == 1 and llm.usage["seo_tokens_saved"] > 0
+
+
+def test_missing_seo_fields_are_derived_and_bad_output_falls_back():
+    partial = {k: REWRITE[k] for k in ("rewritten_title", "lead_paragraph", "analysis_section", "impact_section")}
+    result = MockChatProvider("").service().parse_rewrite(json.dumps(partial, ensure_ascii=False), "Bài gốc")
+    assert result["meta_title"] == REWRITE["rewritten_title"]
+    assert result["meta_description"] == result["og_description"] == REWRITE["lead_paragraph"]
+
+    llm = MockChatProvider("").service()
+    for reply in ("Xin lỗi, tôi không thể", json.dumps({"rewritten_title": "Thiếu nội dung"}),
+                  json.dumps({**REWRITE, "tags": "bảo hiểm"})):
+        result = llm.parse_rewrite(reply, "Bài gốc")
+        assert result["title"] == "Bài gốc" and result["meta_title"] == "Bài gốc"
+
+
+def test_only_answered_valid_rewrites_count_as_seo_savings():
+    """Cache hits and schema fallbacks save no SEO request; the estimate is made once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        api = MockChatProvider(json.dumps(REWRITE, ensure_ascii=False), usage=(2000, 800))
+        llm = api.service(cache=LLMResponseCache(str(Path(tmp) / "llm.sqlite3")))
+        counted = []
+        count = llm.tokens.count
+        llm.tokens.count = lambda text: counted.append(text) or count(text)
+        try:
+            for body in (BODY, BODY, BODY + "2"):
+                asyncio.run(llm.rewrite_article_async(body, "Bài gốc", "CafeF"))
+        finally:
+            del llm.tokens.count
+        llm.cache.close()
+
+    assert len(api.requests) == 2 and llm.usage["seo_calls_saved"] == 2
+    seo_prompts = [text for text in counted if "Generate SEO metadata" in text]
+    assert len(seo_prompts) == 1 and llm.usage["seo_tokens_saved"] > 2 * llm.tokens.count(seo_prompts[0])
+
+    api = MockChatProvider("Xin lỗi, tôi không thể")
+    llm = api.service()
+    result = asyncio.run(llm.rewrite_article_async(BODY, "Bài gốc", "CafeF"))
+    assert result["title"] == "Bài gốc" and llm.usage["calls"] == 1
+    assert llm.usage["seo_calls_saved"] == 0 and llm.usage["seo_tokens_saved"] == 0
+
+
+def test_processor_makes_one_call_per_article_and_reports_savings():
+    stored = []
+
+    class FakeArticle(SimpleNamespace):
+        async def insert(self):
+            stored.append(self)
+
+    class FakeCrawlLog(SimpleNamespace):
+        def __init__(self, source, crawl_type, status):
+            super().__init__(id=1, source=source, crawl_type=crawl_type, status=status, metadata={})
+
+        async def insert(self):
+            pass
+
+        async def save(self):
+            pass
+
+    api = MockChatProvider(json.dumps(REWRITE, ensure_ascii=False), usage=(2000, 800))
+    processor = ContentProcessorAsync(batch_mode=False)
+    processor.llm_service = api.service()
+    processor.news_frontier = processor.near_duplicates = None
+
+    async def run():
+        crawl_log = await processor.open_crawl_log("NewsAggregator_Advanced", "news_articles")
+        for i in range(3):
+            await processor._rewrite_and_store_article(
+                PydanticObjectId(), f"https://cafef.vn/bai-{i}.chn", {"source_name": "CafeF"},
+                f"Bài {i}", BODY + str(i), ""
+            )
+        await processor.close_crawl_log(crawl_log, items_found=3, items_processed=3)
+        return crawl_log
+
+    real = content_processor_async.Article, content_processor_async.CrawlLog
+    content_processor_async.Article, content_processor_async.CrawlLog = FakeArticle, FakeCrawlLog
+    try:
+        crawl_log = asyncio.run(run())
+    finally:
+        content_processor_async.Article, content_processor_async.CrawlLog = real
+
+    assert len(api.requests) == 3
+    assert stored[0].meta_title == REWRITE["meta_title"] and stored[0].meta_description == REWRITE["meta_description"]
+    assert stored[0].tags == REWRITE["tags"] and stored[0].processed_at is not None
+
+    usage = crawl_log.metadata["llm_usage"]
+    assert usage["calls"] == 3 and usage["tokens"] == 3 * 2800
+    assert usage["seo_calls_saved"] == 3 and usage["seo_tokens_saved"] > 0
+    assert usage["seo_seconds_saved"] >= 0
+
+
+if __name__ == "__main__":
+    test_rewrite_returns_validated_seo_fields()
+    test_missing_seo_fields_are_derived_and_bad_output_falls_back()
+    test_only_answered_valid_rewrites_count_as_seo_savings()
+    test_processor_makes_one_call_per_article_and_reports_savings()
+    print("✅ Rewrite + SEO tests passed")
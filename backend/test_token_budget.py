@@ -0,0 +1,200 @@
+"""
+Tests for prompt token budgets and map-reduce summaries of long legal texts.
+Runs offline against httpx.MockTransport - no API keys needed.
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import openai
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from conftest import MockChatProvider
+from app.core.config import settings
+from app.services.tokens import TokenCounter, split_legal_text, legal_text
+from app.services.llm_batch import OpenAIBatches
+from app.services.llm_stub import create_stub_app
+from app.services.llm_service import LLMService, LLMProvider
+from app.services.prompt_templates import AIContentEngineConfig
+from app.services.content_processor_async import ContentProcessorAsync
+
+BRIEF = {"policy_brief_title": "[Mới] Nghị định 46/2023/NĐ-CP", "executive_summary": "Hướng dẫn Luật KDBH"}
+CLAUSE = "Doanh nghiệp bảo hiểm phải trích lập dự phòng nghiệp vụ theo quy định của Bộ Tài chính. "
+
+
+def decree(chapters: int = 6, articles: int = 10) -> str:
+    """A long decree: `chapters` chapters of `articles` articles."""
+    parts = []
+    for c in range(1, chapters + 1):
+        parts.append(f"Chương {['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII'][c - 1]}\nQUY ĐỊNH PHẦN {c}")
+        for a in range((c - 1) * articles + 1, c * articles + 1):
+            parts.append(f"Điều {a}. Nội dung điều {a}\n" + CLAUSE * 12)
+    return "\n".join(parts)
+
+
+def decree_html(chapters: int = 6, articles: int = 10) -> str:
+    """`decree()` as the crawlers store `content_full`: sanitized HTML without line breaks."""
+    paragraphs = "".join(
+        f'<p style="text-align:center"><b>{line}</b></p>' if line.startswith(("Chương", "QUY ĐỊNH"))
+        else f"<p><b>{line.split('. ', 1)[0]}.</b> {line.split('. ', 1)[1]}</p>" if line.startswith("Điều")
+        else f"<p>{line.replace(' ', '&nbsp;', 1)}</p>"
+        for line in decree(chapters, articles).split("\n")
+    )
+    return f'<div class="content1"><div id="divContentDoc">{paragraphs}</div></div>'
+
+
+def respond(prompt: str) -> str:
+    """Notes for part prompts, a policy brief otherwise."""
+    if "GHI CHÚ MỘT PHẦN" in prompt:
+        return "- Ghi chú phần: " + CLAUSE * 2
+    return json.dumps(BRIEF, ensure_ascii=False)
+
+
+def test_counter_truncates_to_a_prefix():
+    counter = TokenCounter("gpt-4o")
+    text = CLAUSE * 50
+    head = counter.truncate(text, 100)
+    assert text.startswith(head) and 0 < counter.count(head) <= 100
+    assert counter.truncate("ngắn", 100) == "ngắn" and counter.count("") == 0
+
+
+def test_legal_text_splits_on_chapters_then_articles():
+    counter = TokenCounter("gpt-4o")
+    text = decree()
+
+    chapters = split_legal_text(text, counter.count(text) // 3, counter)
+    assert all(chunk.startswith("Chương") for chunk in chapters)
+    assert "".join("".join(chapters).split()) == "".join(text.split())
+
+    # Budget below a chapter: runs of whole articles
+    articles = split_legal_text(text, 1500, counter)
+    assert len(articles) > 6 and all(counter.count(chunk) <= 1500 for chunk in articles)
+    assert all(chunk.startswith(("Chương", "Điều")) for chunk in articles)
+    for a in range(1, 61):
+        assert sum(f"Điều {a}. " in chunk for chunk in articles) == 1
+
+    # Run-on text without line breaks still splits at articles
+    run_on = split_legal_text(text.replace("\n", " "), 1500, counter)
+    assert all(counter.count(chunk) <= 1500 for chunk in run_on)
+    assert all(chunk.startswith(("Chương", "Điều")) for chunk in run_on[1:])
+
+
+def test_html_legal_text_splits_on_its_headings():
+    counter = TokenCounter("gpt-4o")
+    html = decree_html()
+    text = legal_text(html)
+    assert "<" not in text and "&nbsp;" not in text
+    assert text.split("\n")[:3] == ["Chương I", "QUY ĐỊNH PHẦN 1", "Điều 1. Nội dung điều 1"]
+    assert legal_text(decree()) == decree()
+
+    articles = split_legal_text(text, 1500, counter)
+    assert all(chunk.startswith(("Chương", "Điều")) for chunk in articles)
+    for a in range(1, 61):
+        assert sum(f"Điều {a}. " in chunk for chunk in articles) == 1
+
+    # Map-reduce over the stored HTML: one part per run of whole articles
+    api = MockChatProvider(respond)
+    llm = api.service()
+    brief = llm.summarize_legal_doc("Nghị định 46", html, "46/2023/NĐ-CP", "Nghị định")
+    assert brief["executive_summary"] == BRIEF["executive_summary"]
+    *notes, summary = api.prompts
+    assert len(notes) > 1 and not any("<p>" in prompt for prompt in notes)
+    for a in range(1, 61):
+        assert sum(f"Điều {a}. Nội dung điều {a}\n" in prompt for prompt in notes) == 1
+
+
+def test_prompts_stay_within_budget():
+    llm = MockChatProvider(respond).service()
+    budget = AIContentEngineConfig.MAX_INPUT_TOKENS
+
+    short = llm.legal_summary_request("Nghị định 46", CLAUSE, "46/2023/NĐ-CP", "Nghị định")
+    assert CLAUSE in short["prompt"] and "# Limit" not in short["prompt"]
+
+    for request in (
+        llm.rewrite_request("<p>" + CLAUSE * 2000 + "</p>", "Tin dài", "CafeF"),
+        llm.legal_summary_request("Nghị định 46", decree(), "46/2023/NĐ-CP", "Nghị định"),
+        llm._entities_request(CLAUSE * 2000),
+    ):
+        assert llm.tokens.count(request["prompt"]) + llm.tokens.count(request["system_message"]) <= budget
+
+
+def test_long_legal_doc_is_summarized_map_reduce():
+    text = decree()
+    api = MockChatProvider(respond)
+    llm = api.service()
+    assert not llm.legal_summary_fits("Nghị định 46", text, "46/2023/NĐ-CP", "Nghị định")
+
+    brief = llm.summarize_legal_doc("Nghị định 46", text, "46/2023/NĐ-CP", "Nghị định", issue_date="2023-07-01")
+    assert brief["executive_summary"] == BRIEF["executive_summary"]
+
+    *notes, summary = api.prompts
+    assert len(notes) > 1 and all("GHI CHÚ MỘT PHẦN" in prompt for prompt in notes)
+    # Every article goes to exactly one part, in order
+    for a in range(1, 61):
+        assert sum(f"Điều {a}. " in prompt for prompt in notes) == 1
+    assert f"Phần 1/{len(notes)}" in summary and f"### Phần {len(notes)}/{len(notes)}" in summary
+    assert "Điều 60. " not in summary
+    system = llm.tokens.count(llm.legal_summary_request("", "", "")["system_message"])
+    assert all(llm.tokens.count(prompt) + system <= AIContentEngineConfig.MAX_INPUT_TOKENS for prompt in api.prompts)
+
+    # Async: the parts run in parallel, bounded by max_concurrency
+    api_async = MockChatProvider(respond, latency=0.01)
+    llm = api_async.service(max_concurrency=3)
+    again = asyncio.run(llm.summarize_legal_doc_async("Nghị định 46", text, "46/2023/NĐ-CP", "Nghị định"))
+    assert again["executive_summary"] == BRIEF["executive_summary"]
+    assert len(api_async.prompts) == len(api.prompts) and api_async.peak == 3
+
+
+def test_batch_mode_summarizes_long_docs_interactively():
+    saved = []
+
+    class Draft(SimpleNamespace):
+        async def save(self):
+            saved.append(self.id)
+
+    documents = [
+        Draft(id=i, title=f"Nghị định {i}", doc_number=f"{i}/2023/NĐ-CP", doc_type="Nghị định", content_full=content,
+              content_summary=None, issue_date=None, effective_date=None, issuing_body=None, updated_at=None)
+        for i, content in enumerate([CLAUSE, decree()])
+    ]
+    prompts = []
+
+    def responder(system_message: str, prompt: str) -> str:
+        prompts.append(prompt)
+        return json.dumps(BRIEF, ensure_ascii=False)
+
+    transport = httpx.ASGITransport(app=create_stub_app(responder))
+    processor = ContentProcessorAsync(batch_mode=True)
+    llm = processor.llm_service = LLMService(provider=LLMProvider.OPENAI)
+    llm.cache = None
+    llm.batches = OpenAIBatches("test", "http://llm-stub/v1", transport=transport)
+    llm.async_client = openai.AsyncOpenAI(
+        api_key="test", base_url="http://llm-stub/v1", http_client=httpx.AsyncClient(transport=transport)
+    )
+
+    poll_seconds = settings.LLM_BATCH_POLL_SECONDS
+    settings.LLM_BATCH_POLL_SECONDS = 0
+    try:
+        result = asyncio.run(processor.process_batches([], documents))
+    finally:
+        settings.LLM_BATCH_POLL_SECONDS = poll_seconds
+
+    assert result["legal_docs"] == 2 and result["failed"] == 0
+    assert sorted(saved) == [0, 1] and documents[1].content_summary == BRIEF["executive_summary"]
+    assert sum("GHI CHÚ MỘT PHẦN" in prompt for prompt in prompts) > 1
+
+
+if __name__ == "__main__":
+    test_counter_truncates_to_a_prefix()
+    test_legal_text_splits_on_chapters_then_articles()
+    test_html_legal_text_splits_on_its_headings()
+    test_prompts_stay_within_budget()
+    test_long_legal_doc_is_summarized_map_reduce()
+    test_batch_mode_summarizes_long_docs_interactively()
+    print("✅ Token budget tests passed")
@@ -0,0 +1,91 @@
+"""
+Tests for URL canonicalization shared by the crawlers and the processor.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.crawlers.urls import canonicalize_url, site_of, URLRules
+from app.crawlers.news_crawler_advanced import NewsAggregatorAdvanced
+from dedup_articles import plan_merges
+
+
+def test_variants_collapse_to_one_url():
+    canonical = "https://vnexpress.net/bao-hiem-nhan-tho-tang-truong-4791234.html"
+    variants = [
+        canonical,
+        "http://m.vnexpress.net/bao-hiem-nhan-tho-tang-truong-4791234.html",
+        "https://VnExpress.net:443/bao-hiem-nhan-tho-tang-truong-4791234.html#box_comment",
+        "https://vnexpress.net/bao-hiem-nhan-tho-tang-truong-4791234.html?utm_source=fb&vn_source=home&fbclid=x",
+        "https://www.vnexpress.net/bao-hiem-nhan-tho-tang-truong-4791234.html/",
+    ]
+    assert {canonicalize_url(url) for url in variants} == {canonical}
+    assert canonicalize_url(canonical) == canonical
+
+
+def test_relative_links_and_query():
+    base = "https://cafef.vn/bao-hiem.chn"
+    assert canonicalize_url("/bao-viet-lai-188240101.chn", base) == "https://cafef.vn/bao-viet-lai-188240101.chn"
+    assert canonicalize_url("bao-viet-lai-188240101.chn?zarsrc=1", base) == "https://cafef.vn/bao-viet-lai-188240101.chn"
+
+    # Unknown sites keep content params (sorted) and only lose tracking
+    assert canonicalize_url("https://m.example.com/news/?b=2&a=1&utm_medium=x") == "https://example.com/news?a=1&b=2"
+    assert canonicalize_url("mailto:press@baoviet.com.vn") == "mailto:press@baoviet.com.vn"
+
+
+def test_per_source_rules():
+    assert canonicalize_url("https://baoviet.com.vn/vi/tin-tuc-su-kien") == "https://www.baoviet.com.vn/vi/tin-tuc-su-kien"
+    assert canonicalize_url("https://www.prudential.com.vn/corp/prudential/vn/vi/newsroom") == \
+        "https://www.prudential.com.vn/corp/prudential/vn/vi/newsroom/"
+    assert canonicalize_url("https://thuvienphapluat.vn/page/tim-van-ban.aspx?keyword=bao+hiem&page=2") == \
+        "https://thuvienphapluat.vn/page/tim-van-ban.aspx?keyword=bao+hiem&page=2"
+    assert site_of("m.cafef.vn") == "cafef.vn"
+
+    # vn_* is VnExpress' own tracking prefix; other sites keep such params
+    assert canonicalize_url("https://example.com/tin?vn_id=3&utm_source=x") == "https://example.com/tin?vn_id=3"
+    rules = {"vnexpress.net": URLRules(host="vnexpress.net", tracking_prefixes=("vn_",))}
+    assert canonicalize_url("https://m.vnexpress.net/tim-kiem?q=bao+hiem&vn_source=home", rules=rules) == \
+        "https://vnexpress.net/tim-kiem?q=bao+hiem"
+
+
+def test_crawler_builds_canonical_source_urls():
+    crawler = NewsAggregatorAdvanced(use_playwright=False)
+    config = crawler.NEWS_SOURCES['vnexpress']
+    articles = crawler._build_articles(
+        [{'title': 'Bảo hiểm', 'link': '/bao-hiem-4791234.html?vn_campaign=x#top'}, {'title': 'Trống', 'link': ''}],
+        'vnexpress',
+        config
+    )
+    assert [a['source_url'] for a in articles] == ["https://vnexpress.net/bao-hiem-4791234.html", ""]
+
+
+def test_stored_variants_are_merged_before_the_unique_index():
+    url = "https://vnexpress.net/bao-hiem-4791234.html"
+    articles = [
+        {"_id": 1, "source_url": url + "?vn_source=home", "status": "draft", "created_at": datetime(2024, 1, 1)},
+        {"_id": 2, "source_url": "https://m.vnexpress.net/bao-hiem-4791234.html", "status": "published",
+         "processed_at": datetime(2024, 1, 3), "created_at": datetime(2024, 1, 2), "duplicate_urls": [
+             "https://cafef.vn/bao-hiem-188240101.chn?utm_source=x"]},
+        {"_id": 3, "source_url": url, "status": "draft", "processed_at": None, "created_at": datetime(2024, 1, 4)},
+        {"_id": 4, "source_url": "https://cafef.vn/khac.chn", "duplicate_urls": [], "created_at": datetime(2024, 1, 5)},
+        {"_id": 5, "source_url": "http://cafef.vn/mot-ban.chn/", "created_at": datetime(2024, 1, 6)},
+    ]
+    merges = {merge.canonical_url: merge for merge in plan_merges(articles)}
+
+    assert set(merges) == {url, "https://cafef.vn/mot-ban.chn"}
+    assert merges[url].keep == 2 and sorted(merges[url].remove) == [1, 3]
+    assert merges[url].duplicate_urls == ["https://cafef.vn/bao-hiem-188240101.chn"]
+    assert merges["https://cafef.vn/mot-ban.chn"].keep == 5 and merges["https://cafef.vn/mot-ban.chn"].remove == []
+
+
+if __name__ == "__main__":
+    test_variants_collapse_to_one_url()
+    test_relative_links_and_query()
+    test_per_source_rules()
+    test_crawler_builds_canonical_source_urls()
+    test_stored_variants_are_merged_before_the_unique_index()
+    print("✅ URL canonicalization tests passed")